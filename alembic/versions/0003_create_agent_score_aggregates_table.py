@@ -0,0 +1,76 @@
+"""create agent_score_aggregates table
+
+Revision ID: 0003_create_agent_score_aggregates
+Revises: 0002_create_score_history
+Create Date: 2026-10-17 09:00:00.000000
+"""
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.config import settings
+from app.services.scoring import ScoreTotals
+
+
+# revision identifiers, used by Alembic.
+revision = "0003_create_agent_score_aggregates"
+down_revision = "0002_create_score_history"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    aggregates = op.create_table(
+        "agent_score_aggregates",
+        sa.Column("agent_id", sa.String(length=128), nullable=False),
+        sa.Column("positive_delta", sa.Float(), nullable=False),
+        sa.Column("negative_delta", sa.Float(), nullable=False),
+        sa.Column("unknown_event_count", sa.Integer(), nullable=False),
+        sa.Column("event_count", sa.Integer(), nullable=False),
+        sa.Column("last_event_id", sa.Integer(), nullable=False),
+        sa.Column("model_version", sa.String(length=64), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.text("CURRENT_TIMESTAMP"), nullable=False),
+        sa.PrimaryKeyConstraint("agent_id"),
+    )
+
+    # Backfill from existing events so that ingest only ever has to increment.
+    events = sa.table(
+        "events",
+        sa.column("id", sa.Integer()),
+        sa.column("agent_id", sa.String()),
+        sa.column("event_type", sa.String()),
+    )
+    rows = op.get_bind().execute(
+        sa.select(events.c.agent_id, events.c.event_type, sa.func.count(), sa.func.max(events.c.id)).group_by(
+            events.c.agent_id, events.c.event_type
+        )
+    )
+
+    backfill: dict[str, dict[str, object]] = {}
+    for agent_id, event_type, count, max_id in rows:
+        entry = backfill.setdefault(agent_id, {"totals": ScoreTotals(), "event_count": 0, "last_event_id": 0})
+        entry["totals"].add(event_type, count)
+        entry["event_count"] += count
+        entry["last_event_id"] = max(entry["last_event_id"], max_id)
+
+    if backfill:
+        op.bulk_insert(
+            aggregates,
+            [
+                {
+                    "agent_id": agent_id,
+                    "positive_delta": entry["totals"].positive_delta,
+                    "negative_delta": entry["totals"].negative_delta,
+                    "unknown_event_count": int(entry["totals"].unknown_events),
+                    "event_count": entry["event_count"],
+                    "last_event_id": entry["last_event_id"],
+                    "model_version": settings.model_version,
+                }
+                for agent_id, entry in backfill.items()
+            ],
+        )
+
+
+def downgrade() -> None:
+    op.drop_table("agent_score_aggregates")
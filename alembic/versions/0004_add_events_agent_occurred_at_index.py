@@ -0,0 +1,29 @@
+"""add (agent_id, occurred_at, id) index on events
+
+Revision ID: 0004_events_agent_occurred_at
+Revises: 0003_create_agent_score_aggregates
+Create Date: 2026-10-17 10:00:00.000000
+"""
+from __future__ import annotations
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "0004_events_agent_occurred_at"
+down_revision = "0003_create_agent_score_aggregates"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_events_agent_id_occurred_at_id",
+        "events",
+        ["agent_id", "occurred_at", "id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_events_agent_id_occurred_at_id", table_name="events")
@@ -0,0 +1,47 @@
+"""create score_jobs and agent_scores tables
+
+Revision ID: 0005_score_jobs_agent_scores
+Revises: 0004_events_agent_occurred_at
+Create Date: 2026-10-17 11:00:00.000000
+"""
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0005_score_jobs_agent_scores"
+down_revision = "0004_events_agent_occurred_at"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "score_jobs",
+        sa.Column("agent_id", sa.String(length=128), nullable=False),
+        sa.Column("version", sa.Integer(), nullable=False),
+        sa.Column("enqueued_at", sa.DateTime(timezone=True), server_default=sa.text("CURRENT_TIMESTAMP"), nullable=False),
+        sa.Column("claimed_until", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("attempts", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("agent_id"),
+    )
+    op.create_index(op.f("ix_score_jobs_enqueued_at"), "score_jobs", ["enqueued_at"], unique=False)
+
+    op.create_table(
+        "agent_scores",
+        sa.Column("agent_id", sa.String(length=128), nullable=False),
+        sa.Column("score", sa.Float(), nullable=False),
+        sa.Column("tier", sa.String(length=32), nullable=False),
+        sa.Column("factors", sa.JSON(), nullable=False),
+        sa.Column("model_version", sa.String(length=64), nullable=False),
+        sa.Column("computed_at", sa.DateTime(timezone=True), server_default=sa.text("CURRENT_TIMESTAMP"), nullable=False),
+        sa.PrimaryKeyConstraint("agent_id"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("agent_scores")
+    op.drop_index(op.f("ix_score_jobs_enqueued_at"), table_name="score_jobs")
+    op.drop_table("score_jobs")
@@ -0,0 +1,38 @@
+"""add decay state columns to agent_score_aggregates
+
+Revision ID: 0006_aggregate_decay_state
+Revises: 0005_score_jobs_agent_scores
+Create Date: 2026-10-17 12:00:00.000000
+"""
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0006_aggregate_decay_state"
+down_revision = "0005_score_jobs_agent_scores"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "agent_score_aggregates",
+        sa.Column("decayed_positive", sa.Float(), server_default=sa.text("0"), nullable=False),
+    )
+    op.add_column(
+        "agent_score_aggregates",
+        sa.Column("decayed_negative", sa.Float(), server_default=sa.text("0"), nullable=False),
+    )
+    op.add_column(
+        "agent_score_aggregates",
+        sa.Column("decay_reference_at", sa.DateTime(timezone=True), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("agent_score_aggregates", "decay_reference_at")
+    op.drop_column("agent_score_aggregates", "decayed_negative")
+    op.drop_column("agent_score_aggregates", "decayed_positive")
@@ -0,0 +1,60 @@
+"""create hourly and daily event rollup tables
+
+Revision ID: 0007_event_rollups
+Revises: 0006_aggregate_decay_state
+Create Date: 2026-10-17 13:00:00.000000
+"""
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0007_event_rollups"
+down_revision = "0006_aggregate_decay_state"
+branch_labels = None
+depends_on = None
+
+
+_BUCKET_EXPRESSIONS = {
+    "postgresql": {
+        "hourly": "date_trunc('hour', occurred_at AT TIME ZONE 'UTC') AT TIME ZONE 'UTC'",
+        "daily": "date_trunc('day', occurred_at AT TIME ZONE 'UTC') AT TIME ZONE 'UTC'",
+    },
+    "sqlite": {
+        "hourly": "strftime('%Y-%m-%d %H:00:00.000000', occurred_at)",
+        "daily": "strftime('%Y-%m-%d 00:00:00.000000', occurred_at)",
+    },
+}
+
+
+def _create_rollup_table(name: str) -> None:
+    op.create_table(
+        name,
+        sa.Column("agent_id", sa.String(length=128), nullable=False),
+        sa.Column("event_type", sa.String(length=128), nullable=False),
+        sa.Column("bucket_start", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("event_count", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("agent_id", "event_type", "bucket_start"),
+    )
+
+
+def upgrade() -> None:
+    _create_rollup_table("event_rollups_hourly")
+    _create_rollup_table("event_rollups_daily")
+
+    expressions = _BUCKET_EXPRESSIONS.get(op.get_bind().dialect.name)
+    if expressions is None:
+        return
+    for granularity, bucket in expressions.items():
+        op.execute(
+            f"INSERT INTO event_rollups_{granularity} (agent_id, event_type, bucket_start, event_count) "
+            f"SELECT agent_id, event_type, {bucket}, count(*) FROM events "
+            f"GROUP BY agent_id, event_type, {bucket}"
+        )
+
+
+def downgrade() -> None:
+    op.drop_table("event_rollups_daily")
+    op.drop_table("event_rollups_hourly")
@@ -0,0 +1,122 @@
+"""partition events by occurred_at and add retention state
+
+Revision ID: 0008_events_partitioning
+Revises: 0007_event_rollups
+Create Date: 2026-10-17 14:00:00.000000
+"""
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0008_events_partitioning"
+down_revision = "0007_event_rollups"
+branch_labels = None
+depends_on = None
+
+
+_COLUMNS = "id, event_id, agent_id, event_type, source, occurred_at, metadata, created_at"
+_INDEXES = {
+    "ix_events_agent_id": "agent_id",
+    "ix_events_event_id": "event_id",
+    "ix_events_event_type": "event_type",
+    "ix_events_occurred_at": "occurred_at",
+    "ix_events_agent_id_occurred_at_id": "agent_id, occurred_at, id",
+}
+_PARTITION_MONTHS_AHEAD = 3
+
+
+def _next_month(value: datetime) -> datetime:
+    return value.replace(year=value.year + 1, month=1) if value.month == 12 else value.replace(month=value.month + 1)
+
+
+def _month_start(value: datetime) -> datetime:
+    return value.astimezone(timezone.utc).replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def _rename_legacy(table: str, constraints: tuple[str, ...]) -> None:
+    # Index and constraint names are schema-wide, so free them for the new table.
+    op.execute(f"ALTER TABLE events RENAME TO {table}")
+    for constraint in constraints:
+        renamed = f"{table}_{constraint.removeprefix('events_')}"
+        op.execute(f"ALTER TABLE {table} RENAME CONSTRAINT {constraint} TO {renamed}")
+    for index in _INDEXES:
+        op.execute(f"ALTER INDEX IF EXISTS {index} RENAME TO {index}_legacy")
+
+
+def _create_events_table(partitioned: bool) -> None:
+    key = "id, occurred_at" if partitioned else "id"
+    unique = "event_id, occurred_at" if partitioned else "event_id"
+    op.execute(
+        "CREATE TABLE events ("
+        "id integer NOT NULL DEFAULT nextval('events_id_seq'), "
+        "event_id varchar(128) NOT NULL, "
+        "agent_id varchar(128) NOT NULL, "
+        "event_type varchar(128) NOT NULL, "
+        "source varchar(128) NOT NULL, "
+        "occurred_at timestamp with time zone NOT NULL, "
+        "metadata json NOT NULL, "
+        "created_at timestamp with time zone NOT NULL DEFAULT CURRENT_TIMESTAMP, "
+        f"CONSTRAINT events_pkey PRIMARY KEY ({key}), "
+        f"CONSTRAINT events_event_id_key UNIQUE ({unique})"
+        ")" + (" PARTITION BY RANGE (occurred_at)" if partitioned else "")
+    )
+    # The sequence belonged to the legacy table; keep it alive past its drop.
+    op.execute("ALTER SEQUENCE events_id_seq OWNED BY events.id")
+
+
+def _copy_from_legacy(table: str) -> None:
+    op.execute(f"INSERT INTO events ({_COLUMNS}) SELECT {_COLUMNS} FROM {table}")
+    op.execute(f"DROP TABLE {table}")
+    for index, columns in _INDEXES.items():
+        op.execute(f"CREATE INDEX {index} ON events ({columns})")
+
+
+def upgrade() -> None:
+    op.create_table(
+        "retention_state",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("compacted_before", sa.DateTime(timezone=True), nullable=True),
+        sa.Column(
+            "updated_at", sa.DateTime(timezone=True), server_default=sa.text("CURRENT_TIMESTAMP"), nullable=False
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        return
+
+    _rename_legacy("events_legacy", ("events_pkey", "events_event_id_key"))
+    _create_events_table(partitioned=True)
+
+    now = datetime.now(timezone.utc)
+    oldest = bind.execute(sa.text("SELECT min(occurred_at) FROM events_legacy")).scalar()
+    month = _month_start(oldest or now)
+    last = _month_start(now)
+    for _ in range(_PARTITION_MONTHS_AHEAD):
+        last = _next_month(last)
+    while month <= last:
+        upper = _next_month(month)
+        op.execute(
+            f"CREATE TABLE events_p{month:%Y%m} PARTITION OF events "
+            f"FOR VALUES FROM ('{month.isoformat()}') TO ('{upper.isoformat()}')"
+        )
+        month = upper
+    op.execute("CREATE TABLE events_default PARTITION OF events DEFAULT")
+
+    _copy_from_legacy("events_legacy")
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name == "postgresql":
+        _rename_legacy("events_partitioned", ("events_pkey", "events_event_id_key"))
+        _create_events_table(partitioned=False)
+        _copy_from_legacy("events_partitioned")
+
+    op.drop_table("retention_state")
@@ -0,0 +1,45 @@
+"""replace single-column events indexes with one covering history index
+
+Revision ID: 0009_events_covering_index
+Revises: 0008_events_partitioning
+Create Date: 2026-10-17 15:00:00.000000
+"""
+from __future__ import annotations
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "0009_events_covering_index"
+down_revision = "0008_events_partitioning"
+branch_labels = None
+depends_on = None
+
+
+# ix_events_event_id duplicated the unique constraint's own index; agent_id is the
+# prefix of the history index; event_type and occurred_at alone match no query.
+_REDUNDANT_INDEXES = {
+    "ix_events_agent_id": ["agent_id"],
+    "ix_events_event_id": ["event_id"],
+    "ix_events_event_type": ["event_type"],
+    "ix_events_occurred_at": ["occurred_at"],
+    "ix_events_agent_id_occurred_at_id": ["agent_id", "occurred_at", "id"],
+}
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_events_agent_history",
+        "events",
+        ["agent_id", "occurred_at", "id"],
+        unique=False,
+        postgresql_include=["event_type"],
+    )
+    for name in _REDUNDANT_INDEXES:
+        op.drop_index(name, table_name="events")
+
+
+def downgrade() -> None:
+    for name, columns in _REDUNDANT_INDEXES.items():
+        op.create_index(name, "events", columns, unique=False)
+    op.drop_index("ix_events_agent_history", table_name="events")
@@ -0,0 +1,43 @@
+"""create agent_drift_state table
+
+Revision ID: 0010_agent_drift_state
+Revises: 0009_events_covering_index
+Create Date: 2026-10-17 16:00:00.000000
+"""
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0010_agent_drift_state"
+down_revision = "0009_events_covering_index"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "agent_drift_state",
+        sa.Column("agent_id", sa.String(length=128), nullable=False),
+        sa.Column("samples", sa.Integer(), nullable=False),
+        sa.Column("last_score", sa.Float(), nullable=False),
+        sa.Column("ewma", sa.Float(), nullable=False),
+        sa.Column("variance", sa.Float(), nullable=False),
+        sa.Column("cusum_pos", sa.Float(), nullable=False),
+        sa.Column("cusum_neg", sa.Float(), nullable=False),
+        sa.Column("drift", sa.Float(), nullable=False),
+        sa.Column("alerting", sa.Boolean(), nullable=False),
+        sa.Column("last_alert_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column(
+            "updated_at", sa.DateTime(timezone=True), server_default=sa.text("CURRENT_TIMESTAMP"), nullable=False
+        ),
+        sa.PrimaryKeyConstraint("agent_id"),
+    )
+    op.create_index(op.f("ix_agent_drift_state_drift"), "agent_drift_state", ["drift"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_agent_drift_state_drift"), table_name="agent_drift_state")
+    op.drop_table("agent_drift_state")
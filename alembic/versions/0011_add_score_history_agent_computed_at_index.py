@@ -0,0 +1,33 @@
+"""replace score_history agent_id index with (agent_id, computed_at)
+
+Revision ID: 0011_score_history_time_index
+Revises: 0010_agent_drift_state
+Create Date: 2026-10-17 17:00:00.000000
+"""
+from __future__ import annotations
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "0011_score_history_time_index"
+down_revision = "0010_agent_drift_state"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_score_history_agent_id_computed_at",
+        "score_history",
+        ["agent_id", "computed_at"],
+        unique=False,
+        postgresql_include=["score", "tier"],
+    )
+    # agent_id alone is a prefix of the new index.
+    op.drop_index("ix_score_history_agent_id", table_name="score_history")
+
+
+def downgrade() -> None:
+    op.create_index("ix_score_history_agent_id", "score_history", ["agent_id"], unique=False)
+    op.drop_index("ix_score_history_agent_id_computed_at", table_name="score_history")
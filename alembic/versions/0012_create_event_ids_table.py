@@ -0,0 +1,38 @@
+"""create event_ids to keep event_id unique across events partitions
+
+Revision ID: 0012_event_ids
+Revises: 0011_score_history_time_index
+Create Date: 2026-10-17 18:00:00.000000
+"""
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0012_event_ids"
+down_revision = "0011_score_history_time_index"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "event_ids",
+        sa.Column("event_id", sa.String(length=128), nullable=False),
+        sa.Column("occurred_at", sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint("event_id"),
+    )
+    op.create_index("ix_event_ids_occurred_at", "event_ids", ["occurred_at"], unique=False)
+    # Since 0008 the partitioned table is only unique on (event_id, occurred_at), so an
+    # id may already be stored twice; its earliest row keeps the claim.
+    op.execute(
+        "INSERT INTO event_ids (event_id, occurred_at) "
+        "SELECT event_id, min(occurred_at) FROM events GROUP BY event_id"
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_event_ids_occurred_at", table_name="event_ids")
+    op.drop_table("event_ids")
@@ -0,0 +1,51 @@
+"""AsyncSession counterparts of the queries in ``app.store``.
+
+Each function runs the sync implementation through ``AsyncSession.run_sync``,
+which drives the async driver from a greenlet instead of a worker thread, so the
+SQL and aggregate bookkeeping stay defined in one place.
+"""
+from __future__ import annotations
+
+from datetime import datetime
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import store
+from app.models import EventRecord
+from app.schemas import EventIn
+from app.services.scoring import ScoreResult
+
+
+async def insert_event(db: AsyncSession, event: EventIn) -> EventRecord:
+    return await db.run_sync(store.insert_event, event)
+
+
+async def insert_events(db: AsyncSession, events: list[EventIn]) -> list[bool]:
+    return await db.run_sync(store.insert_events, events)
+
+
+async def list_agent_event_rows(
+    db: AsyncSession,
+    agent_id: str,
+    *,
+    since: datetime | None = None,
+    until: datetime | None = None,
+    event_type: str | None = None,
+    after: tuple[datetime, int] | None = None,
+    limit: int | None = None,
+    descending: bool = False,
+) -> list[store.EventRow]:
+    return await db.run_sync(
+        store.list_agent_event_rows,
+        agent_id,
+        since=since,
+        until=until,
+        event_type=event_type,
+        after=after,
+        limit=limit,
+        descending=descending,
+    )
+
+
+async def get_agent_score(db: AsyncSession, agent_id: str) -> ScoreResult:
+    return await db.run_sync(store.get_agent_score, agent_id)
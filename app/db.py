@@ -1,10 +1,17 @@
 from __future__ import annotations
 
-from collections.abc import Generator
+import threading
+import time
+from collections.abc import AsyncGenerator, Generator
+from dataclasses import dataclass, field
 
 from sqlalchemy import create_engine
-from sqlalchemy.engine import Engine
+from sqlalchemy import exc as sa_exc
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool
 
 from app.config import settings
 from app.models import Base
@@ -12,13 +19,96 @@ from app.models import Base
 
 _engine: Engine | None = None
 _session_factory: sessionmaker[Session] | None = None
+_async_engine: AsyncEngine | None = None
+_async_session_factory: async_sessionmaker[AsyncSession] | None = None
+
+
+@dataclass
+class PoolStats:
+    """Cumulative connection checkout counters, shared by the sync and async pools."""
+
+    checkouts: int = 0
+    timeouts: int = 0
+    wait_seconds_total: float = 0.0
+    wait_seconds_max: float = 0.0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def record(self, waited: float, timed_out: bool) -> None:
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            self.wait_seconds_total += waited
+            self.wait_seconds_max = max(self.wait_seconds_max, waited)
+
+    def reset(self) -> None:
+        with self._lock:
+            self.checkouts = 0
+            self.timeouts = 0
+            self.wait_seconds_total = 0.0
+            self.wait_seconds_max = 0.0
+
+
+pool_stats = PoolStats()
+
+
+class _InstrumentedPoolMixin:
+    """Times ``Pool.connect`` (queue wait plus any new connection) into ``pool_stats``."""
+
+    def connect(self):  # type: ignore[no-untyped-def]
+        started = time.perf_counter()
+        try:
+            connection = super().connect()  # type: ignore[misc]
+        except sa_exc.TimeoutError:
+            pool_stats.record(time.perf_counter() - started, timed_out=True)
+            raise
+        pool_stats.record(time.perf_counter() - started, timed_out=False)
+        return connection
+
+
+class InstrumentedQueuePool(_InstrumentedPoolMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncQueuePool(_InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def _is_sqlite(url: str) -> bool:
+    return url.startswith("sqlite")
+
+
+def _engine_kwargs(url: str, poolclass: type[Pool]) -> dict[str, object]:
+    """Pool and driver options from settings; SQLite keeps SQLAlchemy's default pools."""
+    kwargs: dict[str, object] = {"echo": settings.db_echo, "query_cache_size": settings.db_query_cache_size}
+    if _is_sqlite(url):
+        return kwargs
+
+    kwargs.update(
+        poolclass=poolclass,
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_timeout=settings.db_pool_timeout,
+        pool_recycle=settings.db_pool_recycle,
+        pool_pre_ping=settings.db_pool_pre_ping,
+    )
+    if make_url(url).get_driver_name() == "psycopg":
+        # psycopg prepares a statement server-side once the same query text has run
+        # prepare_threshold times on a connection, so the hot insert/list queries skip
+        # re-planning. PgBouncer in transaction mode cannot route prepared statements
+        # back to the backend that holds them, so preparation is disabled there.
+        kwargs["connect_args"] = {
+            "prepare_threshold": None if settings.db_pgbouncer else settings.db_prepare_threshold,
+        }
+    return kwargs
 
 
 def _create_engine() -> Engine:
-    connect_args: dict[str, object] = {}
-    if settings.database_url.startswith("sqlite"):
-        connect_args["check_same_thread"] = False
-    return create_engine(settings.database_url, echo=settings.db_echo, connect_args=connect_args)
+    kwargs = _engine_kwargs(settings.database_url, InstrumentedQueuePool)
+    if _is_sqlite(settings.database_url):
+        kwargs["connect_args"] = {"check_same_thread": False}
+    return create_engine(settings.database_url, **kwargs)
 
 
 def get_engine() -> Engine:
@@ -49,5 +139,72 @@ def get_db() -> Generator[Session, None, None]:
         session.close()
 
 
+def _async_database_url() -> str:
+    if settings.async_database_url:
+        return settings.async_database_url
+    # postgresql+psycopg (psycopg 3) serves both sync and async engines from one URL.
+    if settings.database_url.startswith(("sqlite://", "sqlite+pysqlite://")):
+        return "sqlite+aiosqlite://" + settings.database_url.split("://", 1)[1]
+    return settings.database_url
+
+
+def _create_async_engine() -> AsyncEngine:
+    url = _async_database_url()
+    return create_async_engine(url, **_engine_kwargs(url, InstrumentedAsyncQueuePool))
+
+
+def get_async_engine() -> AsyncEngine:
+    global _async_engine
+    if _async_engine is None:
+        _async_engine = _create_async_engine()
+    return _async_engine
+
+
+def get_async_session_factory() -> async_sessionmaker[AsyncSession]:
+    global _async_session_factory
+    if _async_session_factory is None:
+        _async_session_factory = async_sessionmaker(
+            bind=get_async_engine(),
+            autoflush=False,
+            expire_on_commit=False,
+            class_=AsyncSession,
+        )
+    return _async_session_factory
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    session = get_async_session_factory()()
+    try:
+        yield session
+    finally:
+        await session.close()
+
+
+def dialect_insert(db: Session):
+    """Return the dialect-specific ``insert`` so callers can use ``ON CONFLICT``."""
+    if db.get_bind().dialect.name == "postgresql":
+        return postgresql.insert
+    return sqlite.insert
+
+
+def get_pool_status() -> dict[str, float]:
+    """Current pool occupancy plus cumulative checkout wait counters."""
+    status: dict[str, float] = {
+        "checkouts": pool_stats.checkouts,
+        "timeouts": pool_stats.timeouts,
+        "wait_seconds_total": round(pool_stats.wait_seconds_total, 6),
+        "wait_seconds_max": round(pool_stats.wait_seconds_max, 6),
+    }
+    pools = [("sync", _engine.pool if _engine is not None else None)]
+    pools.append(("async", _async_engine.pool if _async_engine is not None else None))
+    for name, pool in pools:
+        if isinstance(pool, QueuePool):
+            status[f"{name}_size"] = pool.size()
+            status[f"{name}_checked_out"] = pool.checkedout()
+            status[f"{name}_checked_in"] = pool.checkedin()
+            status[f"{name}_overflow"] = pool.overflow()
+    return status
+
+
 def init_db() -> None:
     Base.metadata.create_all(bind=get_engine())
@@ -3,23 +3,45 @@ from __future__ import annotations
 from collections.abc import AsyncIterator
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
 
 from app.config import settings
-from app.db import init_db
-from app.routers import events, trust
+from app.db import get_async_engine, get_pool_status, init_db
+from app.metrics import MetricsMiddleware, render_metrics
+from app.routers import events, events_async, policy, trust, trust_async
+from app.services.dedup import event_dedup
+from app.services.policy import get_policy
+from app.services.score_cache import score_cache
+from app.services.snapshot_writer import snapshot_writer
+from app.services.webhooks import webhook_dispatcher
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncIterator[None]:
     if settings.auto_create_tables:
         init_db()
+    # Compile the policy up front so a bad rules file fails startup, not a request.
+    get_policy()
+    event_dedup.start()
+    snapshot_writer.start()
+    webhook_dispatcher.start()
     yield
+    webhook_dispatcher.stop()
+    snapshot_writer.stop()
+    if settings.async_db:
+        await get_async_engine().dispose()
 
 
 app = FastAPI(title=settings.app_name, lifespan=lifespan)
+app.add_middleware(MetricsMiddleware)
+if settings.async_db:
+    # Registered first so these AsyncSession handlers take precedence over the
+    # sync routes with the same method and path; the rest stay on the sync path.
+    app.include_router(events_async.router, prefix=settings.api_prefix)
+    app.include_router(trust_async.router, prefix=settings.api_prefix)
 app.include_router(events.router, prefix=settings.api_prefix)
 app.include_router(trust.router, prefix=settings.api_prefix)
+app.include_router(policy.router, prefix=settings.api_prefix)
 
 
 @app.get("/")
@@ -34,3 +56,29 @@ def root() -> dict[str, str]:
 @app.get("/health")
 def health() -> dict[str, str]:
     return {"status": "ok", "environment": settings.environment}
+
+
+@app.get("/health/pool")
+def pool_health() -> dict[str, float]:
+    return get_pool_status()
+
+
+@app.get("/health/cache")
+def cache_health() -> dict[str, float]:
+    return score_cache.stats()
+
+
+@app.get("/health/dedup")
+def dedup_health() -> dict[str, float]:
+    return event_dedup.stats()
+
+
+@app.get("/health/webhooks")
+def webhooks_health() -> dict[str, dict[str, float]]:
+    return webhook_dispatcher.stats()
+
+
+@app.get("/metrics", include_in_schema=False)
+def metrics() -> Response:
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
@@ -0,0 +1,170 @@
+"""Prometheus metrics, served at ``/metrics``.
+
+Request latency is recorded per route template by ``MetricsMiddleware``, a plain
+ASGI middleware. Store functions are wrapped with ``timed``, which binds its
+histogram child once at import time, so a call costs two ``perf_counter`` reads
+and one observation; scoring calls and serialization are timed inline with
+``stage``. Pool gauges are read from the engine when ``/metrics`` is scraped,
+not maintained on the hot path.
+
+Metrics are per process. The scoring worker and extra uvicorn workers keep
+their own counters, which this endpoint does not aggregate.
+"""
+from __future__ import annotations
+
+import functools
+import random
+import time
+from collections.abc import Callable, Iterator, Mapping
+from contextlib import contextmanager
+from typing import Any, TypeVar
+
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, Counter, Histogram, generate_latest
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+from prometheus_client.registry import Collector
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config import settings
+from app.db import get_pool_status
+from app.profiling import active_profile, profiler, register_current_thread
+from app.services.scoring import NEGATIVE_EVENTS, POSITIVE_EVENTS
+
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+# Event types outside the scoring tables are counted together to bound label cardinality.
+_KNOWN_EVENT_TYPES = frozenset(POSITIVE_EVENTS) | frozenset(NEGATIVE_EVENTS)
+
+REQUEST_LATENCY = Histogram(
+    "atb_http_request_duration_seconds",
+    "HTTP request latency by route template.",
+    ["method", "route", "status"],
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+STAGE_LATENCY = Histogram(
+    "atb_stage_duration_seconds",
+    "Time spent in instrumented store and scoring functions.",
+    ["stage"],
+    buckets=(0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0),
+)
+EVENTS_INGESTED = Counter("atb_events_ingested", "Events accepted by intake, by event type.", ["event_type"])
+INGEST_DUPLICATES = Counter(
+    "atb_ingest_duplicates",
+    "Duplicate single-event ingests, by what caught them: recent-id LRU, Bloom filter, or unique constraint.",
+    ["detected_by"],
+)
+SCORE_ROWS_SCANNED = Histogram(
+    "atb_score_rows_scanned",
+    "Rows read to compute one agent's score: 1 for a maintained aggregate, or the events counted by a rebuild.",
+    ["path"],
+    buckets=(1, 10, 100, 1_000, 10_000, 100_000, 1_000_000),
+)
+
+
+def timed(stage: str) -> Callable[[F], F]:
+    """Record the wrapped function's wall time in ``atb_stage_duration_seconds{stage=...}``."""
+    observe = STAGE_LATENCY.labels(stage).observe
+
+    def decorate(func: F) -> F:
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            register_current_thread()
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                observe(time.perf_counter() - started)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorate
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    """``timed`` for a block of code."""
+    register_current_thread()
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        STAGE_LATENCY.labels(name).observe(time.perf_counter() - started)
+
+
+def count_ingested(counts: Mapping[str, int]) -> None:
+    for event_type, count in counts.items():
+        EVENTS_INGESTED.labels(event_type if event_type in _KNOWN_EVENT_TYPES else "other").inc(count)
+
+
+def count_duplicate(detected_by: str) -> None:
+    INGEST_DUPLICATES.labels(detected_by).inc()
+
+
+def observe_rows_scanned(path: str, rows: int) -> None:
+    SCORE_ROWS_SCANNED.labels(path).observe(rows)
+
+
+class _PoolCollector(Collector):
+    """Connection pool occupancy and checkout counters, read at scrape time."""
+
+    def collect(self) -> Iterator[GaugeMetricFamily | CounterMetricFamily]:
+        status = get_pool_status()
+        checkouts = CounterMetricFamily("atb_db_pool_checkouts", "Connection checkouts.", labels=["outcome"])
+        checkouts.add_metric(["ok"], status["checkouts"])
+        checkouts.add_metric(["timeout"], status["timeouts"])
+        yield checkouts
+        yield CounterMetricFamily(
+            "atb_db_pool_wait_seconds", "Total time spent waiting for a connection.", value=status["wait_seconds_total"]
+        )
+        occupancy = GaugeMetricFamily("atb_db_pool_connections", "Pool connections by state.", labels=["pool", "state"])
+        for pool in ("sync", "async"):
+            for state in ("size", "checked_out", "checked_in", "overflow"):
+                value = status.get(f"{pool}_{state}")
+                if value is not None:
+                    occupancy.add_metric([pool, state], value)
+        yield occupancy
+
+
+REGISTRY.register(_PoolCollector())
+
+
+def render_metrics() -> tuple[bytes, str]:
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
+
+
+class MetricsMiddleware:
+    """Times every HTTP request into ``atb_http_request_duration_seconds`` and runs the slow-request profiler."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        profile = None
+        token = None
+        if profiler.enabled and random.random() < settings.profile_sample_rate:
+            profile = profiler.begin()
+            token = active_profile.set(profile)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - started
+            route = scope.get("route")
+            # Unmatched paths share one label so scanners cannot blow up cardinality.
+            template = getattr(route, "path", None) or "unmatched"
+            REQUEST_LATENCY.labels(scope["method"], template, str(status)).observe(elapsed)
+            if profile is not None:
+                active_profile.reset(token)
+                profiler.end(profile, f"{scope['method']} {template}")
@@ -3,7 +3,7 @@ from __future__ import annotations
 from datetime import datetime
 from typing import Any
 
-from sqlalchemy import JSON, DateTime, Float, Integer, String, func
+from sqlalchemy import JSON, Boolean, DateTime, Float, Index, Integer, String, UniqueConstraint, func
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
 
 
@@ -13,13 +13,29 @@ class Base(DeclarativeBase):
 
 class EventRecord(Base):
     __tablename__ = "events"
+    # Besides the primary key and the unique event_id constraint, one index serves
+    # every per-agent read: history pages and cursors (agent_id, ORDER BY
+    # occurred_at, id) and scoring scans, which also need event_type and so get it
+    # from the index leaf on Postgres without touching the heap. Unique keys on the
+    # partitioned Postgres table must include occurred_at, so event_id alone is
+    # kept unique by EventIdRecord.
+    __table_args__ = (
+        UniqueConstraint("event_id", "occurred_at", name="events_event_id_key"),
+        Index(
+            "ix_events_agent_history",
+            "agent_id",
+            "occurred_at",
+            "id",
+            postgresql_include=["event_type"],
+        ),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
-    event_id: Mapped[str] = mapped_column(String(128), unique=True, nullable=False, index=True)
-    agent_id: Mapped[str] = mapped_column(String(128), nullable=False, index=True)
-    event_type: Mapped[str] = mapped_column(String(128), nullable=False, index=True)
+    event_id: Mapped[str] = mapped_column(String(128), nullable=False)
+    agent_id: Mapped[str] = mapped_column(String(128), nullable=False)
+    event_type: Mapped[str] = mapped_column(String(128), nullable=False)
     source: Mapped[str] = mapped_column(String(128), nullable=False, default="unknown")
-    occurred_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, index=True)
+    occurred_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
     metadata_json: Mapped[dict[str, Any]] = mapped_column("metadata", JSON, nullable=False, default=dict)
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
@@ -28,16 +44,163 @@ class EventRecord(Base):
     )
 
 
+class EventIdRecord(Base):
+    """Claims an ``event_id`` for the whole ``events`` table.
+
+    Written in the same transaction as the event, so a retry whose ``occurred_at``
+    was re-stamped conflicts here even though it would land in another partition.
+    """
+
+    __tablename__ = "event_ids"
+
+    event_id: Mapped[str] = mapped_column(String(128), primary_key=True)
+    # Indexed so retention can release ids along with the events it compacts.
+    occurred_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, index=True)
+
+
 class ScoreSnapshot(Base):
     __tablename__ = "score_history"
+    # Serves per-agent time-range reads; on Postgres the history endpoint is
+    # answered from the index alone.
+    __table_args__ = (
+        Index(
+            "ix_score_history_agent_id_computed_at",
+            "agent_id",
+            "computed_at",
+            postgresql_include=["score", "tier"],
+        ),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
-    agent_id: Mapped[str] = mapped_column(String(128), nullable=False, index=True)
+    agent_id: Mapped[str] = mapped_column(String(128), nullable=False)
+    score: Mapped[float] = mapped_column(Float, nullable=False)
+    tier: Mapped[str] = mapped_column(String(32), nullable=False)
+    factors: Mapped[dict[str, Any]] = mapped_column(JSON, nullable=False, default=dict)
+    computed_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        server_default=func.now(),
+    )
+
+
+class AgentScoreAggregate(Base):
+    __tablename__ = "agent_score_aggregates"
+
+    agent_id: Mapped[str] = mapped_column(String(128), primary_key=True)
+    positive_delta: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+    negative_delta: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+    unknown_event_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    event_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    last_event_id: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    decayed_positive: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+    decayed_negative: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+    decay_reference_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    model_version: Mapped[str] = mapped_column(String(64), nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        server_default=func.now(),
+        onupdate=func.now(),
+    )
+
+
+class ScoreJob(Base):
+    """A pending score recompute; one row per agent coalesces any number of new events."""
+
+    __tablename__ = "score_jobs"
+
+    agent_id: Mapped[str] = mapped_column(String(128), primary_key=True)
+    version: Mapped[int] = mapped_column(Integer, nullable=False, default=1)
+    enqueued_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        server_default=func.now(),
+        index=True,
+    )
+    claimed_until: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+
+class AgentScore(Base):
+    """Latest precomputed score per agent, maintained by the scoring worker."""
+
+    __tablename__ = "agent_scores"
+
+    agent_id: Mapped[str] = mapped_column(String(128), primary_key=True)
     score: Mapped[float] = mapped_column(Float, nullable=False)
     tier: Mapped[str] = mapped_column(String(32), nullable=False)
     factors: Mapped[dict[str, Any]] = mapped_column(JSON, nullable=False, default=dict)
+    model_version: Mapped[str] = mapped_column(String(64), nullable=False)
     computed_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
         nullable=False,
         server_default=func.now(),
     )
+
+
+class EventRollupHourly(Base):
+    """Per-agent, per-event-type event counts in UTC hour buckets."""
+
+    __tablename__ = "event_rollups_hourly"
+
+    agent_id: Mapped[str] = mapped_column(String(128), primary_key=True)
+    event_type: Mapped[str] = mapped_column(String(128), primary_key=True)
+    bucket_start: Mapped[datetime] = mapped_column(DateTime(timezone=True), primary_key=True)
+    event_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+
+class EventRollupDaily(Base):
+    """Per-agent, per-event-type event counts in UTC day buckets."""
+
+    __tablename__ = "event_rollups_daily"
+
+    agent_id: Mapped[str] = mapped_column(String(128), primary_key=True)
+    event_type: Mapped[str] = mapped_column(String(128), primary_key=True)
+    bucket_start: Mapped[datetime] = mapped_column(DateTime(timezone=True), primary_key=True)
+    event_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+
+class RetentionState(Base):
+    """Single-row table recording how far the events table has been compacted.
+
+    Events with ``occurred_at`` before ``compacted_before`` may have been deleted;
+    their per-type counts live on in ``event_rollups_daily``.
+    """
+
+    __tablename__ = "retention_state"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    compacted_before: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        server_default=func.now(),
+        onupdate=func.now(),
+    )
+
+
+class AgentDriftState(Base):
+    """Running drift statistics over an agent's score snapshots, updated as snapshots are written.
+
+    ``drift`` is the larger of the two CUSUM sums and is indexed so the most
+    drifting agents can be read without touching ``score_history``.
+    """
+
+    __tablename__ = "agent_drift_state"
+
+    agent_id: Mapped[str] = mapped_column(String(128), primary_key=True)
+    samples: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    last_score: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+    ewma: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+    variance: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+    cusum_pos: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+    cusum_neg: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+    drift: Mapped[float] = mapped_column(Float, nullable=False, default=0.0, index=True)
+    alerting: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
+    last_alert_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        server_default=func.now(),
+        onupdate=func.now(),
+    )
@@ -0,0 +1,114 @@
+"""Opt-in sampling profiler for slow requests.
+
+With ``PROFILE_SLOW_REQUEST_SECONDS`` > 0, a ``PROFILE_SAMPLE_RATE`` fraction of
+requests is profiled. No tracer is installed: a background thread samples the
+Python stacks of the threads each profiled request has run instrumented code on,
+every ``PROFILE_INTERVAL_SECONDS``. Requests that finish faster than the
+threshold are discarded. Slower ones are written to ``PROFILE_DIR`` in the folded
+stack format (``frame;frame;frame count`` per line) that ``flamegraph.pl``,
+speedscope and inferno turn into flame graphs.
+"""
+from __future__ import annotations
+
+import logging
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from pathlib import Path
+from types import FrameType
+
+from app.config import settings
+
+
+logger = logging.getLogger(__name__)
+
+_MAX_STACK_DEPTH = 128
+
+
+class RequestProfile:
+    """Threads to sample for one in-flight request and the folded stacks seen so far."""
+
+    __slots__ = ("threads", "samples", "started")
+
+    def __init__(self) -> None:
+        self.threads: set[int] = set()
+        self.samples: Counter[str] = Counter()
+        self.started = time.perf_counter()
+
+
+active_profile: ContextVar[RequestProfile | None] = ContextVar("active_profile", default=None)
+
+
+def register_current_thread() -> None:
+    """Called from instrumented stages; makes the current thread part of the active profile, if any."""
+    profile = active_profile.get()
+    if profile is not None:
+        profile.threads.add(threading.get_ident())
+
+
+def fold_stack(frame: FrameType | None) -> str:
+    frames = []
+    while frame is not None and len(frames) < _MAX_STACK_DEPTH:
+        code = frame.f_code
+        frames.append(f"{frame.f_globals.get('__name__', '?')}:{code.co_name}:{frame.f_lineno}")
+        frame = frame.f_back
+    return ";".join(reversed(frames))
+
+
+class SlowRequestProfiler:
+    def __init__(self) -> None:
+        self._profiles: set[RequestProfile] = set()
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+
+    @property
+    def enabled(self) -> bool:
+        return settings.profile_slow_request_seconds > 0 and settings.profile_sample_rate > 0
+
+    def begin(self) -> RequestProfile:
+        profile = RequestProfile()
+        with self._lock:
+            self._profiles.add(profile)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._sample_loop, name="profiler", daemon=True)
+                self._thread.start()
+        return profile
+
+    def end(self, profile: RequestProfile, label: str) -> Path | None:
+        """Stop sampling ``profile``; writes and returns its folded stacks if the request was slow."""
+        with self._lock:
+            self._profiles.discard(profile)
+        elapsed = time.perf_counter() - profile.started
+        if elapsed < settings.profile_slow_request_seconds or not profile.samples:
+            return None
+        directory = Path(settings.profile_dir)
+        directory.mkdir(parents=True, exist_ok=True)
+        slug = re.sub(r"[^A-Za-z0-9]+", "-", label).strip("-")
+        path = directory / f"{datetime.now(timezone.utc):%Y%m%dT%H%M%S%f}-{slug}-{elapsed * 1000:.0f}ms.folded"
+        path.write_text(
+            "".join(f"{stack} {count}\n" for stack, count in profile.samples.most_common()), encoding="utf-8"
+        )
+        logger.info("slow request %s took %.0fms; profile written to %s", label, elapsed * 1000, path)
+        return path
+
+    def _sample_loop(self) -> None:
+        own = threading.get_ident()
+        while True:
+            time.sleep(settings.profile_interval_seconds)
+            with self._lock:
+                profiles = list(self._profiles)
+            if not profiles:
+                continue
+            frames = sys._current_frames()
+            for profile in profiles:
+                for thread_id in tuple(profile.threads):
+                    frame = frames.get(thread_id)
+                    if frame is not None and thread_id != own:
+                        profile.samples[fold_stack(frame)] += 1
+
+
+profiler = SlowRequestProfiler()
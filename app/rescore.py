@@ -0,0 +1,75 @@
+"""Rescore every agent from the events table: ``python -m app.rescore``.
+
+Streams ``(id, agent_id, event_type)`` columns in chunks, scores them with the
+vectorized batch engine and rewrites ``agent_score_aggregates`` under the
+current ``MODEL_VERSION``. Run it after changing event weights. History that
+retention has compacted away is read back from the daily rollups.
+"""
+from __future__ import annotations
+
+import argparse
+import logging
+import time
+from datetime import timedelta
+
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.db import get_session_factory
+from app.services.batch_scoring import ScoreTotalsAccumulator, encode_event_types
+from app.services.scoring import uses_decay_model
+from app.store import (
+    get_agent_score_aggregate,
+    get_compacted_before,
+    iter_compacted_event_columns,
+    iter_event_columns,
+    replace_agent_score_aggregates,
+)
+
+
+logger = logging.getLogger(__name__)
+
+
+def rescore_all_agents(db: Session, chunk_size: int = 100_000, write_batch_size: int = 500) -> int:
+    """Recompute and persist aggregates for every agent; returns the number of agents written."""
+    decay = uses_decay_model(settings.model_version)
+    accumulator = ScoreTotalsAccumulator(settings.decay_half_life_days * 86400 if decay else None)
+    compacted_before = get_compacted_before(db)
+    if compacted_before is not None:
+        for agent_ids, event_types, bucket_starts, counts in iter_compacted_event_columns(
+            db, compacted_before, chunk_size
+        ):
+            midpoints = [bucket_start + timedelta(hours=12) for bucket_start in bucket_starts] if decay else None
+            accumulator.add(agent_ids, encode_event_types(event_types), None, midpoints, counts)
+    for ids, agent_ids, event_types, occurred_at in iter_event_columns(db, chunk_size, since=compacted_before):
+        accumulator.add(agent_ids, encode_event_types(event_types), ids, occurred_at if decay else None)
+    for agent_id in accumulator.totals.keys() - accumulator.last_event_ids.keys():
+        # Every event of this agent was compacted; keep the id it was last rebuilt at.
+        existing = get_agent_score_aggregate(db, agent_id)
+        accumulator.last_event_ids[agent_id] = existing.last_event_id if existing is not None else 0
+
+    rows = [
+        (agent_id, totals, accumulator.event_counts[agent_id], accumulator.last_event_ids[agent_id])
+        for agent_id, totals in sorted(accumulator.totals.items())
+    ]
+    for start in range(0, len(rows), write_batch_size):
+        replace_agent_score_aggregates(db, rows[start : start + write_batch_size], enqueue_jobs=True)
+        db.commit()
+    return len(rows)
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m app.rescore", description="Rescore every agent.")
+    parser.add_argument("--chunk-size", type=int, default=100_000, help="events read per chunk")
+    parser.add_argument("--write-batch-size", type=int, default=500, help="aggregate rows per upsert")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(levelname)-5.5s [%(name)s] %(message)s")
+    started = time.perf_counter()
+    with get_session_factory()() as db:
+        agents = rescore_all_agents(db, args.chunk_size, args.write_batch_size)
+    logger.info("rescored %d agents in %.1fs", agents, time.perf_counter() - started)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+"""Event retention and compaction: ``python -m app.retention``.
+
+Events older than ``EVENT_RETENTION_DAYS`` are folded away: their per-type counts
+already live in ``event_rollups_daily`` (and their score contribution in
+``agent_score_aggregates``), so the raw rows can go. The watermark is recorded in
+``retention_state`` *before* anything is deleted, which is what lets rebuilds and
+rescores read compacted history from the rollups and keep scores unchanged.
+
+On Postgres with a partitioned ``events`` table (migration 0008) whole monthly
+partitions are dropped; rows left in the default partition, or in an
+unpartitioned table, are deleted in batches. The ``event_ids`` claims of the
+compacted events are released with them.
+
+Partition upkeep runs on every invocation, whether or not retention is enabled:
+without future partitions new rows land in ``events_default``, and a month with
+rows there can never get its own partition.
+"""
+from __future__ import annotations
+
+import argparse
+import logging
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.db import get_session_factory
+from app.services.scoring import EVENT_WINDOWS
+from app.store import (
+    delete_events_before,
+    get_compacted_before,
+    prune_hourly_rollups,
+    release_event_ids_before,
+    set_compacted_before,
+)
+
+
+logger = logging.getLogger(__name__)
+
+PARTITION_PREFIX = "events_p"
+
+
+@dataclass
+class RetentionResult:
+    watermark: datetime
+    dropped_partitions: list[str]
+    deleted_events: int
+    released_event_ids: int
+    pruned_hourly_rollups: int
+
+
+def _month_start(value: datetime) -> datetime:
+    return value.astimezone(timezone.utc).replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def _next_month(value: datetime) -> datetime:
+    return value.replace(year=value.year + 1, month=1) if value.month == 12 else value.replace(month=value.month + 1)
+
+
+def partition_name(month: datetime) -> str:
+    return f"{PARTITION_PREFIX}{month:%Y%m}"
+
+
+def _partition_month(name: str) -> datetime | None:
+    suffix = name.removeprefix(PARTITION_PREFIX)
+    if name == suffix or len(suffix) != 6 or not suffix.isdigit():
+        return None
+    return datetime(int(suffix[:4]), int(suffix[4:]), 1, tzinfo=timezone.utc)
+
+
+def retention_watermark(now: datetime, retention_days: int) -> datetime:
+    """First instant that is kept: the start of the month ``retention_days`` ago.
+
+    Aligning to months means the cutoff always falls on a partition boundary and
+    on a daily rollup boundary.
+    """
+    longest_window = max(EVENT_WINDOWS.values())
+    if timedelta(days=retention_days) <= longest_window:
+        raise ValueError(f"retention must be longer than the {longest_window.days}-day scoring window")
+    return _month_start(now - timedelta(days=retention_days))
+
+
+def events_table_is_partitioned(db: Session) -> bool:
+    if db.get_bind().dialect.name != "postgresql":
+        return False
+    return db.execute(text("SELECT relkind FROM pg_class WHERE oid = 'events'::regclass")).scalar() == "p"
+
+
+def list_event_partitions(db: Session) -> list[str]:
+    rows = db.execute(
+        text(
+            "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+            "WHERE i.inhparent = 'events'::regclass ORDER BY c.relname"
+        )
+    )
+    return list(rows.scalars())
+
+
+def ensure_event_partitions(db: Session, now: datetime, months_ahead: int) -> list[str]:
+    """Create monthly partitions from this month through ``months_ahead`` months out."""
+    existing = set(list_event_partitions(db))
+    created = []
+    month = _month_start(now)
+    for _ in range(months_ahead + 1):
+        name = partition_name(month)
+        upper = _next_month(month)
+        if name not in existing:
+            in_default = db.execute(
+                text("SELECT 1 FROM events_default WHERE occurred_at >= :lower AND occurred_at < :upper LIMIT 1"),
+                {"lower": month, "upper": upper},
+            ).first()
+            if in_default is not None:
+                # Attaching would violate the default partition's constraint.
+                logger.warning("skipping partition %s: rows for that month are in events_default", name)
+            else:
+                db.execute(
+                    text(
+                        f"CREATE TABLE {name} PARTITION OF events "
+                        f"FOR VALUES FROM ('{month.isoformat()}') TO ('{upper.isoformat()}')"
+                    )
+                )
+                created.append(name)
+        month = upper
+    db.commit()
+    return created
+
+
+def maintain_event_partitions(db: Session, now: datetime | None = None) -> list[str] | None:
+    """Create upcoming monthly partitions; ``None`` when ``events`` is not partitioned."""
+    if not events_table_is_partitioned(db):
+        return None
+    return ensure_event_partitions(db, now or datetime.now(timezone.utc), settings.event_partition_months_ahead)
+
+
+def apply_retention(db: Session, now: datetime | None = None, retention_days: int | None = None) -> RetentionResult:
+    """Compact events older than the retention horizon; safe to rerun."""
+    now = now or datetime.now(timezone.utc)
+    watermark = retention_watermark(now, settings.event_retention_days if retention_days is None else retention_days)
+    partitioned = events_table_is_partitioned(db)
+
+    current = get_compacted_before(db)
+    if current is None or current < watermark:
+        # Readers switch to the rollups for older history before the rows disappear.
+        set_compacted_before(db, watermark)
+    else:
+        watermark = current
+
+    dropped = []
+    if partitioned:
+        for name in list_event_partitions(db):
+            month = _partition_month(name)
+            if month is not None and _next_month(month) <= watermark:
+                db.execute(text(f"DROP TABLE {name}"))
+                dropped.append(name)
+        db.commit()
+
+    deleted = delete_events_before(db, watermark)
+    released = release_event_ids_before(db, watermark)
+    pruned = prune_hourly_rollups(db, watermark)
+    return RetentionResult(watermark, dropped, deleted, released, pruned)
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m app.retention", description="Create upcoming events partitions and compact old events."
+    )
+    parser.add_argument("--retention-days", type=int, default=settings.event_retention_days)
+    parser.add_argument("--ensure-partitions", action="store_true", help="only create upcoming partitions")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(levelname)-5.5s [%(name)s] %(message)s")
+    started = time.perf_counter()
+    with get_session_factory()() as db:
+        created = maintain_event_partitions(db)
+        if created is not None:
+            logger.info("events partitions created: %s", ", ".join(created) or "none needed")
+        if args.ensure_partitions:
+            return
+        if args.retention_days <= 0:
+            logger.info("retention disabled (EVENT_RETENTION_DAYS=0)")
+            return
+        result = apply_retention(db, retention_days=args.retention_days)
+    logger.info(
+        "compacted events before %s: dropped %d partitions, deleted %d events, released %d event ids, "
+        "pruned %d hourly buckets in %.1fs",
+        result.watermark.isoformat(),
+        len(result.dropped_partitions),
+        result.deleted_events,
+        result.released_event_ids,
+        result.pruned_hourly_rollups,
+        time.perf_counter() - started,
+    )
+
+
+if __name__ == "__main__":
+    main()
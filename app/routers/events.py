@@ -1,32 +1,213 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, HTTPException, status
+import base64
+import json
+from collections.abc import Iterator
+from datetime import datetime
+from typing import Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import Response, StreamingResponse
+from pydantic import ValidationError
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
+from app.config import settings
 from app.db import get_db
-from app.schemas import AgentEventsResponse, EventAccepted, EventIn
-from app.store import event_record_to_schema, insert_event, list_agent_events
+from app.metrics import count_duplicate, stage
+from app.schemas import (
+    AgentEventsResponse,
+    EventAccepted,
+    EventBatchAccepted,
+    EventBatchIn,
+    EventBatchItem,
+    EventIn,
+    EventStreamAccepted,
+)
+from app.services.dedup import event_dedup
+from app.services.serialization import encode_events_page
+from app.store import (
+    EventRow,
+    event_row_to_schema,
+    insert_event,
+    insert_events,
+    iter_agent_event_rows,
+    list_agent_event_rows,
+)
 
 
 router = APIRouter(prefix="/intake", tags=["intake"])
 
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+MAX_NDJSON_LINE_BYTES = 1024 * 1024
+MAX_PAGE_SIZE = 1000
+
 
 @router.post("/events", response_model=EventAccepted)
 def ingest_event(event: EventIn, db: Session = Depends(get_db)) -> EventAccepted:
+    # Retries of stored events are answered without attempting the INSERT.
+    if event_dedup.check(db, event.event_id, event.occurred_at):
+        raise _duplicate_event(event)
     try:
         insert_event(db, event)
     except IntegrityError as exc:
         db.rollback()
-        raise HTTPException(
-            status_code=status.HTTP_409_CONFLICT,
-            detail=f"event_id '{event.event_id}' already exists",
-        ) from exc
+        event_dedup.remember([(event.event_id, event.occurred_at)])
+        count_duplicate("constraint")
+        raise _duplicate_event(event) from exc
 
     return EventAccepted(accepted=True, event_id=event.event_id, agent_id=event.agent_id)
 
 
+def _duplicate_event(event: EventIn) -> HTTPException:
+    return HTTPException(status_code=status.HTTP_409_CONFLICT, detail=f"event_id '{event.event_id}' already exists")
+
+
+def _batch_result(events: list[EventIn], accepted: list[bool]) -> EventBatchAccepted:
+    results = [
+        EventBatchItem(
+            event_id=event.event_id,
+            agent_id=event.agent_id,
+            status="accepted" if was_accepted else "duplicate",
+        )
+        for event, was_accepted in zip(events, accepted)
+    ]
+    accepted_count = sum(accepted)
+    return EventBatchAccepted(
+        accepted_count=accepted_count,
+        duplicate_count=len(results) - accepted_count,
+        results=results,
+    )
+
+
+@router.post("/events:batch", response_model=EventBatchAccepted)
+def ingest_event_batch(batch: EventBatchIn, db: Session = Depends(get_db)) -> EventBatchAccepted:
+    return _batch_result(batch.events, insert_events(db, batch.events))
+
+
+@router.post("/events/stream", response_model=EventStreamAccepted)
+async def ingest_event_stream(request: Request, db: Session = Depends(get_db)) -> EventStreamAccepted:
+    """Ingest an NDJSON body, inserting every ``stream_chunk_size`` events as they arrive.
+
+    Each chunk is committed on its own, so a malformed line stops the stream there:
+    chunks already flushed stay stored and the error reports how many events they
+    held, while lines parsed since the last flush are dropped with the remainder.
+    """
+    accepted_count = 0
+    duplicate_count = 0
+    pending: list[EventIn] = []
+    buffer = b""
+    line_number = 0
+
+    async def flush() -> None:
+        nonlocal accepted_count, duplicate_count
+        accepted = await run_in_threadpool(insert_events, db, pending)
+        accepted_count += sum(accepted)
+        duplicate_count += len(accepted) - sum(accepted)
+        pending.clear()
+
+    def parse(line: bytes) -> None:
+        nonlocal line_number
+        line_number += 1
+        if not line.strip():
+            return
+        try:
+            pending.append(EventIn.model_validate_json(line))
+        except ValidationError as exc:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail={
+                    "line": line_number,
+                    # The input of a json_invalid error is raw bytes, which cannot be encoded.
+                    "errors": exc.errors(include_url=False, include_input=False),
+                    "accepted_count": accepted_count,
+                    "duplicate_count": duplicate_count,
+                },
+            ) from exc
+
+    async for chunk in request.stream():
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            parse(line)
+            if len(pending) >= settings.stream_chunk_size:
+                await flush()
+        if len(buffer) > MAX_NDJSON_LINE_BYTES:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=f"line {line_number + 1} exceeds {MAX_NDJSON_LINE_BYTES} bytes",
+            )
+
+    parse(buffer)
+    if pending:
+        await flush()
+
+    return EventStreamAccepted(accepted_count=accepted_count, duplicate_count=duplicate_count)
+
+
+@router.get("/events/{agent_id}/stream")
+def export_agent_events(agent_id: str, db: Session = Depends(get_db)) -> StreamingResponse:
+    def generate() -> Iterator[bytes]:
+        # The request-scoped session may already be closed by the time the body is
+        # sent; the Session reopens a connection on first use, so close it again here.
+        try:
+            for rows in iter_agent_event_rows(db, agent_id, batch_size=settings.stream_chunk_size):
+                yield b"".join(event_row_to_schema(row).model_dump_json().encode() + b"\n" for row in rows)
+        finally:
+            db.close()
+
+    return StreamingResponse(generate(), media_type=NDJSON_MEDIA_TYPE)
+
+
+def _encode_cursor(row: EventRow) -> str:
+    raw = json.dumps([row.occurred_at.isoformat(), row.id]).encode()
+    return base64.urlsafe_b64encode(raw).decode()
+
+
+def _decode_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        occurred_at, record_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return datetime.fromisoformat(occurred_at), int(record_id)
+    except (ValueError, TypeError) as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="invalid cursor") from exc
+
+
 @router.get("/events/{agent_id}", response_model=AgentEventsResponse)
-def get_agent_events(agent_id: str, db: Session = Depends(get_db)) -> AgentEventsResponse:
-    events = [event_record_to_schema(record) for record in list_agent_events(db, agent_id)]
-    return AgentEventsResponse(agent_id=agent_id, event_count=len(events), events=events)
+def get_agent_events(
+    agent_id: str,
+    since: datetime | None = None,
+    until: datetime | None = None,
+    event_type: str | None = None,
+    cursor: str | None = None,
+    limit: int | None = Query(default=None, ge=1, le=MAX_PAGE_SIZE),
+    order: Literal["asc", "desc"] = "asc",
+    db: Session = Depends(get_db),
+) -> Response:
+    """List an agent's events; pass ``limit`` to page through them with ``next_cursor``.
+
+    Rows are encoded straight to JSON (see ``app.services.serialization``);
+    ``response_model`` only documents the shape.
+    """
+    rows = list_agent_event_rows(
+        db,
+        agent_id,
+        since=since,
+        until=until,
+        event_type=event_type,
+        after=_decode_cursor(cursor) if cursor is not None else None,
+        limit=limit + 1 if limit is not None else None,
+        descending=order == "desc",
+    )
+
+    return _events_page(agent_id, rows, limit)
+
+
+def _events_page(agent_id: str, rows: list[EventRow], limit: int | None) -> Response:
+    next_cursor = None
+    if limit is not None and len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = _encode_cursor(rows[-1])
+
+    with stage("serialize.events_page"):
+        return Response(content=encode_events_page(agent_id, rows, next_cursor), media_type="application/json")
@@ -0,0 +1,63 @@
+"""AsyncSession variants of the hot ``/v1/intake`` routes, mounted when ``ASYNC_DB`` is enabled."""
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Literal
+
+from fastapi import APIRouter, Depends, Query, Response
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import async_store
+from app.db import get_async_db
+from app.metrics import count_duplicate
+from app.routers.events import MAX_PAGE_SIZE, _batch_result, _decode_cursor, _duplicate_event, _events_page
+from app.services.dedup import event_dedup
+from app.schemas import AgentEventsResponse, EventAccepted, EventBatchAccepted, EventBatchIn, EventIn
+
+
+router = APIRouter(prefix="/intake", tags=["intake"])
+
+
+@router.post("/events", response_model=EventAccepted)
+async def ingest_event(event: EventIn, db: AsyncSession = Depends(get_async_db)) -> EventAccepted:
+    if await db.run_sync(event_dedup.check, event.event_id, event.occurred_at):
+        raise _duplicate_event(event)
+    try:
+        await async_store.insert_event(db, event)
+    except IntegrityError as exc:
+        await db.rollback()
+        event_dedup.remember([(event.event_id, event.occurred_at)])
+        count_duplicate("constraint")
+        raise _duplicate_event(event) from exc
+
+    return EventAccepted(accepted=True, event_id=event.event_id, agent_id=event.agent_id)
+
+
+@router.post("/events:batch", response_model=EventBatchAccepted)
+async def ingest_event_batch(batch: EventBatchIn, db: AsyncSession = Depends(get_async_db)) -> EventBatchAccepted:
+    return _batch_result(batch.events, await async_store.insert_events(db, batch.events))
+
+
+@router.get("/events/{agent_id}", response_model=AgentEventsResponse)
+async def get_agent_events(
+    agent_id: str,
+    since: datetime | None = None,
+    until: datetime | None = None,
+    event_type: str | None = None,
+    cursor: str | None = None,
+    limit: int | None = Query(default=None, ge=1, le=MAX_PAGE_SIZE),
+    order: Literal["asc", "desc"] = "asc",
+    db: AsyncSession = Depends(get_async_db),
+) -> Response:
+    rows = await async_store.list_agent_event_rows(
+        db,
+        agent_id,
+        since=since,
+        until=until,
+        event_type=event_type,
+        after=_decode_cursor(cursor) if cursor is not None else None,
+        limit=limit + 1 if limit is not None else None,
+        descending=order == "desc",
+    )
+    return _events_page(agent_id, rows, limit)
@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+from fastapi import APIRouter, Depends
+from sqlalchemy.orm import Session
+
+from app.db import get_db
+from app.schemas import PolicyDecisionRequest, PolicyDecisionResponse
+from app.services.policy import PolicyContext, get_policy
+from app.store import count_events_in_window, get_agent_score
+
+
+router = APIRouter(prefix="/policy", tags=["policy"])
+
+
+@router.post("/decide", response_model=PolicyDecisionResponse)
+def decide(payload: PolicyDecisionRequest, db: Session = Depends(get_db)) -> PolicyDecisionResponse:
+    policy = get_policy()
+    result = get_agent_score(db, payload.agent_id)
+    now = datetime.now(timezone.utc)
+    # Only the windows some rule actually reads are counted.
+    window_counts = {
+        name: count_events_in_window(db, payload.agent_id, now - length, now)
+        for name, length in policy.windows.items()
+    }
+    decision, rule = policy.evaluate(
+        PolicyContext(
+            score=result.score,
+            tier=result.tier,
+            window_counts=window_counts,
+            event_type=payload.event_type,
+            metadata=payload.metadata,
+        )
+    )
+    return PolicyDecisionResponse(
+        agent_id=payload.agent_id,
+        decision=decision,
+        rule=rule,
+        policy=policy.name,
+        trust_score=result.score,
+        trust_tier=result.tier,
+    )
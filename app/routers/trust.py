@@ -1,23 +1,38 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends
+from datetime import datetime, timedelta, timezone
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
 
 from app.config import settings
 from app.db import get_db
-from app.schemas import TrustScoreResponse
-from app.services.scoring import calculate_trust_score
-from app.store import list_agent_events, save_score_snapshot
+from app.schemas import (
+    AgentWindowsResponse,
+    DriftingAgent,
+    DriftResponse,
+    ScoreHistoryPoint,
+    ScoreHistoryResponse,
+    TrustScoreResponse,
+    TrustScoresRequest,
+    TrustScoresResponse,
+    WindowFactors,
+)
+from app.services.downsampling import downsample_scores
+from app.services.drift import drift_direction, drift_std, top_drifting_agents
+from app.services.scoring import weighted_event_sum
+from app.store import get_agent_score, get_agent_scores, get_agent_window_counts, iter_score_history
 
 
 router = APIRouter(prefix="/trust", tags=["trust"])
 
+DEFAULT_HISTORY_RANGE = timedelta(days=7)
+MAX_HISTORY_POINTS = 2000
+
 
 @router.get("/score/{agent_id}", response_model=TrustScoreResponse)
 def get_trust_score(agent_id: str, db: Session = Depends(get_db)) -> TrustScoreResponse:
-    events = list_agent_events(db, agent_id)
-    result = calculate_trust_score(events)
-    save_score_snapshot(db, agent_id, result)
+    result = get_agent_score(db, agent_id)
 
     return TrustScoreResponse(
         agent_id=agent_id,
@@ -26,3 +41,88 @@ def get_trust_score(agent_id: str, db: Session = Depends(get_db)) -> TrustScoreR
         model_version=settings.model_version,
         factors=result.factors,
     )
+
+
+@router.post("/scores", response_model=TrustScoresResponse)
+def get_trust_scores(payload: TrustScoresRequest, db: Session = Depends(get_db)) -> TrustScoresResponse:
+    """Scores for many agents in one round trip, in request order (duplicates collapsed)."""
+    results = get_agent_scores(db, payload.agent_ids)
+    return TrustScoresResponse(
+        scores=[
+            TrustScoreResponse(
+                agent_id=agent_id,
+                trust_score=result.score,
+                trust_tier=result.tier,
+                model_version=settings.model_version,
+                factors=result.factors,
+            )
+            for agent_id, result in results.items()
+        ]
+    )
+
+
+@router.get("/score/{agent_id}/history", response_model=ScoreHistoryResponse)
+def get_score_history(
+    agent_id: str,
+    since: datetime | None = None,
+    until: datetime | None = None,
+    points: int = Query(default=200, ge=1, le=MAX_HISTORY_POINTS),
+    db: Session = Depends(get_db),
+) -> ScoreHistoryResponse:
+    """Score over time, downsampled to at most ``points`` min/max/last buckets (default: the last 7 days)."""
+    until = until or datetime.now(timezone.utc)
+    since = since or until - DEFAULT_HISTORY_RANGE
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    if until.tzinfo is None:
+        until = until.replace(tzinfo=timezone.utc)
+    if since >= until:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="since must be before until")
+
+    buckets = downsample_scores(iter_score_history(db, agent_id, since, until), since, until, points)
+    return ScoreHistoryResponse(
+        agent_id=agent_id,
+        since=since,
+        until=until,
+        points=[
+            ScoreHistoryPoint(
+                bucket_start=bucket.bucket_start,
+                min=bucket.min,
+                max=bucket.max,
+                last=bucket.last,
+                last_at=bucket.last_at,
+                tier=bucket.tier,
+                count=bucket.count,
+            )
+            for bucket in buckets
+        ],
+    )
+
+
+@router.get("/windows/{agent_id}", response_model=AgentWindowsResponse)
+def get_trust_windows(agent_id: str, db: Session = Depends(get_db)) -> AgentWindowsResponse:
+    windows = {
+        name: WindowFactors(event_counts=counts, weighted_sum=weighted_event_sum(counts))
+        for name, counts in get_agent_window_counts(db, agent_id).items()
+    }
+    return AgentWindowsResponse(agent_id=agent_id, windows=windows)
+
+
+@router.get("/drift", response_model=DriftResponse)
+def get_drift(limit: int = Query(20, ge=1, le=1000), db: Session = Depends(get_db)) -> DriftResponse:
+    agents = [
+        DriftingAgent(
+            agent_id=state.agent_id,
+            drift=state.drift,
+            direction=drift_direction(state),
+            last_score=state.last_score,
+            ewma=state.ewma,
+            std=drift_std(state),
+            samples=state.samples,
+            alerting=state.alerting,
+            last_alert_at=state.last_alert_at,
+            updated_at=state.updated_at,
+        )
+        for state in top_drifting_agents(db, limit)
+    ]
+    return DriftResponse(agents=agents)
@@ -0,0 +1,26 @@
+"""AsyncSession variants of the hot ``/v1/trust`` routes, mounted when ``ASYNC_DB`` is enabled."""
+from __future__ import annotations
+
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import async_store
+from app.config import settings
+from app.db import get_async_db
+from app.schemas import TrustScoreResponse
+
+
+router = APIRouter(prefix="/trust", tags=["trust"])
+
+
+@router.get("/score/{agent_id}", response_model=TrustScoreResponse)
+async def get_trust_score(agent_id: str, db: AsyncSession = Depends(get_async_db)) -> TrustScoreResponse:
+    result = await async_store.get_agent_score(db, agent_id)
+
+    return TrustScoreResponse(
+        agent_id=agent_id,
+        trust_score=result.score,
+        trust_tier=result.tier,
+        model_version=settings.model_version,
+        factors=result.factors,
+    )
@@ -1,11 +1,15 @@
 from __future__ import annotations
 
 from datetime import datetime
-from typing import Any
+from typing import Any, Literal
 
 from pydantic import BaseModel, Field
 
 
+MAX_BATCH_EVENTS = 10_000
+MAX_BATCH_AGENTS = 1000
+
+
 class EventIn(BaseModel):
     event_id: str = Field(..., min_length=1)
     agent_id: str = Field(..., min_length=1)
@@ -21,10 +25,32 @@ class EventAccepted(BaseModel):
     agent_id: str
 
 
+class EventBatchIn(BaseModel):
+    events: list[EventIn] = Field(..., min_length=1, max_length=MAX_BATCH_EVENTS)
+
+
+class EventBatchItem(BaseModel):
+    event_id: str
+    agent_id: str
+    status: Literal["accepted", "duplicate"]
+
+
+class EventBatchAccepted(BaseModel):
+    accepted_count: int
+    duplicate_count: int
+    results: list[EventBatchItem]
+
+
+class EventStreamAccepted(BaseModel):
+    accepted_count: int
+    duplicate_count: int
+
+
 class AgentEventsResponse(BaseModel):
     agent_id: str
     event_count: int
     events: list[EventIn]
+    next_cursor: str | None = None
 
 
 class TrustScoreResponse(BaseModel):
@@ -33,3 +59,70 @@ class TrustScoreResponse(BaseModel):
     trust_tier: str
     model_version: str
     factors: dict[str, float]
+
+
+class TrustScoresRequest(BaseModel):
+    agent_ids: list[str] = Field(..., min_length=1, max_length=MAX_BATCH_AGENTS)
+
+
+class TrustScoresResponse(BaseModel):
+    scores: list[TrustScoreResponse]
+
+
+class WindowFactors(BaseModel):
+    event_counts: dict[str, int]
+    weighted_sum: float
+
+
+class AgentWindowsResponse(BaseModel):
+    agent_id: str
+    windows: dict[str, WindowFactors]
+
+
+class PolicyDecisionRequest(BaseModel):
+    agent_id: str = Field(..., min_length=1)
+    event_type: str | None = Field(default=None, min_length=1)
+    metadata: dict[str, Any] = Field(default_factory=dict)
+
+
+class PolicyDecisionResponse(BaseModel):
+    agent_id: str
+    decision: Literal["allow", "review", "block"]
+    rule: str | None
+    policy: str
+    trust_score: float
+    trust_tier: str
+
+
+class DriftingAgent(BaseModel):
+    agent_id: str
+    drift: float
+    direction: Literal["up", "down"]
+    last_score: float
+    ewma: float
+    std: float
+    samples: int
+    alerting: bool
+    last_alert_at: datetime | None
+    updated_at: datetime
+
+
+class DriftResponse(BaseModel):
+    agents: list[DriftingAgent]
+
+
+class ScoreHistoryPoint(BaseModel):
+    bucket_start: datetime
+    min: float
+    max: float
+    last: float
+    last_at: datetime
+    tier: str
+    count: int
+
+
+class ScoreHistoryResponse(BaseModel):
+    agent_id: str
+    since: datetime
+    until: datetime
+    points: list[ScoreHistoryPoint]
@@ -0,0 +1,145 @@
+"""Vectorized scoring of many agents at once.
+
+Input is columnar: one array of agent ids and one of event-type codes per event.
+Per-agent deltas come from a single grouped sum (``np.bincount``) over weight
+lookup tables, and the final clamping/tiering reuses ``score_from_totals`` so the
+results match ``calculate_trust_score`` exactly.
+"""
+from __future__ import annotations
+
+from collections.abc import Sequence
+from datetime import datetime, timezone
+
+import numpy as np
+
+from app.services.scoring import (
+    NEGATIVE_EVENTS,
+    POSITIVE_EVENTS,
+    DecayState,
+    ScoreResult,
+    ScoreTotals,
+    score_from_totals,
+)
+
+
+def event_type_vocabulary() -> tuple[str, ...]:
+    """Weighted event types in code order; every other type encodes to ``len(vocabulary)``."""
+    return (*POSITIVE_EVENTS, *NEGATIVE_EVENTS)
+
+
+def _weight_tables() -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    vocabulary = event_type_vocabulary()
+    positive = np.array([POSITIVE_EVENTS.get(event_type, 0.0) for event_type in vocabulary] + [0.0])
+    negative = np.array([NEGATIVE_EVENTS.get(event_type, 0.0) for event_type in vocabulary] + [0.0])
+    unknown = np.zeros(len(vocabulary) + 1)
+    unknown[-1] = 1.0
+    return positive, negative, unknown
+
+
+def encode_event_types(event_types: Sequence[str] | np.ndarray) -> np.ndarray:
+    """Map event-type strings to integer codes, looking up each distinct string once."""
+    codes_by_type = {event_type: code for code, event_type in enumerate(event_type_vocabulary())}
+    unknown_code = len(codes_by_type)
+    distinct, inverse = np.unique(np.asarray(event_types, dtype=object), return_inverse=True)
+    distinct_codes = np.array([codes_by_type.get(event_type, unknown_code) for event_type in distinct], dtype=np.int64)
+    return distinct_codes[inverse] if len(distinct) else np.zeros(0, dtype=np.int64)
+
+
+class ScoreTotalsAccumulator:
+    """Per-agent grouped sums fed one columnar chunk at a time.
+
+    With ``half_life_seconds`` set, chunks must also carry ``occurred_at`` and each
+    agent's totals get a ``DecayState``: within a chunk events are decayed to the
+    agent's latest timestamp in one vectorized pass, and chunks are merged with
+    ``DecayState.merge``.
+
+    ``multiplicities`` lets one row stand for several events of the same type, as
+    when feeding compacted daily rollups.
+    """
+
+    def __init__(self, half_life_seconds: float | None = None) -> None:
+        self.half_life_seconds = half_life_seconds
+        self._positive, self._negative, self._unknown = _weight_tables()
+        self.totals: dict[str, ScoreTotals] = {}
+        self.event_counts: dict[str, int] = {}
+        self.last_event_ids: dict[str, int] = {}
+
+    def add(
+        self,
+        agent_ids: Sequence[str] | np.ndarray,
+        event_codes: np.ndarray,
+        event_ids: Sequence[int] | np.ndarray | None = None,
+        occurred_at: Sequence[datetime] | None = None,
+        multiplicities: Sequence[int] | np.ndarray | None = None,
+    ) -> None:
+        if len(agent_ids) == 0:
+            return
+        agents, groups = np.unique(np.asarray(agent_ids, dtype=object), return_inverse=True)
+        codes = np.asarray(event_codes, dtype=np.int64)
+        size = len(agents)
+        weights = np.ones(len(codes)) if multiplicities is None else np.asarray(multiplicities, dtype=np.float64)
+
+        positive = np.bincount(groups, weights=self._positive[codes] * weights, minlength=size)
+        negative = np.bincount(groups, weights=self._negative[codes] * weights, minlength=size)
+        unknown = np.bincount(groups, weights=self._unknown[codes] * weights, minlength=size)
+        counts = np.bincount(groups, weights=weights, minlength=size).astype(np.int64)
+        last_ids = None
+        if event_ids is not None:
+            last_ids = np.zeros(size, dtype=np.int64)
+            np.maximum.at(last_ids, groups, np.asarray(event_ids, dtype=np.int64))
+
+        decay = None
+        if self.half_life_seconds is not None:
+            decay = self._decay_chunk(groups, codes, size, occurred_at, weights)
+
+        for index, agent_id in enumerate(agents.tolist()):
+            totals = self.totals.get(agent_id)
+            if totals is None:
+                totals = self.totals[agent_id] = ScoreTotals()
+                if decay is not None:
+                    totals.decay = DecayState()
+                    totals.half_life_seconds = self.half_life_seconds
+            if decay is not None:
+                positive_decayed, negative_decayed, reference = decay
+                chunk_state = DecayState(
+                    float(positive_decayed[index]),
+                    float(negative_decayed[index]),
+                    datetime.fromtimestamp(float(reference[index]), tz=timezone.utc),
+                )
+                totals.decay.merge(chunk_state, self.half_life_seconds)
+            totals.positive_delta += float(positive[index])
+            totals.negative_delta += float(negative[index])
+            totals.unknown_events += float(unknown[index])
+            self.event_counts[agent_id] = self.event_counts.get(agent_id, 0) + int(counts[index])
+            if last_ids is not None:
+                self.last_event_ids[agent_id] = max(self.last_event_ids.get(agent_id, 0), int(last_ids[index]))
+
+    def _decay_chunk(
+        self,
+        groups: np.ndarray,
+        codes: np.ndarray,
+        size: int,
+        occurred_at: Sequence[datetime] | None,
+        weights: np.ndarray,
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        if occurred_at is None:
+            raise ValueError("occurred_at is required when scoring with decay")
+        seconds = np.array(
+            [(value if value.tzinfo else value.replace(tzinfo=timezone.utc)).timestamp() for value in occurred_at]
+        )
+        reference = np.full(size, -np.inf)
+        np.maximum.at(reference, groups, seconds)
+        factors = np.exp2(-(reference[groups] - seconds) / self.half_life_seconds) * weights
+        positive = np.bincount(groups, weights=self._positive[codes] * factors, minlength=size)
+        negative = np.bincount(groups, weights=self._negative[codes] * factors, minlength=size)
+        return positive, negative, reference
+
+    def results(self, now: datetime | None = None) -> dict[str, ScoreResult]:
+        return {agent_id: score_from_totals(totals, now) for agent_id, totals in self.totals.items()}
+
+
+def score_agents(agent_ids: Sequence[str] | np.ndarray, event_codes: np.ndarray) -> dict[str, ScoreResult]:
+    """Score every agent appearing in ``agent_ids`` in one vectorized pass."""
+    accumulator = ScoreTotalsAccumulator()
+    accumulator.add(agent_ids, event_codes)
+    return accumulator.results()
@@ -0,0 +1,223 @@
+"""Duplicate detection in front of single-event ingest.
+
+Runtimes retry aggressively, and without this layer every retried event costs
+an INSERT that fails on the unique constraint and a rollback. ``check`` answers
+most retries first:
+
+- ``recent`` is an LRU of the ``(event_id, occurred_at)`` pairs this process has
+  stored or seen rejected. A hit is a duplicate and needs no database access.
+- ``bloom`` is a Bloom filter over stored ``event_id``s. It is rebuilt from
+  ``events`` in a background thread at startup and extended as this process
+  inserts. A negative skips straight to the INSERT. A positive may be false, so
+  it is confirmed with a primary-key read of ``event_ids``, which is much
+  cheaper than a failed write.
+
+``DEDUP_BLOOM_CAPACITY`` is a hard cap on the filter, so its memory and rebuild
+time do not grow with the table. A rebuild loads at most half of it, newest ids
+first, leaving the other half for inserts before the next rebuild. On a larger
+table older ids are left out; retries of those fall through to the constraint.
+
+Neither structure is authoritative. Other processes insert ids this one has not
+seen, and a rebuild can race with inserts. A miss therefore always falls through
+to the INSERT, and the ``event_ids`` primary key still decides.
+"""
+from __future__ import annotations
+
+import hashlib
+import logging
+import math
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Iterable
+from datetime import datetime
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.db import get_session_factory
+from app.metrics import count_duplicate
+from app.models import EventIdRecord, EventRecord
+
+
+logger = logging.getLogger(__name__)
+
+_REBUILD_CHUNK_SIZE = 50_000
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter using double hashing over one BLAKE2b digest."""
+
+    def __init__(self, capacity: int, error_rate: float) -> None:
+        capacity = max(capacity, 1)
+        self.capacity = capacity
+        self.size = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.count = 0
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, key: str) -> Iterable[int]:
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        return ((first + i * second) % self.size for i in range(self.hashes))
+
+    def add(self, key: str) -> None:
+        for position in self._positions(key):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, key: str) -> bool:
+        return all(self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+
+
+class EventDeduplicator:
+    def __init__(self, session_factory: Callable[[], Session] | None = None) -> None:
+        self.session_factory = session_factory
+        self._recent: OrderedDict[tuple[str, datetime], None] = OrderedDict()
+        self._bloom: BloomFilter | None = None
+        # Ids inserted while a rebuild scans ``events``; added to the new filter before it is swapped in.
+        self._rebuild_pending: list[str] | None = None
+        self._lock = threading.Lock()
+        self._rebuilding = False
+        self._thread: threading.Thread | None = None
+        self.hits = {"recent": 0, "bloom": 0}
+        self.bloom_checks = 0
+
+    @property
+    def bloom_enabled(self) -> bool:
+        return settings.dedup_bloom_capacity > 0
+
+    def check(self, db: Session, event_id: str, occurred_at: datetime) -> bool:
+        """Whether the event is already stored; ``False`` means "try the INSERT", not "new"."""
+        key = (event_id, occurred_at)
+        with self._lock:
+            if key in self._recent:
+                self._recent.move_to_end(key)
+                self.hits["recent"] += 1
+                count_duplicate("recent")
+                return True
+            bloom = self._bloom
+            maybe_stored = bloom is not None and event_id in bloom
+            if maybe_stored:
+                self.bloom_checks += 1
+        if not maybe_stored:
+            return False
+
+        stored = db.execute(select(EventIdRecord.event_id).where(EventIdRecord.event_id == event_id)).first()
+        if stored is None:
+            return False
+        with self._lock:
+            self.hits["bloom"] += 1
+        count_duplicate("bloom")
+        self.remember([key])
+        return True
+
+    def remember(self, keys: Iterable[tuple[str, datetime]]) -> None:
+        """Record ``(event_id, occurred_at)`` pairs that are now stored."""
+        rebuild = False
+        with self._lock:
+            for key in keys:
+                self._recent[key] = None
+                self._recent.move_to_end(key)
+                if self._bloom is not None:
+                    self._bloom.add(key[0])
+                if self._rebuild_pending is not None:
+                    self._rebuild_pending.append(key[0])
+            while len(self._recent) > settings.dedup_recent_size:
+                self._recent.popitem(last=False)
+            if self._bloom is not None and self._bloom.count > self._bloom.capacity and not self._rebuilding:
+                # Past capacity the false positive rate climbs; resize from the table.
+                rebuild = True
+        if rebuild:
+            self.start()
+
+    def rebuild(self, db: Session) -> BloomFilter:
+        """Build a ``DEDUP_BLOOM_CAPACITY`` filter over the newest stored ids, up to half of it, and swap it in."""
+        with self._lock:
+            self._rebuild_pending = []
+        try:
+            bloom = BloomFilter(settings.dedup_bloom_capacity, settings.dedup_bloom_error_rate)
+            limit = max(bloom.capacity // 2, 1)
+            stmt = (
+                select(EventRecord.event_id)
+                .order_by(EventRecord.id.desc())
+                .limit(limit + 1)
+                .execution_options(yield_per=_REBUILD_CHUNK_SIZE)
+            )
+            truncated = False
+            for partition in db.execute(stmt).partitions():
+                for (event_id,) in partition:
+                    if bloom.count == limit:
+                        truncated = True
+                        break
+                    bloom.add(event_id)
+            if truncated:
+                logger.warning(
+                    "dedup bloom filter holds only the newest %d event ids (DEDUP_BLOOM_CAPACITY=%d); "
+                    "retries of older events fall through to the unique constraint",
+                    limit,
+                    bloom.capacity,
+                )
+            else:
+                logger.info("dedup bloom filter loaded all %d stored event ids", bloom.count)
+            with self._lock:
+                for event_id in self._rebuild_pending:
+                    bloom.add(event_id)
+                self._bloom = bloom
+            return bloom
+        finally:
+            with self._lock:
+                self._rebuild_pending = None
+
+    def start(self) -> None:
+        """Rebuild the Bloom filter in a background thread; ingest keeps working from the LRU meanwhile."""
+        if not self.bloom_enabled:
+            return
+        with self._lock:
+            if self._rebuilding:
+                return
+            self._rebuilding = True
+            self._thread = threading.Thread(target=self._rebuild_in_background, name="dedup-bloom", daemon=True)
+        self._thread.start()
+
+    def join(self, timeout: float | None = None) -> None:
+        """Wait for a background rebuild, if one is running."""
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+
+    def _rebuild_in_background(self) -> None:
+        try:
+            session_factory = self.session_factory or get_session_factory()
+            with session_factory() as db:
+                bloom = self.rebuild(db)
+            logger.info("dedup bloom filter rebuilt: %d ids, %d bits", bloom.count, bloom.size)
+        except Exception:
+            logger.exception("dedup bloom filter rebuild failed; duplicates fall through to the unique constraint")
+        finally:
+            with self._lock:
+                self._rebuilding = False
+
+    def stats(self) -> dict[str, float]:
+        with self._lock:
+            bloom = self._bloom
+            return {
+                "recent_entries": len(self._recent),
+                "recent_hits": self.hits["recent"],
+                "bloom_hits": self.hits["bloom"],
+                "bloom_checks": self.bloom_checks,
+                "bloom_ready": bloom is not None,
+                "bloom_added": bloom.count if bloom is not None else 0,
+                "bloom_capacity": bloom.capacity if bloom is not None else 0,
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._recent.clear()
+            self._bloom = None
+            self.hits = {"recent": 0, "bloom": 0}
+            self.bloom_checks = 0
+
+
+event_dedup = EventDeduplicator()
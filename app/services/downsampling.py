@@ -0,0 +1,57 @@
+"""Streaming downsampling of score time series into fixed-width buckets.
+
+The range ``[since, until)`` is split into ``points`` equal buckets; each
+non-empty bucket reports the min, max and last score (and the last tier) of the
+snapshots that fall in it. Input must be ordered by time and is consumed in one
+pass, so memory stays O(1) however many snapshots the range holds, and the
+output never exceeds ``points`` entries. Min and max keep the spikes that a
+plain sample-every-n would drop.
+"""
+from __future__ import annotations
+
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+
+
+@dataclass(slots=True)
+class ScoreBucket:
+    bucket_start: datetime
+    min: float
+    max: float
+    last: float
+    last_at: datetime
+    tier: str
+    count: int
+
+
+def _as_utc(value: datetime) -> datetime:
+    # SQLite hands back naive datetimes for timezone-aware columns; they are UTC.
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value
+
+
+def downsample_scores(
+    rows: Iterable[tuple[datetime, float, str]], since: datetime, until: datetime, points: int
+) -> Iterator[ScoreBucket]:
+    """Fold time-ordered ``(computed_at, score, tier)`` rows into at most ``points`` buckets."""
+    since, until = _as_utc(since), _as_utc(until)
+    width = (until - since) / points
+    if width <= timedelta(0):
+        return
+    current: ScoreBucket | None = None
+    current_index = -1
+    for computed_at, score, tier in rows:
+        computed_at = _as_utc(computed_at)
+        index = min(int((computed_at - since) / width), points - 1)
+        if current is not None and index == current_index:
+            current.min = min(current.min, score)
+            current.max = max(current.max, score)
+            current.last, current.last_at, current.tier = score, computed_at, tier
+            current.count += 1
+            continue
+        if current is not None:
+            yield current
+        current_index = index
+        current = ScoreBucket(since + width * index, score, score, score, computed_at, tier, 1)
+    if current is not None:
+        yield current
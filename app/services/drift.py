@@ -0,0 +1,151 @@
+"""Streaming score drift detection.
+
+Every score snapshot updates its agent's row in ``agent_drift_state`` in O(1):
+an exponentially weighted mean and variance of the score, and a two-sided CUSUM
+over the snapshot's deviation from that mean in standard deviations. The CUSUM
+sums stay near zero while an agent's score moves randomly around its mean. They
+build up when the score moves steadily in one direction. ``drift`` is the larger
+sum. An alert fires when it first exceeds ``DRIFT_CUSUM_THRESHOLD``, and the agent
+can alert again once it has fallen back below the threshold.
+"""
+from __future__ import annotations
+
+import logging
+import math
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.db import dialect_insert
+from app.models import AgentDriftState
+from app.services.webhooks import webhook_dispatcher
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class DriftAlert:
+    agent_id: str
+    direction: str
+    drift: float
+    score: float
+    ewma: float
+    detected_at: datetime
+
+    def payload(self) -> dict[str, Any]:
+        return {
+            "type": "trust_score_drift",
+            "agent_id": self.agent_id,
+            "direction": self.direction,
+            "drift": self.drift,
+            "trust_score": self.score,
+            "ewma": self.ewma,
+            "detected_at": self.detected_at.isoformat(),
+        }
+
+
+def drift_direction(state: AgentDriftState) -> str:
+    return "up" if state.cusum_pos >= state.cusum_neg else "down"
+
+
+def update_drift_state(state: AgentDriftState, score: float, at: datetime) -> DriftAlert | None:
+    """Fold one snapshot into ``state``; returns an alert if this snapshot crossed the threshold."""
+    if state.samples == 0:
+        state.ewma, state.variance = score, 0.0
+    else:
+        deviation = score - state.ewma
+        if state.samples >= settings.drift_min_samples:
+            # Before that the variance estimate is too young to standardize against.
+            z = deviation / max(math.sqrt(state.variance), settings.drift_min_std)
+            state.cusum_pos = max(0.0, state.cusum_pos + z - settings.drift_cusum_slack)
+            state.cusum_neg = max(0.0, state.cusum_neg - z - settings.drift_cusum_slack)
+        alpha = settings.drift_ewma_alpha
+        state.ewma += alpha * deviation
+        state.variance = (1 - alpha) * (state.variance + alpha * deviation * deviation)
+    state.samples += 1
+    state.last_score = score
+    state.drift = max(state.cusum_pos, state.cusum_neg)
+
+    if state.drift <= settings.drift_cusum_threshold:
+        state.alerting = False
+        return None
+    if state.alerting:
+        return None
+    state.alerting = True
+    state.last_alert_at = at
+    return DriftAlert(state.agent_id, drift_direction(state), state.drift, score, state.ewma, at)
+
+
+def record_snapshots(db: Session, rows: Iterable[Mapping[str, Any]]) -> list[DriftAlert]:
+    """Fold snapshot rows (``agent_id``, ``score``, ``computed_at``) into drift state.
+
+    Runs in the caller's transaction, which also inserts the snapshots; emit the
+    returned alerts once it has committed.
+    """
+    by_agent: dict[str, list[Mapping[str, Any]]] = {}
+    for row in rows:
+        by_agent.setdefault(row["agent_id"], []).append(row)
+    if not by_agent:
+        return []
+
+    agent_ids = sorted(by_agent)
+    table = AgentDriftState.__table__
+    defaults = {
+        "samples": 0,
+        "last_score": 0.0,
+        "ewma": 0.0,
+        "variance": 0.0,
+        "cusum_pos": 0.0,
+        "cusum_neg": 0.0,
+        "drift": 0.0,
+        "alerting": False,
+    }
+    # Create missing rows first so every agent's row can be locked below.
+    stmt = dialect_insert(db)(table).values([{"agent_id": agent_id, **defaults} for agent_id in agent_ids])
+    db.execute(stmt.on_conflict_do_nothing(index_elements=[table.c.agent_id]))
+    states = db.scalars(
+        select(AgentDriftState)
+        .where(AgentDriftState.agent_id.in_(agent_ids))
+        .order_by(AgentDriftState.agent_id)
+        .with_for_update()
+        .execution_options(populate_existing=True)
+    )
+
+    alerts = []
+    for state in states:
+        for row in sorted(by_agent[state.agent_id], key=lambda item: item["computed_at"]):
+            alert = update_drift_state(state, row["score"], row["computed_at"])
+            if alert is not None:
+                alerts.append(alert)
+    db.flush()
+    return alerts
+
+
+def emit_drift_alerts(alerts: Iterable[DriftAlert]) -> None:
+    """Log committed alerts and hand them to the webhook dispatcher."""
+    for alert in alerts:
+        logger.warning(
+            "score drift %s for agent %s: drift=%.2f score=%.1f ewma=%.1f",
+            alert.direction,
+            alert.agent_id,
+            alert.drift,
+            alert.score,
+            alert.ewma,
+        )
+        webhook_dispatcher.notify(alert)
+
+
+def top_drifting_agents(db: Session, limit: int) -> list[AgentDriftState]:
+    """The ``limit`` agents with the largest drift, read from the ``drift`` index."""
+    stmt = select(AgentDriftState).order_by(AgentDriftState.drift.desc()).limit(limit)
+    return list(db.scalars(stmt))
+
+
+def drift_std(state: AgentDriftState) -> float:
+    return math.sqrt(state.variance)
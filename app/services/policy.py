@@ -0,0 +1,288 @@
+"""Declarative allow/review/block policies, compiled once into closures.
+
+A policy is a JSON document::
+
+    {
+      "name": "default",
+      "default": "allow",
+      "rules": [
+        {"name": "recent-leak", "decision": "block",
+         "when": {"window_count": {"window": "24h", "event_types": ["sensitive_data_leak_attempt"], "gte": 1}}},
+        {"name": "prod-writes", "decision": "review",
+         "when": {"all": [{"event_type": {"in": ["unsafe_tool_call"]}},
+                          {"metadata": {"path": "target.env", "eq": "prod"}}]}},
+        {"name": "low-trust", "decision": "block", "when": {"score": {"lt": 40}}}
+      ]
+    }
+
+Conditions test the agent's state (``score``, ``tier``, ``window_count``) or the
+action being decided (``event_type``, ``metadata`` by dotted path), and combine
+with ``all``/``any``/``not``. Comparisons are ``lt``, ``lte``, ``gt``, ``gte``,
+``eq``, ``ne``, ``in``, ``not_in`` and, for metadata, ``exists``.
+
+``compile_policy`` validates the document and turns every condition into a
+closure with its operators and constants already bound, so a decision is a walk
+over prebuilt callables. The compiled policy also lists the windows its rules
+read, so callers fetch only those counts. The first matching rule wins.
+"""
+from __future__ import annotations
+
+import json
+import operator
+import re
+import threading
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass, field
+from datetime import timedelta
+from pathlib import Path
+from typing import Any
+
+from app.config import settings
+
+
+DECISIONS = ("allow", "review", "block")
+
+DEFAULT_POLICY: dict[str, Any] = {
+    "name": "tiers",
+    "default": "allow",
+    "rules": [
+        {"name": "restricted-tier", "decision": "block", "when": {"score": {"lt": 40}}},
+        {"name": "watch-tier", "decision": "review", "when": {"score": {"lt": 60}}},
+    ],
+}
+
+_COMPARISONS: dict[str, Callable[[Any, Any], bool]] = {
+    "lt": operator.lt,
+    "lte": operator.le,
+    "gt": operator.gt,
+    "gte": operator.ge,
+    "eq": operator.eq,
+    "ne": operator.ne,
+}
+_WINDOW_PATTERN = re.compile(r"^(\d+)([hd])$")
+_MISSING = object()
+
+
+class PolicyError(ValueError):
+    """The policy document is malformed; raised at load time, never per decision."""
+
+
+@dataclass(slots=True)
+class PolicyContext:
+    score: float
+    tier: str
+    window_counts: Mapping[str, Mapping[str, int]] = field(default_factory=dict)
+    event_type: str | None = None
+    metadata: Mapping[str, Any] = field(default_factory=dict)
+
+
+Predicate = Callable[[PolicyContext], bool]
+
+
+@dataclass(frozen=True, slots=True)
+class CompiledRule:
+    name: str
+    decision: str
+    predicate: Predicate
+
+
+@dataclass(frozen=True)
+class CompiledPolicy:
+    name: str
+    default: str
+    rules: tuple[CompiledRule, ...]
+    windows: Mapping[str, timedelta]
+
+    def evaluate(self, context: PolicyContext) -> tuple[str, str | None]:
+        """Return ``(decision, rule name)``; the rule is ``None`` when the default applied."""
+        for rule in self.rules:
+            if rule.predicate(context):
+                return rule.decision, rule.name
+        return self.default, None
+
+
+def _compile_test(spec: Any, where: str, allow_exists: bool = False) -> Callable[[Any], bool]:
+    if not isinstance(spec, Mapping) or not spec:
+        raise PolicyError(f"{where}: expected an object of comparisons")
+    checks: list[Callable[[Any], bool]] = []
+    for name, operand in spec.items():
+        if name in ("in", "not_in"):
+            if not isinstance(operand, list):
+                raise PolicyError(f"{where}: '{name}' takes a list")
+            try:
+                values = frozenset(operand)
+            except TypeError:
+                raise PolicyError(f"{where}: '{name}' takes a list of scalar values") from None
+            check = _bind_membership(values)
+            checks.append(check if name == "in" else lambda value, check=check: not check(value))
+        elif name == "exists" and allow_exists:
+            expected = bool(operand)
+            checks.append(lambda value, expected=expected: (value is not _MISSING) is expected)
+        elif name in _COMPARISONS:
+            checks.append(_bind_comparison(_COMPARISONS[name], operand))
+        else:
+            raise PolicyError(f"{where}: unknown comparison '{name}'")
+    if len(checks) == 1:
+        return checks[0]
+    return lambda value: all(check(value) for check in checks)
+
+
+def _bind_comparison(compare: Callable[[Any, Any], bool], operand: Any) -> Callable[[Any], bool]:
+    def check(value: Any) -> bool:
+        if value is _MISSING or value is None:
+            return False
+        try:
+            return compare(value, operand)
+        except TypeError:
+            # e.g. a string metadata value against a numeric threshold
+            return False
+
+    return check
+
+
+def _bind_membership(values: frozenset[Any]) -> Callable[[Any], bool]:
+    def check(value: Any) -> bool:
+        try:
+            return value in values
+        except TypeError:
+            # an unhashable metadata value such as a list or dict never equals a listed scalar
+            return False
+
+    return check
+
+
+def _parse_window(value: Any, where: str) -> timedelta:
+    match = _WINDOW_PATTERN.match(value) if isinstance(value, str) else None
+    if match is None:
+        raise PolicyError(f"{where}: window must look like '24h' or '7d'")
+    amount, unit = int(match.group(1)), match.group(2)
+    return timedelta(hours=amount) if unit == "h" else timedelta(days=amount)
+
+
+def _metadata_getter(path: Any, where: str) -> Callable[[Mapping[str, Any]], Any]:
+    if not isinstance(path, str) or not path:
+        raise PolicyError(f"{where}: 'path' must be a dotted key such as 'tool.name'")
+    keys = tuple(path.split("."))
+
+    def get(metadata: Mapping[str, Any]) -> Any:
+        value: Any = metadata
+        for key in keys:
+            if not isinstance(value, Mapping):
+                return _MISSING
+            value = value.get(key, _MISSING)
+            if value is _MISSING:
+                return _MISSING
+        return value
+
+    return get
+
+
+def _compile_condition(spec: Any, where: str, windows: dict[str, timedelta]) -> Predicate:
+    if not isinstance(spec, Mapping) or len(spec) != 1:
+        raise PolicyError(f"{where}: a condition is an object with exactly one key")
+    ((kind, body),) = spec.items()
+
+    if kind in ("all", "any"):
+        if not isinstance(body, list) or not body:
+            raise PolicyError(f"{where}: '{kind}' takes a non-empty list of conditions")
+        predicates = tuple(
+            _compile_condition(item, f"{where}.{kind}[{index}]", windows) for index, item in enumerate(body)
+        )
+        if len(predicates) == 1:
+            return predicates[0]
+        if kind == "all":
+            return lambda context: all(predicate(context) for predicate in predicates)
+        return lambda context: any(predicate(context) for predicate in predicates)
+    if kind == "not":
+        inner = _compile_condition(body, f"{where}.not", windows)
+        return lambda context: not inner(context)
+    if kind == "score":
+        test = _compile_test(body, f"{where}.score")
+        return lambda context: test(context.score)
+    if kind == "tier":
+        test = _compile_test(body, f"{where}.tier")
+        return lambda context: test(context.tier)
+    if kind == "event_type":
+        test = _compile_test(body, f"{where}.event_type")
+        return lambda context: test(context.event_type)
+    if kind == "metadata":
+        if not isinstance(body, Mapping):
+            raise PolicyError(f"{where}.metadata: expected an object")
+        comparisons = dict(body)
+        get = _metadata_getter(comparisons.pop("path", None), f"{where}.metadata")
+        test = _compile_test(comparisons, f"{where}.metadata", allow_exists=True)
+        return lambda context: test(get(context.metadata))
+    if kind == "window_count":
+        if not isinstance(body, Mapping):
+            raise PolicyError(f"{where}.window_count: expected an object")
+        comparisons = dict(body)
+        window = comparisons.pop("window", None)
+        windows[window] = _parse_window(window, f"{where}.window_count")
+        event_types = comparisons.pop("event_types", None)
+        if event_types is not None and (
+            not isinstance(event_types, list) or not all(isinstance(item, str) for item in event_types)
+        ):
+            raise PolicyError(f"{where}.window_count: 'event_types' takes a list of strings")
+        test = _compile_test(comparisons, f"{where}.window_count")
+        if event_types is None:
+            return lambda context: test(sum(context.window_counts[window].values()))
+        types = tuple(dict.fromkeys(event_types))
+        return lambda context: test(sum(context.window_counts[window].get(item, 0) for item in types))
+    raise PolicyError(f"{where}: unknown condition '{kind}'")
+
+
+def compile_policy(document: Mapping[str, Any]) -> CompiledPolicy:
+    if not isinstance(document, Mapping):
+        raise PolicyError("policy must be a JSON object")
+    default = document.get("default", "allow")
+    if default not in DECISIONS:
+        raise PolicyError(f"default must be one of {', '.join(DECISIONS)}")
+    rules_spec = document.get("rules", [])
+    if not isinstance(rules_spec, list):
+        raise PolicyError("'rules' must be a list")
+
+    windows: dict[str, timedelta] = {}
+    rules = []
+    for index, rule in enumerate(rules_spec):
+        where = f"rules[{index}]"
+        if not isinstance(rule, Mapping):
+            raise PolicyError(f"{where}: expected an object")
+        name = rule.get("name") or where
+        if rule.get("decision") not in DECISIONS:
+            raise PolicyError(f"{where}: decision must be one of {', '.join(DECISIONS)}")
+        if "when" not in rule:
+            raise PolicyError(f"{where}: missing 'when'")
+        rules.append(CompiledRule(str(name), rule["decision"], _compile_condition(rule["when"], where, windows)))
+    return CompiledPolicy(str(document.get("name", "unnamed")), default, tuple(rules), windows)
+
+
+def load_policy(path: str | Path | None = None) -> CompiledPolicy:
+    """Compile the policy at ``path`` (default ``POLICY_RULES_PATH``), or the built-in tier policy."""
+    path = path if path is not None else settings.policy_rules_path
+    if not path:
+        return compile_policy(DEFAULT_POLICY)
+    try:
+        document = json.loads(Path(path).read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError) as exc:
+        raise PolicyError(f"cannot read policy {path}: {exc}") from exc
+    return compile_policy(document)
+
+
+_policy: CompiledPolicy | None = None
+_policy_lock = threading.Lock()
+
+
+def get_policy() -> CompiledPolicy:
+    global _policy
+    if _policy is None:
+        with _policy_lock:
+            if _policy is None:
+                _policy = load_policy()
+    return _policy
+
+
+def set_policy(policy: CompiledPolicy | None) -> None:
+    """Swap the active policy; ``None`` reloads from settings on next use."""
+    global _policy
+    with _policy_lock:
+        _policy = policy
@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import importlib
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Iterable
+from typing import Protocol
+
+from app.config import settings
+from app.services.scoring import ScoreResult
+
+
+class ScoreCacheBackend(Protocol):
+    """Storage for cached scores keyed by ``(agent_id, model_version)``.
+
+    ``set`` receives the ``time.time()`` at which the caller started computing the
+    score and must drop the value if the agent was invalidated after that, so a
+    slow computation racing an ingest cannot cache a stale score.
+    """
+
+    def get(self, agent_id: str, model_version: str) -> ScoreResult | None: ...
+
+    def set(self, agent_id: str, model_version: str, result: ScoreResult, started_at: float) -> None: ...
+
+    def invalidate(self, agent_ids: Iterable[str]) -> None: ...
+
+    def clear(self) -> None: ...
+
+
+class LocalScoreCacheBackend:
+    """Per-process LRU with a TTL. Other workers only see an agent's new events once the TTL expires."""
+
+    def __init__(self, max_entries: int, ttl_seconds: float) -> None:
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        # agent_id -> {model_version: (expires_at, result)}, least recently used first.
+        self._entries: OrderedDict[str, dict[str, tuple[float, ScoreResult]]] = OrderedDict()
+        self._invalidated_at: OrderedDict[str, float] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, agent_id: str, model_version: str) -> ScoreResult | None:
+        with self._lock:
+            versions = self._entries.get(agent_id)
+            if versions is None or model_version not in versions:
+                return None
+            expires_at, result = versions[model_version]
+            if expires_at <= time.time():
+                del versions[model_version]
+                return None
+            self._entries.move_to_end(agent_id)
+            return result
+
+    def set(self, agent_id: str, model_version: str, result: ScoreResult, started_at: float) -> None:
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            if self._invalidated_at.get(agent_id, 0.0) >= started_at:
+                return
+            self._entries.setdefault(agent_id, {})[model_version] = (time.time() + self.ttl_seconds, result)
+            self._entries.move_to_end(agent_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, agent_ids: Iterable[str]) -> None:
+        now = time.time()
+        with self._lock:
+            for agent_id in agent_ids:
+                self._entries.pop(agent_id, None)
+                self._invalidated_at[agent_id] = now
+                self._invalidated_at.move_to_end(agent_id)
+            # An invalidation only has to outlive computations that were already
+            # running when it happened; keep a TTL's worth of them.
+            horizon = now - self.ttl_seconds
+            while self._invalidated_at and next(iter(self._invalidated_at.values())) < horizon:
+                self._invalidated_at.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._invalidated_at.clear()
+
+
+class ScoreCache:
+    def __init__(self, backend: ScoreCacheBackend) -> None:
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, agent_id: str, model_version: str) -> ScoreResult | None:
+        result = self.backend.get(agent_id, model_version)
+        if result is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return result
+
+    def set(self, agent_id: str, model_version: str, result: ScoreResult, started_at: float) -> None:
+        self.backend.set(agent_id, model_version, result, started_at)
+
+    def invalidate(self, agent_ids: Iterable[str]) -> None:
+        self.backend.invalidate(agent_ids)
+
+    def clear(self) -> None:
+        self.backend.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self) -> dict[str, float]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+def _build_backend() -> ScoreCacheBackend:
+    """Build the backend named by ``SCORE_CACHE_BACKEND``.
+
+    ``local`` is the in-process LRU. Anything else is a ``module:Class`` path to a
+    shared backend implementing ``ScoreCacheBackend``, constructed with the same
+    ``max_entries`` and ``ttl_seconds`` arguments.
+    """
+    if settings.score_cache_backend == "local":
+        return LocalScoreCacheBackend(settings.score_cache_max_entries, settings.score_cache_ttl_seconds)
+
+    module_name, _, class_name = settings.score_cache_backend.partition(":")
+    backend_class = getattr(importlib.import_module(module_name), class_name)
+    return backend_class(settings.score_cache_max_entries, settings.score_cache_ttl_seconds)
+
+
+score_cache = ScoreCache(_build_backend())
@@ -1,6 +1,8 @@
 from __future__ import annotations
 
+from collections.abc import Mapping
 from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
 from typing import Protocol
 
 
@@ -8,6 +10,22 @@ class TrustEvent(Protocol):
     event_type: str
 
 
+class TimedTrustEvent(Protocol):
+    event_type: str
+    occurred_at: datetime
+
+
+# Sliding windows exposed as windowed factors, answered from the event rollup tables.
+EVENT_WINDOWS = {
+    "24h": timedelta(hours=24),
+    "7d": timedelta(days=7),
+    "30d": timedelta(days=30),
+}
+
+# Model versions starting with this prefix weight events by exponential recency decay.
+DECAY_MODEL_PREFIX = "v0.2-decay"
+
+
 POSITIVE_EVENTS = {
     "human_approved_action": 6.0,
     "task_completed_without_rework": 4.0,
@@ -45,8 +63,95 @@ class ScoreResult:
     factors: dict[str, float]
 
 
-def calculate_trust_score(events: list[TrustEvent]) -> ScoreResult:
-    baseline = 50.0
+def uses_decay_model(model_version: str) -> bool:
+    return model_version.startswith(DECAY_MODEL_PREFIX)
+
+
+def _as_utc(value: datetime) -> datetime:
+    # SQLite hands back naive datetimes for timezone-aware columns; they are UTC.
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value
+
+
+def _decay_factor(seconds: float, half_life_seconds: float) -> float:
+    return 2.0 ** (-seconds / half_life_seconds)
+
+
+@dataclass
+class DecayState:
+    """Half-life-decayed positive/negative sums, valued as of ``reference_at``.
+
+    Adding an event newer than the reference decays the sums forward to the
+    event's timestamp; an older (out-of-order) event is decayed to the reference
+    instead. Either way the update is O(1) and never re-reads earlier events.
+
+    Events dated after the moment they are added count as happening then, as the
+    reference ``calculate_decayed_trust_score`` does at ``now``; otherwise one
+    future timestamp would move the reference ahead and over-decay every other event.
+    """
+
+    positive: float = 0.0
+    negative: float = 0.0
+    reference_at: datetime | None = None
+
+    def __post_init__(self) -> None:
+        if self.reference_at is not None:
+            self.reference_at = _as_utc(self.reference_at)
+
+    def add(self, event_type: str, occurred_at: datetime, half_life_seconds: float, count: int = 1) -> None:
+        occurred_at = min(_as_utc(occurred_at), datetime.now(timezone.utc))
+        if event_type in POSITIVE_EVENTS:
+            self._add(POSITIVE_EVENTS[event_type] * count, 0.0, occurred_at, half_life_seconds)
+        elif event_type in NEGATIVE_EVENTS:
+            self._add(0.0, NEGATIVE_EVENTS[event_type] * count, occurred_at, half_life_seconds)
+
+    def merge(self, other: DecayState, half_life_seconds: float) -> None:
+        if other.reference_at is not None:
+            self._add(other.positive, other.negative, other.reference_at, half_life_seconds)
+
+    def _add(self, positive: float, negative: float, occurred_at: datetime, half_life_seconds: float) -> None:
+        occurred_at = _as_utc(occurred_at)
+        if self.reference_at is None:
+            self.reference_at = occurred_at
+        elif occurred_at > self.reference_at:
+            factor = _decay_factor((occurred_at - self.reference_at).total_seconds(), half_life_seconds)
+            self.positive *= factor
+            self.negative *= factor
+            self.reference_at = occurred_at
+        else:
+            factor = _decay_factor((self.reference_at - occurred_at).total_seconds(), half_life_seconds)
+            positive *= factor
+            negative *= factor
+        self.positive += positive
+        self.negative += negative
+
+    def value_at(self, now: datetime, half_life_seconds: float) -> tuple[float, float]:
+        """Return ``(positive, negative)`` decayed to ``now``; future-dated events are not amplified."""
+        if self.reference_at is None:
+            return 0.0, 0.0
+        elapsed = max(0.0, (_as_utc(now) - self.reference_at).total_seconds())
+        factor = _decay_factor(elapsed, half_life_seconds)
+        return self.positive * factor, self.negative * factor
+
+
+@dataclass
+class ScoreTotals:
+    positive_delta: float = 0.0
+    negative_delta: float = 0.0
+    unknown_events: float = 0.0
+    # Set when the decay model is active; scoring then uses it instead of the raw deltas.
+    decay: DecayState | None = None
+    half_life_seconds: float = 0.0
+
+    def add(self, event_type: str, count: int = 1) -> None:
+        if event_type in POSITIVE_EVENTS:
+            self.positive_delta += POSITIVE_EVENTS[event_type] * count
+        elif event_type in NEGATIVE_EVENTS:
+            self.negative_delta += NEGATIVE_EVENTS[event_type] * count
+        else:
+            self.unknown_events += float(count)
+
+
+def accumulate_score_totals(events: list[TrustEvent]) -> ScoreTotals:
     positive_delta = 0.0
     negative_delta = 0.0
     unknown_events = 0.0
@@ -59,6 +164,22 @@ def calculate_trust_score(events: list[TrustEvent]) -> ScoreResult:
         else:
             unknown_events += 1.0
 
+    return ScoreTotals(
+        positive_delta=positive_delta,
+        negative_delta=negative_delta,
+        unknown_events=unknown_events,
+    )
+
+
+def score_from_totals(totals: ScoreTotals, now: datetime | None = None) -> ScoreResult:
+    baseline = 50.0
+
+    positive_delta, negative_delta = totals.positive_delta, totals.negative_delta
+    if totals.decay is not None:
+        positive_delta, negative_delta = totals.decay.value_at(
+            now or datetime.now(timezone.utc), totals.half_life_seconds
+        )
+
     raw_score = baseline + positive_delta + negative_delta
     trust_score = _clamp_score(raw_score)
     tier = _tier_from_score(trust_score)
@@ -67,7 +188,66 @@ def calculate_trust_score(events: list[TrustEvent]) -> ScoreResult:
         "baseline": baseline,
         "positive_delta": round(positive_delta, 2),
         "negative_delta": round(negative_delta, 2),
-        "unknown_event_count": unknown_events,
+        "unknown_event_count": totals.unknown_events,
     }
+    if totals.decay is not None:
+        factors["half_life_days"] = totals.half_life_seconds / 86400
 
     return ScoreResult(score=trust_score, tier=tier, factors=factors)
+
+
+def calculate_trust_score(events: list[TrustEvent]) -> ScoreResult:
+    return score_from_totals(accumulate_score_totals(events))
+
+
+def score_totals_from_counts(event_counts: Mapping[str, int]) -> ScoreTotals:
+    totals = ScoreTotals()
+    for event_type, count in event_counts.items():
+        totals.add(event_type, count)
+    return totals
+
+
+def calculate_trust_score_from_counts(event_counts: Mapping[str, int]) -> ScoreResult:
+    """``calculate_trust_score`` from per-type counts, e.g. a ``GROUP BY event_type`` result."""
+    return score_from_totals(score_totals_from_counts(event_counts))
+
+
+def weighted_event_sum(event_counts: dict[str, int]) -> float:
+    """Sum of event weights for per-type counts; unknown types weigh nothing."""
+    totals = ScoreTotals()
+    for event_type, count in event_counts.items():
+        totals.add(event_type, count)
+    return round(totals.positive_delta + totals.negative_delta, 2)
+
+
+def accumulate_decay_state(events: list[TimedTrustEvent], half_life_seconds: float) -> DecayState:
+    state = DecayState()
+    for event in events:
+        state.add(event.event_type, event.occurred_at, half_life_seconds)
+    return state
+
+
+def calculate_decayed_trust_score(
+    events: list[TimedTrustEvent],
+    now: datetime,
+    half_life_seconds: float,
+) -> ScoreResult:
+    """Reference implementation of the decay model: weighs every event directly against ``now``."""
+    positive_delta = 0.0
+    negative_delta = 0.0
+    unknown_events = 0.0
+    now = _as_utc(now)
+
+    for event in events:
+        elapsed = max(0.0, (now - _as_utc(event.occurred_at)).total_seconds())
+        if event.event_type in POSITIVE_EVENTS:
+            positive_delta += POSITIVE_EVENTS[event.event_type] * _decay_factor(elapsed, half_life_seconds)
+        elif event.event_type in NEGATIVE_EVENTS:
+            negative_delta += NEGATIVE_EVENTS[event.event_type] * _decay_factor(elapsed, half_life_seconds)
+        else:
+            unknown_events += 1.0
+
+    # Decayed to "now" already, so the state is valued as of now.
+    decay = DecayState(positive=positive_delta, negative=negative_delta, reference_at=now)
+    totals = ScoreTotals(unknown_events=unknown_events, decay=decay, half_life_seconds=half_life_seconds)
+    return score_from_totals(totals, now)
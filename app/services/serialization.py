@@ -0,0 +1,70 @@
+"""Direct JSON encoding of event pages from database rows.
+
+Rows read back from ``events`` were validated at ingest, so the list endpoints
+skip building ``EventIn`` models and FastAPI's ``response_model`` pass and encode
+column tuples with orjson instead. The bytes match what the model path produces
+through ``JSONResponse``: compact separators, unescaped UTF-8, and pydantic's
+datetime format (``Z`` for UTC, naive datetimes as-is).
+
+orjson and ``json.dumps`` format floats in exponent notation differently
+(``1e-7`` vs ``1e-07``) and orjson rejects integers beyond 64 bits, so metadata
+that may contain either falls back to ``json.dumps``.
+"""
+from __future__ import annotations
+
+import json
+import re
+from collections.abc import Iterable, Sequence
+from typing import Any
+
+import orjson
+
+
+# A digit followed by an exponent marker; may also match inside strings, which only costs the slower path.
+_EXPONENT = re.compile(rb"[0-9][eE]")
+
+
+def encode_metadata(metadata: dict[str, Any] | None) -> bytes:
+    if not metadata:
+        return b"{}"
+    try:
+        encoded = orjson.dumps(metadata)
+    except orjson.JSONEncodeError:
+        encoded = None
+    if encoded is None or _EXPONENT.search(encoded):
+        encoded = json.dumps(metadata, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+    return encoded
+
+
+def encode_event_row(row: Sequence[Any]) -> bytes:
+    """One ``EventRow`` (or tuple in its column order) as an ``EventIn`` JSON object."""
+    _, event_id, agent_id, event_type, source, occurred_at, metadata = row
+    head = orjson.dumps(
+        {
+            "event_id": event_id,
+            "agent_id": agent_id,
+            "event_type": event_type,
+            "source": source,
+            "occurred_at": occurred_at,
+        },
+        option=orjson.OPT_UTC_Z,
+    )
+    return head[:-1] + b',"metadata":' + encode_metadata(metadata) + b"}"
+
+
+def encode_events_page(agent_id: str, rows: Iterable[Sequence[Any]], next_cursor: str | None) -> bytes:
+    """An ``AgentEventsResponse`` body."""
+    events = [encode_event_row(row) for row in rows]
+    return b"".join(
+        (
+            b'{"agent_id":',
+            orjson.dumps(agent_id),
+            b',"event_count":',
+            str(len(events)).encode(),
+            b',"events":[',
+            b",".join(events),
+            b'],"next_cursor":',
+            orjson.dumps(next_cursor),
+            b"}",
+        )
+    )
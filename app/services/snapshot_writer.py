@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+import logging
+import queue
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from datetime import datetime, timezone
+from typing import Any
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.db import get_session_factory
+from app.metrics import timed
+from app.models import ScoreSnapshot
+from app.services.drift import emit_drift_alerts, record_snapshots
+from app.services.scoring import ScoreResult
+
+
+logger = logging.getLogger(__name__)
+
+# Agents whose last recorded snapshot is remembered for change detection.
+_MAX_TRACKED_AGENTS = 100_000
+
+
+class SnapshotWriter:
+    """Write-behind queue for ``score_history``.
+
+    ``submit`` is called on every score read and never touches the database: it
+    enqueues a row only when the agent's score, tier or factors differ from the
+    last one recorded by this process, or when ``snapshot_min_interval_seconds``
+    has passed since then. A background thread drains the queue and inserts rows
+    in batches of up to ``snapshot_batch_size``, at least every
+    ``snapshot_flush_interval_seconds``, and feeds each batch to the drift
+    detector in the same transaction.
+    """
+
+    def __init__(self, session_factory: Callable[[], Session] | None = None) -> None:
+        self.session_factory = session_factory
+        self.dropped = 0
+        self.written = 0
+        # ``None`` is the stop sentinel put by ``stop``.
+        self._queue: queue.Queue[dict[str, Any] | None] = queue.Queue(maxsize=settings.snapshot_queue_size)
+        self._last: OrderedDict[str, tuple[float, str, dict[str, float], float]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+        self._stopping = threading.Event()
+
+    def submit(self, agent_id: str, result: ScoreResult) -> bool:
+        """Queue a snapshot if it records a change; returns whether one was queued."""
+        now = time.monotonic()
+        with self._lock:
+            last = self._last.get(agent_id)
+            if last is not None:
+                score, tier, factors, recorded_at = last
+                unchanged = (score, tier, factors) == (result.score, result.tier, result.factors)
+                interval = settings.snapshot_min_interval_seconds
+                if unchanged and (interval <= 0 or now - recorded_at < interval):
+                    return False
+            self._last[agent_id] = (result.score, result.tier, dict(result.factors), now)
+            self._last.move_to_end(agent_id)
+            while len(self._last) > _MAX_TRACKED_AGENTS:
+                self._last.popitem(last=False)
+
+        row = {
+            "agent_id": agent_id,
+            "score": result.score,
+            "tier": result.tier,
+            "factors": dict(result.factors),
+            "computed_at": datetime.now(timezone.utc),
+        }
+        try:
+            self._queue.put_nowait(row)
+        except queue.Full:
+            self.dropped += 1
+            with self._lock:
+                # Forget the state so the next read retries the snapshot.
+                self._last.pop(agent_id, None)
+            return False
+        return True
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, name="snapshot-writer", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the background thread after writing everything already queued."""
+        if self._thread is None:
+            return
+        self._stopping.set()
+        self._queue.put(None)
+        self._thread.join()
+        self._thread = None
+        self._write(self._drain(len(self._queue.queue)))
+
+    def flush(self) -> None:
+        """Block until every queued snapshot has been written."""
+        if self._thread is None:
+            self._write(self._drain(len(self._queue.queue)))
+        else:
+            self._queue.join()
+
+    def reset(self) -> None:
+        with self._lock:
+            self._last.clear()
+        for _ in self._drain(len(self._queue.queue)):
+            self._queue.task_done()
+        self.dropped = 0
+        self.written = 0
+
+    def _run(self) -> None:
+        while not self._stopping.is_set():
+            batch: list[dict[str, Any]] = []
+            deadline = time.monotonic() + settings.snapshot_flush_interval_seconds
+            while len(batch) < settings.snapshot_batch_size:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    row = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    break
+                if row is None:
+                    self._queue.task_done()
+                    break
+                batch.append(row)
+                batch.extend(self._drain(settings.snapshot_batch_size - len(batch)))
+            self._write(batch)
+
+    def _drain(self, limit: int) -> list[dict[str, Any]]:
+        rows: list[dict[str, Any]] = []
+        while len(rows) < limit:
+            try:
+                row = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if row is None:
+                self._queue.task_done()
+                self._stopping.set()
+                break
+            rows.append(row)
+        return rows
+
+    @timed("snapshot_writer.write")
+    def _write(self, rows: list[dict[str, Any]]) -> None:
+        if not rows:
+            return
+        try:
+            session_factory = self.session_factory or get_session_factory()
+            with session_factory() as db:
+                db.execute(insert(ScoreSnapshot), rows)
+                alerts = record_snapshots(db, rows)
+                db.commit()
+            self.written += len(rows)
+            emit_drift_alerts(alerts)
+        except Exception:
+            logger.exception("failed to write %d score snapshots", len(rows))
+            self.dropped += len(rows)
+        finally:
+            for _ in rows:
+                self._queue.task_done()
+
+
+snapshot_writer = SnapshotWriter()
@@ -0,0 +1,265 @@
+"""Tier-change and drift webhooks delivered from a background asyncio loop.
+
+``notify`` is called from request and worker threads and only appends to
+in-memory queues, so scoring never waits on a subscriber. Each endpoint in
+``WEBHOOK_URLS`` has its own bounded queue, its own pooled ``httpx.AsyncClient``
+and its own sender task, so one slow subscriber cannot stall the others. When an
+endpoint's queue is full, ``WEBHOOK_OVERFLOW`` decides what is lost:
+``drop_oldest`` (default) evicts the oldest pending notification, ``drop_newest``
+rejects the new one. Either way ``dropped`` is counted per endpoint.
+
+Senders take up to ``WEBHOOK_BATCH_SIZE`` notifications per POST, waiting up to
+``WEBHOOK_FLUSH_INTERVAL_SECONDS`` for a batch to fill, and retry connection
+errors, 429 and 5xx responses with exponential backoff and jitter.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+import threading
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Protocol
+
+import httpx
+
+from app.config import settings
+from app.services.scoring import ScoreResult
+
+
+logger = logging.getLogger(__name__)
+
+OVERFLOW_POLICIES = ("drop_oldest", "drop_newest")
+
+# Agents whose last observed tier is remembered for crossing detection.
+_MAX_TRACKED_AGENTS = 100_000
+
+
+class Notification(Protocol):
+    agent_id: str
+
+    def payload(self) -> dict[str, Any]: ...
+
+
+@dataclass(frozen=True)
+class TierChange:
+    agent_id: str
+    previous_tier: str
+    tier: str
+    score: float
+    model_version: str
+    changed_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+
+    def payload(self) -> dict[str, Any]:
+        return {
+            "type": "trust_tier_changed",
+            "agent_id": self.agent_id,
+            "previous_tier": self.previous_tier,
+            "tier": self.tier,
+            "trust_score": self.score,
+            "model_version": self.model_version,
+            "changed_at": self.changed_at.isoformat(),
+        }
+
+
+class _Endpoint:
+    """Pending notifications and delivery counters for one subscriber URL."""
+
+    def __init__(self, url: str, queue_size: int) -> None:
+        self.url = url
+        # (monotonic enqueue time, notification)
+        self.pending: deque[tuple[float, Notification]] = deque()
+        self.queue_size = queue_size
+        self.wakeup: asyncio.Event | None = None
+        self.delivered = 0
+        self.failed = 0
+        self.dropped = 0
+        self.retries = 0
+        self.lag_last = 0.0
+        self.lag_max = 0.0
+        self.lag_total = 0.0
+
+    def stats(self) -> dict[str, float]:
+        return {
+            "queued": len(self.pending),
+            "delivered": self.delivered,
+            "failed": self.failed,
+            "dropped": self.dropped,
+            "retries": self.retries,
+            "lag_seconds_last": round(self.lag_last, 6),
+            "lag_seconds_max": round(self.lag_max, 6),
+            "lag_seconds_avg": round(self.lag_total / self.delivered, 6) if self.delivered else 0.0,
+        }
+
+
+class _RetryableError(Exception):
+    pass
+
+
+class WebhookDispatcher:
+    def __init__(self, urls: list[str] | None = None, overflow: str | None = None) -> None:
+        self.urls = list(settings.webhook_urls if urls is None else urls)
+        self.overflow = overflow or settings.webhook_overflow
+        if self.overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"WEBHOOK_OVERFLOW must be one of {', '.join(OVERFLOW_POLICIES)}")
+        self._endpoints = [_Endpoint(url, settings.webhook_queue_size) for url in self.urls]
+        self._lock = threading.Lock()
+        self._tiers: OrderedDict[str, str] = OrderedDict()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread: threading.Thread | None = None
+        self._stopping: asyncio.Event | None = None
+        self._started = threading.Event()
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self._endpoints)
+
+    def observe(self, agent_id: str, result: ScoreResult) -> bool:
+        """Notify if ``result`` puts the agent in a different tier than last seen by this process."""
+        if not self._endpoints:
+            return False
+        with self._lock:
+            previous = self._tiers.get(agent_id)
+            self._tiers[agent_id] = result.tier
+            self._tiers.move_to_end(agent_id)
+            while len(self._tiers) > _MAX_TRACKED_AGENTS:
+                self._tiers.popitem(last=False)
+        if previous is None or previous == result.tier:
+            return False
+        return self.notify(TierChange(agent_id, previous, result.tier, result.score, settings.model_version))
+
+    def notify(self, change: Notification) -> bool:
+        """Queue ``change`` for every endpoint; returns whether every endpoint accepted it."""
+        accepted = True
+        enqueued_at = time.monotonic()
+        with self._lock:
+            for endpoint in self._endpoints:
+                if len(endpoint.pending) >= endpoint.queue_size:
+                    endpoint.dropped += 1
+                    if self.overflow == "drop_newest":
+                        accepted = False
+                        continue
+                    endpoint.pending.popleft()
+                endpoint.pending.append((enqueued_at, change))
+        loop = self._loop
+        if loop is not None:
+            try:
+                for endpoint in self._endpoints:
+                    if endpoint.wakeup is not None:
+                        loop.call_soon_threadsafe(endpoint.wakeup.set)
+            except RuntimeError:
+                # The loop closed under us; whatever is queued is sent on the next start.
+                pass
+        return accepted
+
+    def stats(self) -> dict[str, dict[str, float]]:
+        with self._lock:
+            return {endpoint.url: endpoint.stats() for endpoint in self._endpoints}
+
+    def start(self) -> None:
+        if self._thread is not None or not self._endpoints:
+            return
+        self._started.clear()
+        self._thread = threading.Thread(target=lambda: asyncio.run(self._run()), name="webhooks", daemon=True)
+        self._thread.start()
+        self._started.wait()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Deliver what is already queued (within ``timeout``) and stop the loop."""
+        if self._thread is None:
+            return
+        loop, stopping = self._loop, self._stopping
+        if loop is not None and stopping is not None:
+            loop.call_soon_threadsafe(stopping.set)
+        self._thread.join(timeout)
+        self._thread = None
+
+    def reset(self) -> None:
+        with self._lock:
+            self._tiers.clear()
+            for endpoint in self._endpoints:
+                endpoint.pending.clear()
+
+    async def _run(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        self._stopping = asyncio.Event()
+        for endpoint in self._endpoints:
+            endpoint.wakeup = asyncio.Event()
+            if endpoint.pending:
+                endpoint.wakeup.set()
+        self._started.set()
+        try:
+            await asyncio.gather(*(self._send_loop(endpoint) for endpoint in self._endpoints))
+        finally:
+            self._loop = None
+            for endpoint in self._endpoints:
+                endpoint.wakeup = None
+
+    async def _send_loop(self, endpoint: _Endpoint) -> None:
+        limits = httpx.Limits(
+            max_connections=settings.webhook_max_connections,
+            max_keepalive_connections=settings.webhook_max_connections,
+        )
+        async with httpx.AsyncClient(timeout=settings.webhook_timeout_seconds, limits=limits) as client:
+            while True:
+                if not endpoint.pending:
+                    if self._stopping.is_set():
+                        return
+                    stop_wait = asyncio.ensure_future(self._stopping.wait())
+                    wake_wait = asyncio.ensure_future(endpoint.wakeup.wait())
+                    await asyncio.wait((stop_wait, wake_wait), return_when=asyncio.FIRST_COMPLETED)
+                    stop_wait.cancel()
+                    wake_wait.cancel()
+                    endpoint.wakeup.clear()
+                    continue
+                if len(endpoint.pending) < settings.webhook_batch_size and not self._stopping.is_set():
+                    # Let a batch build up before posting.
+                    await asyncio.sleep(settings.webhook_flush_interval_seconds)
+                with self._lock:
+                    batch = [
+                        endpoint.pending.popleft()
+                        for _ in range(min(settings.webhook_batch_size, len(endpoint.pending)))
+                    ]
+                await self._deliver(client, endpoint, batch)
+
+    async def _deliver(
+        self, client: httpx.AsyncClient, endpoint: _Endpoint, batch: list[tuple[float, Notification]]
+    ) -> None:
+        body = {"events": [change.payload() for _, change in batch]}
+        for attempt in range(settings.webhook_max_retries + 1):
+            try:
+                response = await client.post(endpoint.url, json=body)
+                if response.status_code == 429 or response.status_code >= 500:
+                    raise _RetryableError(f"HTTP {response.status_code}")
+                if response.status_code >= 400:
+                    logger.warning(
+                        "webhook %s rejected %d events: HTTP %d", endpoint.url, len(batch), response.status_code
+                    )
+                    break
+            except (httpx.TransportError, _RetryableError) as exc:
+                if attempt == settings.webhook_max_retries:
+                    logger.warning("webhook %s failed after %d attempts: %s", endpoint.url, attempt + 1, exc)
+                    break
+                endpoint.retries += 1
+                delay = min(settings.webhook_backoff_max_seconds, settings.webhook_backoff_base_seconds * 2**attempt)
+                await asyncio.sleep(delay * random.uniform(0.5, 1.0))
+                continue
+
+            delivered_at = time.monotonic()
+            with self._lock:
+                for enqueued_at, _ in batch:
+                    lag = delivered_at - enqueued_at
+                    endpoint.lag_total += lag
+                    endpoint.lag_max = max(endpoint.lag_max, lag)
+                endpoint.lag_last = delivered_at - batch[-1][0]
+                endpoint.delivered += len(batch)
+            return
+
+        with self._lock:
+            endpoint.failed += len(batch)
+
+
+webhook_dispatcher = WebhookDispatcher()
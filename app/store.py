@@ -1,13 +1,57 @@
 from __future__ import annotations
 
-from sqlalchemy import Select, select
+import time
+from collections import Counter
+from collections.abc import Iterable, Iterator
+from datetime import datetime, timedelta, timezone
+from typing import Any, NamedTuple
+
+from sqlalchemy import Select, and_, case, delete, func, or_, select, tuple_, update
 from sqlalchemy.orm import Session
 
-from app.models import EventRecord, ScoreSnapshot
+from app.config import settings
+from app.db import dialect_insert
+from app.metrics import count_ingested, observe_rows_scanned, stage, timed
+from app.models import (
+    AgentScore,
+    AgentScoreAggregate,
+    EventIdRecord,
+    EventRecord,
+    EventRollupDaily,
+    EventRollupHourly,
+    RetentionState,
+    ScoreJob,
+    ScoreSnapshot,
+)
 from app.schemas import EventIn
-from app.services.scoring import ScoreResult
+from app.services.batch_scoring import ScoreTotalsAccumulator, encode_event_types
+from app.services.dedup import event_dedup
+from app.services.drift import emit_drift_alerts, record_snapshots
+from app.services.score_cache import score_cache
+from app.services.scoring import (
+    EVENT_WINDOWS,
+    DecayState,
+    ScoreResult,
+    ScoreTotals,
+    accumulate_decay_state,
+    score_from_totals,
+    score_totals_from_counts,
+    uses_decay_model,
+)
+from app.services.snapshot_writer import snapshot_writer
+from app.services.webhooks import TierChange, webhook_dispatcher
+
+
+# Rows per multi-row INSERT or upsert; keeps bound parameters well under SQLite/Postgres limits.
+INSERT_CHUNK_SIZE = 500
+
+
+def _chunked(rows: list[Any]) -> Iterator[list[Any]]:
+    for start in range(0, len(rows), INSERT_CHUNK_SIZE):
+        yield rows[start : start + INSERT_CHUNK_SIZE]
 
 
+@timed("store.insert_event")
 def insert_event(db: Session, event: EventIn) -> EventRecord:
     record = EventRecord(
         event_id=event.event_id,
@@ -17,32 +61,995 @@ def insert_event(db: Session, event: EventIn) -> EventRecord:
         occurred_at=event.occurred_at,
         metadata_json=event.metadata,
     )
+    # A duplicate event_id fails here with IntegrityError, whatever its occurred_at.
+    db.add(EventIdRecord(event_id=event.event_id, occurred_at=event.occurred_at))
     db.add(record)
+    db.flush()
+    _apply_event_to_aggregate(db, record)
+    _enqueue_score_jobs(db, [record.agent_id])
     db.commit()
+    score_cache.invalidate([record.agent_id])
+    event_dedup.remember([(event.event_id, event.occurred_at)])
+    count_ingested({record.event_type: 1})
     db.refresh(record)
     return record
 
 
-def list_agent_events(db: Session, agent_id: str) -> list[EventRecord]:
-    stmt: Select[tuple[EventRecord]] = (
-        select(EventRecord)
+def _apply_event_to_aggregate(db: Session, record: EventRecord) -> None:
+    totals = ScoreTotals()
+    totals.add(record.event_type)
+    timed_events = {record.agent_id: [(record.event_type, record.occurred_at)]}
+    _apply_totals_to_aggregates(db, [(record.agent_id, totals, 1, record.id)])
+    _advance_decay_states(db, timed_events)
+    _apply_events_to_rollups(db, timed_events)
+
+
+def _half_life_seconds() -> float:
+    return settings.decay_half_life_days * 86400
+
+
+def _advance_decay_states(db: Session, timed_events: dict[str, list[tuple[str, datetime]]]) -> None:
+    """Fold new events into each agent's decay state when the decay model is active.
+
+    Runs after the aggregate upsert, which already holds the row locks, so the
+    read-modify-write cannot interleave with another ingest for the same agent.
+    """
+    if not timed_events or not uses_decay_model(settings.model_version):
+        return
+
+    half_life_seconds = _half_life_seconds()
+    for agent_ids in _chunked(sorted(timed_events)):
+        stmt = (
+            select(AgentScoreAggregate)
+            .where(AgentScoreAggregate.agent_id.in_(agent_ids))
+            .execution_options(populate_existing=True)
+        )
+        for aggregate in db.scalars(stmt):
+            state = DecayState(aggregate.decayed_positive, aggregate.decayed_negative, aggregate.decay_reference_at)
+            for event_type, occurred_at in timed_events[aggregate.agent_id]:
+                state.add(event_type, occurred_at, half_life_seconds)
+            aggregate.decayed_positive = state.positive
+            aggregate.decayed_negative = state.negative
+            aggregate.decay_reference_at = state.reference_at
+        db.flush()
+
+
+def _apply_totals_to_aggregates(db: Session, rows: list[tuple[str, ScoreTotals, int, int]]) -> None:
+    """Fold ``(agent_id, totals, event_count, last_event_id)`` increments into the aggregates table.
+
+    ``rows`` must hold at most one entry per agent; they are written with multi-row
+    upserts of ``INSERT_CHUNK_SIZE`` agents each.
+    """
+    table = AgentScoreAggregate.__table__
+    for chunk in _chunked(rows):
+        stmt = dialect_insert(db)(table).values(
+            [
+                {
+                    "agent_id": agent_id,
+                    "positive_delta": totals.positive_delta,
+                    "negative_delta": totals.negative_delta,
+                    "unknown_event_count": int(totals.unknown_events),
+                    "event_count": event_count,
+                    "last_event_id": last_event_id,
+                    "model_version": settings.model_version,
+                }
+                for agent_id, totals, event_count, last_event_id in chunk
+            ]
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c.agent_id],
+            set_={
+                "positive_delta": table.c.positive_delta + stmt.excluded.positive_delta,
+                "negative_delta": table.c.negative_delta + stmt.excluded.negative_delta,
+                "unknown_event_count": table.c.unknown_event_count + stmt.excluded.unknown_event_count,
+                "event_count": table.c.event_count + stmt.excluded.event_count,
+                "last_event_id": case(
+                    (stmt.excluded.last_event_id > table.c.last_event_id, stmt.excluded.last_event_id),
+                    else_=table.c.last_event_id,
+                ),
+            },
+        )
+        db.execute(stmt)
+
+
+def _hour_bucket(value: datetime) -> datetime:
+    value = value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value.astimezone(timezone.utc)
+    return value.replace(minute=0, second=0, microsecond=0)
+
+
+def _day_bucket(value: datetime) -> datetime:
+    return _hour_bucket(value).replace(hour=0)
+
+
+def _apply_events_to_rollups(db: Session, timed_events: dict[str, list[tuple[str, datetime]]]) -> None:
+    """Increment the hourly and daily rollup buckets for newly stored events."""
+    for model, bucket_of in ((EventRollupHourly, _hour_bucket), (EventRollupDaily, _day_bucket)):
+        counts: dict[tuple[str, str, datetime], int] = {}
+        for agent_id, events in timed_events.items():
+            for event_type, occurred_at in events:
+                key = (agent_id, event_type, bucket_of(occurred_at))
+                counts[key] = counts.get(key, 0) + 1
+        table = model.__table__
+        # Sorted so concurrent ingests lock bucket rows in the same order.
+        for chunk in _chunked(sorted(counts.items())):
+            stmt = dialect_insert(db)(table).values(
+                [
+                    {"agent_id": agent_id, "event_type": event_type, "bucket_start": bucket_start, "event_count": count}
+                    for (agent_id, event_type, bucket_start), count in chunk
+                ]
+            )
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[table.c.agent_id, table.c.event_type, table.c.bucket_start],
+                set_={"event_count": table.c.event_count + stmt.excluded.event_count},
+            )
+            db.execute(stmt)
+
+
+@timed("store.count_events_in_window")
+def count_events_in_window(db: Session, agent_id: str, since: datetime, until: datetime) -> dict[str, int]:
+    """Count an agent's events per type with ``since <= occurred_at <= until``, from rollups.
+
+    Whole UTC days inside the window come from the daily table and the partial
+    days at either edge from the hourly table, so at most ~48 hourly buckets plus
+    one bucket per day are summed per event type regardless of event volume. The
+    window is resolved to whole hours: the hour containing ``since`` counts in full.
+    """
+    since_hour = _hour_bucket(since)
+    until_hour = _hour_bucket(until)
+    first_full_day = _day_bucket(since_hour)
+    if first_full_day < since_hour:
+        first_full_day += timedelta(days=1)
+    last_day = _day_bucket(until_hour)
+
+    hourly = EventRollupHourly
+    if first_full_day >= last_day:
+        hourly_range = hourly.bucket_start.between(since_hour, until_hour)
+        daily_range = None
+    else:
+        hourly_range = or_(
+            and_(hourly.bucket_start >= since_hour, hourly.bucket_start < first_full_day),
+            hourly.bucket_start.between(last_day, until_hour),
+        )
+        daily_range = and_(EventRollupDaily.bucket_start >= first_full_day, EventRollupDaily.bucket_start < last_day)
+
+    counts: dict[str, int] = {}
+    queries = [
+        select(hourly.event_type, func.sum(hourly.event_count))
+        .where(hourly.agent_id == agent_id, hourly_range)
+        .group_by(hourly.event_type)
+    ]
+    if daily_range is not None:
+        queries.append(
+            select(EventRollupDaily.event_type, func.sum(EventRollupDaily.event_count))
+            .where(EventRollupDaily.agent_id == agent_id, daily_range)
+            .group_by(EventRollupDaily.event_type)
+        )
+    for stmt in queries:
+        for event_type, count in db.execute(stmt):
+            counts[event_type] = counts.get(event_type, 0) + int(count)
+    return counts
+
+
+@timed("store.get_agent_window_counts")
+def get_agent_window_counts(db: Session, agent_id: str, now: datetime | None = None) -> dict[str, dict[str, int]]:
+    """Per-type event counts for each window in ``EVENT_WINDOWS``, ending at ``now``."""
+    now = now or datetime.now(timezone.utc)
+    return {name: count_events_in_window(db, agent_id, now - span, now) for name, span in EVENT_WINDOWS.items()}
+
+
+def _enqueue_score_jobs(db: Session, agent_ids: Iterable[str]) -> None:
+    """Queue a recompute for each agent when the scoring worker is enabled.
+
+    An agent has at most one job row. Re-enqueueing bumps its ``version`` so a
+    worker that is already scoring the agent leaves the job in place for another pass.
+    """
+    if not settings.score_worker_enabled:
+        return
+    rows = [{"agent_id": agent_id, "version": 1, "attempts": 0} for agent_id in agent_ids]
+    table = ScoreJob.__table__
+    for chunk in _chunked(rows):
+        stmt = dialect_insert(db)(table).values(chunk)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c.agent_id],
+            set_={"version": table.c.version + 1},
+        )
+        db.execute(stmt)
+
+
+@timed("store.insert_events")
+def insert_events(db: Session, events: list[EventIn]) -> list[bool]:
+    """Insert a batch of events in one transaction, skipping ``event_id``s that already exist.
+
+    Each chunk first claims its ids in ``event_ids`` with a multi-row ``INSERT ...
+    ON CONFLICT DO NOTHING RETURNING``, then inserts the events that won their
+    claim. The aggregate, rollup and job upserts are chunked the same way, so no
+    statement binds more than a few thousand parameters. Returns one flag per
+    input event: ``True`` if it was stored, ``False`` if it was a duplicate of an
+    existing event or of an earlier event in the batch.
+    """
+    table = EventRecord.__table__
+    ids_table = EventIdRecord.__table__
+    insert = dialect_insert(db)
+
+    first_index: dict[str, int] = {}
+    for index, event in enumerate(events):
+        first_index.setdefault(event.event_id, index)
+    unique_events = [events[index] for index in first_index.values()]
+
+    inserted: dict[str, tuple[int, str, str]] = {}
+    for chunk in _chunked(unique_events):
+        claimed = set(
+            db.scalars(
+                insert(ids_table)
+                .values([{"event_id": event.event_id, "occurred_at": event.occurred_at} for event in chunk])
+                .on_conflict_do_nothing()
+                .returning(ids_table.c.event_id)
+            )
+        )
+        chunk = [event for event in chunk if event.event_id in claimed]
+        if not chunk:
+            continue
+        stmt = (
+            insert(table)
+            .values(
+                [
+                    {
+                        "event_id": event.event_id,
+                        "agent_id": event.agent_id,
+                        "event_type": event.event_type,
+                        "source": event.source,
+                        "occurred_at": event.occurred_at,
+                        "metadata": event.metadata,
+                    }
+                    for event in chunk
+                ]
+            )
+            .returning(table.c.id, table.c.event_id, table.c.agent_id, table.c.event_type)
+        )
+        for row_id, event_id, agent_id, event_type in db.execute(stmt):
+            inserted[event_id] = (row_id, agent_id, event_type)
+
+    per_agent: dict[str, tuple[ScoreTotals, int, int]] = {}
+    timed_events: dict[str, list[tuple[str, datetime]]] = {}
+    for event_id, (row_id, agent_id, event_type) in inserted.items():
+        totals, event_count, last_event_id = per_agent.get(agent_id, (ScoreTotals(), 0, 0))
+        totals.add(event_type)
+        per_agent[agent_id] = (totals, event_count + 1, max(last_event_id, row_id))
+        timed_events.setdefault(agent_id, []).append((event_type, events[first_index[event_id]].occurred_at))
+    # Sorted so concurrent batches lock aggregate rows in the same order.
+    _apply_totals_to_aggregates(
+        db,
+        [(agent_id, *per_agent[agent_id]) for agent_id in sorted(per_agent)],
+    )
+    _advance_decay_states(db, timed_events)
+    _apply_events_to_rollups(db, timed_events)
+    _enqueue_score_jobs(db, sorted(per_agent))
+    db.commit()
+    score_cache.invalidate(per_agent)
+    event_dedup.remember((event_id, events[first_index[event_id]].occurred_at) for event_id in inserted)
+    count_ingested(Counter(event_type for _, _, event_type in inserted.values()))
+
+    return [index == first_index[event.event_id] and event.event_id in inserted for index, event in enumerate(events)]
+
+
+@timed("store.get_agent_score_aggregate")
+def get_agent_score_aggregate(db: Session, agent_id: str) -> AgentScoreAggregate | None:
+    return db.get(AgentScoreAggregate, agent_id, populate_existing=True)
+
+
+@timed("store.rebuild_agent_score_aggregate")
+def rebuild_agent_score_aggregate(db: Session, agent_id: str) -> ScoreTotals:
+    """Recompute an agent's aggregate from its full event history and persist it.
+
+    Events before the retention watermark may have been compacted away, so that
+    part of the history is read from the daily rollups and only newer events from
+    ``events``; compaction therefore does not change the result. Under the decay
+    model compacted events are dated at the middle of their day bucket.
+
+    An agent with history is counted again under ``_lock_aggregates``, so an
+    ingest that was still open during the first count is either already
+    committed and counted, or blocked until this rebuild commits and then adds
+    its increment on top.
+    """
+    totals, event_count, last_event_id = _count_agent_history(db, agent_id)
+    if event_count == 0:
+        observe_rows_scanned("rebuild", 0)
+        return totals
+
+    _lock_aggregates(db, [agent_id])
+    totals, event_count, last_event_id = _count_agent_history(db, agent_id)
+    observe_rows_scanned("rebuild", event_count)
+    if last_event_id is None:
+        existing = get_agent_score_aggregate(db, agent_id)
+        last_event_id = existing.last_event_id if existing is not None else 0
+    replace_agent_score_aggregates(db, [(agent_id, totals, event_count, last_event_id)])
+    db.commit()
+    return totals
+
+
+def _lock_aggregates(db: Session, agent_ids: list[str]) -> None:
+    """Hold the agents' aggregate rows until commit, creating placeholders for missing ones.
+
+    Ingest upserts the same rows, so it cannot fold in an event between a
+    rebuild's count and its write. Event ids are assigned in insert order, not
+    commit order, so the ``last_event_id`` guard alone cannot tell an increment
+    from an ingest that was open during the count. The placeholder carries no
+    model version, so it is never served if left behind. Counts read after this
+    see every committed event under Postgres's default READ COMMITTED.
+    """
+    table = AgentScoreAggregate.__table__
+    agent_ids = sorted(agent_ids)
+    for chunk in _chunked(agent_ids):
+        db.execute(
+            dialect_insert(db)(table)
+            .values([{"agent_id": agent_id, "model_version": ""} for agent_id in chunk])
+            .on_conflict_do_nothing()
+        )
+        db.execute(
+            select(AgentScoreAggregate.agent_id).where(AgentScoreAggregate.agent_id.in_(chunk)).with_for_update()
+        ).all()
+
+
+def _count_agent_history(db: Session, agent_id: str) -> tuple[ScoreTotals, int, int | None]:
+    """Score totals, event count and newest event id from events and, past the watermark, the rollups."""
+    compacted_before = get_compacted_before(db)
+    counts, last_event_id = count_agent_event_types(db, agent_id, since=compacted_before)
+    with stage("scoring.score_totals_from_counts"):
+        totals = score_totals_from_counts(counts)
+    decay = uses_decay_model(settings.model_version)
+    if decay:
+        # Decay needs each event's timestamp, but still not the full ORM row.
+        stmt = select(EventRecord.event_type, EventRecord.occurred_at).where(EventRecord.agent_id == agent_id)
+        if compacted_before is not None:
+            stmt = stmt.where(EventRecord.occurred_at >= compacted_before)
+        totals.decay = accumulate_decay_state(db.execute(stmt).all(), _half_life_seconds())
+        totals.half_life_seconds = _half_life_seconds()
+
+    event_count = sum(counts.values())
+    if compacted_before is not None:
+        for event_type, bucket_start, count in list_compacted_event_counts(db, agent_id, compacted_before):
+            totals.add(event_type, count)
+            if decay:
+                totals.decay.add(event_type, bucket_start + timedelta(hours=12), _half_life_seconds(), count)
+            event_count += count
+    return totals, event_count, last_event_id
+
+
+@timed("store.count_agent_event_types")
+def count_agent_event_types(
+    db: Session, agent_id: str, since: datetime | None = None
+) -> tuple[dict[str, int], int | None]:
+    """Return the agent's ``{event_type: count}`` and newest event id via one ``GROUP BY event_type``.
+
+    Only a row per event type crosses the wire, and on Postgres the covering
+    history index answers it without reading the table.
+    """
+    stmt = (
+        select(EventRecord.event_type, func.count(), func.max(EventRecord.id))
         .where(EventRecord.agent_id == agent_id)
-        .order_by(EventRecord.occurred_at.asc(), EventRecord.id.asc())
+        .group_by(EventRecord.event_type)
+    )
+    if since is not None:
+        stmt = stmt.where(EventRecord.occurred_at >= since)
+    counts: dict[str, int] = {}
+    last_event_id = None
+    for event_type, count, max_id in db.execute(stmt):
+        counts[event_type] = count
+        last_event_id = max_id if last_event_id is None else max(last_event_id, max_id)
+    return counts, last_event_id
+
+
+def get_compacted_before(db: Session) -> datetime | None:
+    state = db.get(RetentionState, 1, populate_existing=True)
+    if state is None or state.compacted_before is None:
+        return None
+    # SQLite drops the offset; watermarks are always stored in UTC.
+    return state.compacted_before.replace(tzinfo=timezone.utc)
+
+
+def set_compacted_before(db: Session, watermark: datetime) -> None:
+    state = db.get(RetentionState, 1)
+    if state is None:
+        db.add(RetentionState(id=1, compacted_before=watermark))
+    else:
+        state.compacted_before = watermark
+    db.commit()
+
+
+def list_compacted_event_counts(db: Session, agent_id: str, before: datetime) -> list[tuple[str, datetime, int]]:
+    """Daily ``(event_type, bucket_start, count)`` rollups for an agent's events before ``before``."""
+    stmt = select(EventRollupDaily.event_type, EventRollupDaily.bucket_start, EventRollupDaily.event_count).where(
+        EventRollupDaily.agent_id == agent_id,
+        EventRollupDaily.bucket_start < before,
+    )
+    return [(event_type, bucket_start, count) for event_type, bucket_start, count in db.execute(stmt)]
+
+
+def iter_compacted_event_columns(
+    db: Session, before: datetime, chunk_size: int
+) -> Iterator[tuple[list[str], list[str], list[datetime], list[int]]]:
+    """Yield ``(agent_ids, event_types, bucket_starts, counts)`` chunks of daily rollups before ``before``."""
+    stmt = (
+        select(
+            EventRollupDaily.agent_id,
+            EventRollupDaily.event_type,
+            EventRollupDaily.bucket_start,
+            EventRollupDaily.event_count,
+        )
+        .where(EventRollupDaily.bucket_start < before)
+        .execution_options(yield_per=chunk_size)
+    )
+    for partition in db.execute(stmt).partitions():
+        agent_ids, event_types, bucket_starts, counts = zip(*partition)
+        yield list(agent_ids), list(event_types), list(bucket_starts), list(counts)
+
+
+def delete_events_before(db: Session, before: datetime, batch_size: int = 10_000) -> int:
+    """Delete events older than ``before``; returns the number of rows removed.
+
+    There is no index on ``occurred_at`` alone, so the table is walked once in
+    primary-key ranges of ``batch_size`` ids, committing after each range.
+    """
+    deleted = 0
+    low, high = db.execute(select(func.min(EventRecord.id), func.max(EventRecord.id))).one()
+    if low is None:
+        return 0
+    for start in range(low, high + 1, batch_size):
+        result = db.execute(
+            delete(EventRecord).where(
+                EventRecord.id >= start,
+                EventRecord.id < start + batch_size,
+                EventRecord.occurred_at < before,
+            )
+        )
+        db.commit()
+        deleted += result.rowcount
+    return deleted
+
+
+def release_event_ids_before(db: Session, before: datetime, batch_size: int = 10_000) -> int:
+    """Delete ``event_ids`` claims for events older than ``before``, ``batch_size`` rows per commit."""
+    released = 0
+    while True:
+        batch = select(EventIdRecord.event_id).where(EventIdRecord.occurred_at < before).limit(batch_size)
+        result = db.execute(delete(EventIdRecord).where(EventIdRecord.event_id.in_(batch.scalar_subquery())))
+        db.commit()
+        released += result.rowcount
+        if result.rowcount < batch_size:
+            return released
+
+
+def prune_hourly_rollups(db: Session, before: datetime) -> int:
+    """Drop hourly buckets older than ``before``; windowed factors only need recent hours."""
+    result = db.execute(delete(EventRollupHourly).where(EventRollupHourly.bucket_start < before))
+    db.commit()
+    return result.rowcount
+
+
+def replace_agent_score_aggregates(
+    db: Session,
+    rows: list[tuple[str, ScoreTotals, int, int]],
+    enqueue_jobs: bool = False,
+) -> None:
+    """Overwrite aggregates with ``(agent_id, totals, event_count, last_event_id)`` recomputed from events.
+
+    A row is left alone if a concurrent ingest has already folded in an event
+    newer than ``last_event_id``, so a slow recompute never rolls an aggregate
+    back. With ``enqueue_jobs`` the agents are also queued for the scoring
+    worker. Does not commit.
+    """
+    if not rows:
+        return
+
+    table = AgentScoreAggregate.__table__
+    stmt = dialect_insert(db)(table).values(
+        [
+            {
+                "agent_id": agent_id,
+                "positive_delta": totals.positive_delta,
+                "negative_delta": totals.negative_delta,
+                "unknown_event_count": int(totals.unknown_events),
+                "event_count": event_count,
+                "last_event_id": last_event_id,
+                "decayed_positive": totals.decay.positive if totals.decay else 0.0,
+                "decayed_negative": totals.decay.negative if totals.decay else 0.0,
+                "decay_reference_at": totals.decay.reference_at if totals.decay else None,
+                "model_version": settings.model_version,
+            }
+            for agent_id, totals, event_count, last_event_id in rows
+        ]
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[table.c.agent_id],
+        set_={
+            "positive_delta": stmt.excluded.positive_delta,
+            "negative_delta": stmt.excluded.negative_delta,
+            "unknown_event_count": stmt.excluded.unknown_event_count,
+            "event_count": stmt.excluded.event_count,
+            "last_event_id": stmt.excluded.last_event_id,
+            "decayed_positive": stmt.excluded.decayed_positive,
+            "decayed_negative": stmt.excluded.decayed_negative,
+            "decay_reference_at": stmt.excluded.decay_reference_at,
+            "model_version": stmt.excluded.model_version,
+        },
+        where=table.c.last_event_id <= stmt.excluded.last_event_id,
+    )
+    db.execute(stmt)
+    if enqueue_jobs:
+        _enqueue_score_jobs(db, [agent_id for agent_id, *_ in rows])
+
+
+def iter_event_columns(
+    db: Session, chunk_size: int, since: datetime | None = None
+) -> Iterator[tuple[list[int], list[str], list[str], list[datetime]]]:
+    """Yield ``(ids, agent_ids, event_types, occurred_at)`` column chunks over the events table."""
+    stmt = select(
+        EventRecord.id,
+        EventRecord.agent_id,
+        EventRecord.event_type,
+        EventRecord.occurred_at,
+    ).execution_options(yield_per=chunk_size)
+    if since is not None:
+        stmt = stmt.where(EventRecord.occurred_at >= since)
+    for partition in db.execute(stmt).partitions():
+        ids, agent_ids, event_types, occurred_at = zip(*partition)
+        yield list(ids), list(agent_ids), list(event_types), list(occurred_at)
+
+
+@timed("store.get_agent_score_totals")
+def get_agent_score_totals(db: Session, agent_id: str) -> ScoreTotals:
+    """Return score totals from the maintained aggregate, rebuilding it when missing or stale."""
+    aggregate = get_agent_score_aggregate(db, agent_id)
+    if aggregate is None or aggregate.model_version != settings.model_version:
+        return rebuild_agent_score_aggregate(db, agent_id)
+
+    observe_rows_scanned("aggregate", 1)
+    return _totals_from_aggregate(aggregate)
+
+
+def _totals_from_aggregate(aggregate: AgentScoreAggregate) -> ScoreTotals:
+    totals = ScoreTotals(
+        positive_delta=aggregate.positive_delta,
+        negative_delta=aggregate.negative_delta,
+        unknown_events=float(aggregate.unknown_event_count),
+    )
+    if uses_decay_model(settings.model_version):
+        totals.decay = DecayState(aggregate.decayed_positive, aggregate.decayed_negative, aggregate.decay_reference_at)
+        totals.half_life_seconds = _half_life_seconds()
+    return totals
+
+
+@timed("store.get_agent_score_totals_batch")
+def get_agent_score_totals_batch(db: Session, agent_ids: list[str]) -> dict[str, ScoreTotals]:
+    """``get_agent_score_totals`` for many agents: one aggregate query plus one grouped rebuild."""
+    aggregates = {
+        aggregate.agent_id: aggregate
+        for aggregate in db.scalars(
+            select(AgentScoreAggregate)
+            .where(AgentScoreAggregate.agent_id.in_(agent_ids))
+            .execution_options(populate_existing=True)
+        )
+    }
+    totals: dict[str, ScoreTotals] = {}
+    stale = []
+    for agent_id in agent_ids:
+        aggregate = aggregates.get(agent_id)
+        if aggregate is None or aggregate.model_version != settings.model_version:
+            stale.append(agent_id)
+        else:
+            observe_rows_scanned("aggregate", 1)
+            totals[agent_id] = _totals_from_aggregate(aggregate)
+    if stale:
+        totals.update(rebuild_agent_score_aggregates(db, stale, aggregates))
+    return totals
+
+
+@timed("store.rebuild_agent_score_aggregates")
+def rebuild_agent_score_aggregates(
+    db: Session, agent_ids: list[str], aggregates: dict[str, AgentScoreAggregate]
+) -> dict[str, ScoreTotals]:
+    """Rebuild many aggregates from ``GROUP BY agent_id, event_type`` counts and persist them in one upsert.
+
+    ``aggregates`` holds the agents' current rows, if any. The decay model needs
+    event timestamps, so it falls back to rebuilding one agent at a time. As there,
+    agents with history are counted again under ``_lock_aggregates``.
+    """
+    if uses_decay_model(settings.model_version):
+        return {agent_id: rebuild_agent_score_aggregate(db, agent_id) for agent_id in agent_ids}
+
+    compacted_before = get_compacted_before(db)
+    accumulator = _count_agents_history(db, agent_ids, compacted_before)
+    if accumulator.totals:
+        found = list(accumulator.totals)
+        _lock_aggregates(db, found)
+        accumulator = _count_agents_history(db, found, compacted_before)
+
+    totals: dict[str, ScoreTotals] = {}
+    rows = []
+    for agent_id in agent_ids:
+        observe_rows_scanned("rebuild", accumulator.event_counts.get(agent_id, 0))
+        agent_totals = accumulator.totals.get(agent_id)
+        if agent_totals is None:
+            totals[agent_id] = ScoreTotals()
+            continue
+        totals[agent_id] = agent_totals
+        last_event_id = accumulator.last_event_ids.get(agent_id)
+        if last_event_id is None:
+            existing = aggregates.get(agent_id)
+            last_event_id = existing.last_event_id if existing is not None else 0
+        rows.append((agent_id, agent_totals, accumulator.event_counts[agent_id], last_event_id))
+    if rows:
+        replace_agent_score_aggregates(db, rows)
+    db.commit()
+    return totals
+
+
+def _count_agents_history(
+    db: Session, agent_ids: list[str], compacted_before: datetime | None
+) -> ScoreTotalsAccumulator:
+    """``_count_agent_history`` for many agents with one ``GROUP BY agent_id, event_type``."""
+    stmt = (
+        select(EventRecord.agent_id, EventRecord.event_type, func.count(), func.max(EventRecord.id))
+        .where(EventRecord.agent_id.in_(agent_ids))
+        .group_by(EventRecord.agent_id, EventRecord.event_type)
+    )
+    if compacted_before is not None:
+        stmt = stmt.where(EventRecord.occurred_at >= compacted_before)
+    accumulator = ScoreTotalsAccumulator()
+    groups = db.execute(stmt).all()
+    if groups:
+        group_agents, event_types, counts, last_ids = zip(*groups)
+        accumulator.add(group_agents, encode_event_types(event_types), last_ids, multiplicities=counts)
+    if compacted_before is not None:
+        compacted = db.execute(
+            select(EventRollupDaily.agent_id, EventRollupDaily.event_type, func.sum(EventRollupDaily.event_count))
+            .where(EventRollupDaily.agent_id.in_(agent_ids), EventRollupDaily.bucket_start < compacted_before)
+            .group_by(EventRollupDaily.agent_id, EventRollupDaily.event_type)
+        ).all()
+        if compacted:
+            group_agents, event_types, counts = zip(*compacted)
+            accumulator.add(group_agents, encode_event_types(event_types), multiplicities=counts)
+    return accumulator
+
+
+def _queued_score_jobs(db: Session, agent_ids: list[str]) -> set[str]:
+    """Agents with a pending worker job, whose pass will snapshot the score an inline read computes."""
+    if not settings.score_worker_enabled or not agent_ids:
+        return set()
+    return set(db.scalars(select(ScoreJob.agent_id).where(ScoreJob.agent_id.in_(agent_ids))))
+
+
+def _serves_stored_scores() -> bool:
+    """Whether reads may return ``agent_scores`` rows; decayed scores keep moving after the worker stores them."""
+    return settings.score_worker_enabled and not uses_decay_model(settings.model_version)
+
+
+@timed("store.get_agent_score")
+def get_agent_score(db: Session, agent_id: str) -> ScoreResult:
+    """Return the agent's current score, serving repeat reads from ``score_cache``.
+
+    With the scoring worker enabled this is a lookup of the precomputed
+    ``agent_scores`` row, falling back to inline scoring for agents the worker has
+    not reached yet. Under the decay model a stored row is only correct at its
+    ``computed_at``, so it is skipped and the aggregate's decay state is valued at
+    read time instead, which costs the same single-row read.
+
+    Inline results are snapshotted through the write-behind ``snapshot_writer``,
+    unless a queued job will record the same score. Without the worker they are
+    also checked for tier changes by ``webhook_dispatcher``; with it, the worker
+    is the only source of tier changes, detected against the persisted tier, so
+    a crossing is not also reported by every API process that reads the agent.
+    """
+    result = score_cache.get(agent_id, settings.model_version)
+    if result is not None:
+        return result
+
+    started_at = time.time()
+    if _serves_stored_scores():
+        current = get_current_score(db, agent_id)
+        if current is not None and current.model_version == settings.model_version:
+            result = ScoreResult(score=current.score, tier=current.tier, factors=current.factors)
+            score_cache.set(agent_id, settings.model_version, result, started_at)
+            return result
+
+    totals = get_agent_score_totals(db, agent_id)
+    with stage("scoring.score_from_totals"):
+        result = score_from_totals(totals)
+    score_cache.set(agent_id, settings.model_version, result, started_at)
+    if not _queued_score_jobs(db, [agent_id]):
+        snapshot_writer.submit(agent_id, result)
+    if not settings.score_worker_enabled:
+        webhook_dispatcher.observe(agent_id, result)
+    return result
+
+
+@timed("store.get_agent_scores")
+def get_agent_scores(db: Session, agent_ids: Iterable[str]) -> dict[str, ScoreResult]:
+    """``get_agent_score`` for many agents with a constant number of queries.
+
+    Cached scores are served as-is. The rest come from one ``agent_scores`` query
+    when the worker is enabled and the model does not decay, then one aggregate query, and one grouped event
+    count for agents whose aggregate must be rebuilt. Snapshots go through the
+    batching ``snapshot_writer`` as for single reads.
+    """
+    ordered = list(dict.fromkeys(agent_ids))
+    results: dict[str, ScoreResult] = {}
+    missing = []
+    for agent_id in ordered:
+        cached = score_cache.get(agent_id, settings.model_version)
+        if cached is not None:
+            results[agent_id] = cached
+        else:
+            missing.append(agent_id)
+    if not missing:
+        return results
+
+    started_at = time.time()
+    if _serves_stored_scores():
+        stmt = select(AgentScore).where(
+            AgentScore.agent_id.in_(missing), AgentScore.model_version == settings.model_version
+        )
+        for current in db.scalars(stmt):
+            result = ScoreResult(score=current.score, tier=current.tier, factors=current.factors)
+            score_cache.set(current.agent_id, settings.model_version, result, started_at)
+            results[current.agent_id] = result
+        missing = [agent_id for agent_id in missing if agent_id not in results]
+
+    queued = _queued_score_jobs(db, missing)
+    for agent_id, totals in get_agent_score_totals_batch(db, missing).items():
+        with stage("scoring.score_from_totals"):
+            result = score_from_totals(totals)
+        score_cache.set(agent_id, settings.model_version, result, started_at)
+        if agent_id not in queued:
+            snapshot_writer.submit(agent_id, result)
+        if not settings.score_worker_enabled:
+            webhook_dispatcher.observe(agent_id, result)
+        results[agent_id] = result
+    return {agent_id: results[agent_id] for agent_id in ordered}
+
+
+@timed("store.get_current_score")
+def get_current_score(db: Session, agent_id: str) -> AgentScore | None:
+    return db.get(AgentScore, agent_id, populate_existing=True)
+
+
+@timed("store.claim_score_jobs")
+def claim_score_jobs(db: Session, limit: int, lease_seconds: float) -> list[tuple[str, int]]:
+    """Lease up to ``limit`` pending jobs, oldest first, as ``(agent_id, version)`` pairs.
+
+    ``FOR UPDATE SKIP LOCKED`` lets concurrent workers claim disjoint batches
+    without waiting on each other. The lease is committed immediately, so a
+    worker that dies mid-batch only delays its jobs until ``claimed_until`` passes.
+    """
+    now = datetime.now(timezone.utc)
+    stmt = (
+        select(ScoreJob.agent_id, ScoreJob.version)
+        .where(or_(ScoreJob.claimed_until.is_(None), ScoreJob.claimed_until < now))
+        .order_by(ScoreJob.enqueued_at.asc())
+        .limit(limit)
+        .with_for_update(skip_locked=True)
     )
-    return list(db.scalars(stmt).all())
+    jobs = [(agent_id, version) for agent_id, version in db.execute(stmt)]
+    if jobs:
+        db.execute(
+            update(ScoreJob)
+            .where(ScoreJob.agent_id.in_([agent_id for agent_id, _ in jobs]))
+            .values(claimed_until=now + timedelta(seconds=lease_seconds), attempts=ScoreJob.attempts + 1)
+        )
+    db.commit()
+    return jobs
+
+
+@timed("store.fail_score_job")
+def fail_score_job(db: Session, agent_id: str, lease_seconds: float, max_attempts: int) -> bool:
+    """Back off a job whose processing raised, or drop it after ``max_attempts``; returns whether it was dropped.
+
+    The retry waits ``lease_seconds * 2^(attempts - 1)``, so a job that always
+    fails stops occupying workers instead of being leased again every lease.
+    """
+    job = db.get(ScoreJob, agent_id, populate_existing=True)
+    if job is None:
+        return False
+    if job.attempts >= max_attempts:
+        db.delete(job)
+        db.commit()
+        return True
+    job.claimed_until = datetime.now(timezone.utc) + timedelta(seconds=lease_seconds * 2 ** max(job.attempts - 1, 0))
+    db.commit()
+    return False
 
 
-def save_score_snapshot(db: Session, agent_id: str, result: ScoreResult) -> ScoreSnapshot:
-    snapshot = ScoreSnapshot(
-        agent_id=agent_id,
-        score=result.score,
-        tier=result.tier,
-        factors=result.factors,
+@timed("store.process_score_job")
+def process_score_job(db: Session, agent_id: str, version: int) -> bool:
+    """Recompute one agent into ``agent_scores`` and retire its job.
+
+    A snapshot is recorded only when the score, tier, factors or model version
+    changed. If new events re-enqueued the agent while it was being scored, the
+    job is released rather than deleted so it is picked up again. Returns whether
+    the stored score changed.
+    """
+    totals = get_agent_score_totals(db, agent_id)
+    with stage("scoring.score_from_totals"):
+        result = score_from_totals(totals)
+    current = get_current_score(db, agent_id)
+    changed = current is None or (current.score, current.tier, current.factors, current.model_version) != (
+        result.score,
+        result.tier,
+        result.factors,
+        settings.model_version,
     )
-    db.add(snapshot)
+
+    if changed:
+        computed_at = datetime.now(timezone.utc)
+        values = {
+            "agent_id": agent_id,
+            "score": result.score,
+            "tier": result.tier,
+            "factors": result.factors,
+            "model_version": settings.model_version,
+            "computed_at": computed_at,
+        }
+        table = AgentScore.__table__
+        stmt = dialect_insert(db)(table).values(values)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c.agent_id],
+            set_={key: value for key, value in values.items() if key != "agent_id"},
+        )
+        db.execute(stmt)
+        db.add(
+            ScoreSnapshot(
+                agent_id=agent_id,
+                score=result.score,
+                tier=result.tier,
+                factors=result.factors,
+                computed_at=computed_at,
+            )
+        )
+        alerts = record_snapshots(db, [{"agent_id": agent_id, "score": result.score, "computed_at": computed_at}])
+    else:
+        alerts = []
+
+    deleted = db.execute(delete(ScoreJob).where(ScoreJob.agent_id == agent_id, ScoreJob.version == version))
+    if deleted.rowcount == 0:
+        db.execute(update(ScoreJob).where(ScoreJob.agent_id == agent_id).values(claimed_until=None, attempts=0))
+    previous_tier = current.tier if current is not None else None
     db.commit()
-    db.refresh(snapshot)
-    return snapshot
+    emit_drift_alerts(alerts)
+    if previous_tier is not None and previous_tier != result.tier:
+        webhook_dispatcher.notify(
+            TierChange(agent_id, previous_tier, result.tier, result.score, settings.model_version)
+        )
+    return changed
+
+
+def _filter_agent_events(
+    stmt: Select,
+    agent_id: str,
+    since: datetime | None,
+    until: datetime | None,
+    event_type: str | None,
+    after: tuple[datetime, int] | None,
+    limit: int | None,
+    descending: bool,
+) -> Select:
+    stmt = stmt.where(EventRecord.agent_id == agent_id)
+    if since is not None:
+        stmt = stmt.where(EventRecord.occurred_at >= since)
+    if until is not None:
+        stmt = stmt.where(EventRecord.occurred_at < until)
+    if event_type is not None:
+        stmt = stmt.where(EventRecord.event_type == event_type)
+
+    key = tuple_(EventRecord.occurred_at, EventRecord.id)
+    if descending:
+        if after is not None:
+            stmt = stmt.where(key < tuple_(*after))
+        stmt = stmt.order_by(EventRecord.occurred_at.desc(), EventRecord.id.desc())
+    else:
+        if after is not None:
+            stmt = stmt.where(key > tuple_(*after))
+        stmt = stmt.order_by(EventRecord.occurred_at.asc(), EventRecord.id.asc())
+
+    if limit is not None:
+        stmt = stmt.limit(limit)
+    return stmt
+
+
+class EventRow(NamedTuple):
+    """A read-only event as a plain tuple: no ORM state, no identity map entry.
+
+    Satisfies the ``TrustEvent`` and ``TimedTrustEvent`` protocols, so rows can
+    be scored directly.
+    """
+
+    id: int
+    event_id: str
+    agent_id: str
+    event_type: str
+    source: str
+    occurred_at: datetime
+    metadata: dict[str, Any]
+
+
+EVENT_ROW_COLUMNS = (
+    EventRecord.id,
+    EventRecord.event_id,
+    EventRecord.agent_id,
+    EventRecord.event_type,
+    EventRecord.source,
+    EventRecord.occurred_at,
+    EventRecord.metadata_json,
+)
+
+
+@timed("store.list_agent_event_rows")
+def list_agent_event_rows(
+    db: Session,
+    agent_id: str,
+    *,
+    since: datetime | None = None,
+    until: datetime | None = None,
+    event_type: str | None = None,
+    after: tuple[datetime, int] | None = None,
+    limit: int | None = None,
+    descending: bool = False,
+) -> list[EventRow]:
+    """List an agent's events as ``EventRow`` tuples ordered by ``(occurred_at, id)``.
+
+    ``after`` is a keyset cursor: the ``(occurred_at, id)`` of the last row already
+    seen, in the direction given by ``descending``. Together with ``limit`` this
+    walks the ``(agent_id, occurred_at, id)`` index without an OFFSET scan.
+    """
+    stmt = _filter_agent_events(
+        select(*EVENT_ROW_COLUMNS), agent_id, since, until, event_type, after, limit, descending
+    )
+    return list(map(EventRow._make, db.execute(stmt)))
+
+
+def iter_agent_event_rows(db: Session, agent_id: str, batch_size: int = 1000) -> Iterator[list[EventRow]]:
+    """Yield an agent's events as ``EventRow`` tuples in ``batch_size`` partitions, oldest first.
+
+    Uses ``yield_per``, which streams through a server-side cursor on Postgres, so
+    memory stays flat however long the history is.
+    """
+    stmt = (
+        select(*EVENT_ROW_COLUMNS)
+        .where(EventRecord.agent_id == agent_id)
+        .order_by(EventRecord.occurred_at.asc(), EventRecord.id.asc())
+        .execution_options(yield_per=batch_size)
+    )
+    for partition in db.execute(stmt).partitions():
+        yield list(map(EventRow._make, partition))
+
+
+def iter_score_history(
+    db: Session, agent_id: str, since: datetime, until: datetime, chunk_size: int = 1000
+) -> Iterator[tuple[datetime, float, str]]:
+    """Stream an agent's ``(computed_at, score, tier)`` snapshots in ``[since, until)`` in time order."""
+    stmt = (
+        select(ScoreSnapshot.computed_at, ScoreSnapshot.score, ScoreSnapshot.tier)
+        .where(
+            ScoreSnapshot.agent_id == agent_id,
+            ScoreSnapshot.computed_at >= since,
+            ScoreSnapshot.computed_at < until,
+        )
+        .order_by(ScoreSnapshot.computed_at)
+        .execution_options(yield_per=chunk_size)
+    )
+    for computed_at, score, tier in db.execute(stmt):
+        yield computed_at, score, tier
+
+
+def event_row_to_schema(row: EventRow) -> EventIn:
+    """``event_record_to_schema`` for a row; skips validation, which the event passed at ingest."""
+    return EventIn.model_construct(
+        event_id=row.event_id,
+        agent_id=row.agent_id,
+        event_type=row.event_type,
+        source=row.source,
+        occurred_at=row.occurred_at,
+        metadata=row.metadata,
+    )
 
 
 def event_record_to_schema(record: EventRecord) -> EventIn:
@@ -0,0 +1,80 @@
+"""Background scoring worker: ``python -m app.worker``.
+
+Consumes ``score_jobs`` (filled by ingest when ``SCORE_WORKER_ENABLED=true``) and
+keeps ``agent_scores`` current. Jobs are claimed with ``FOR UPDATE SKIP LOCKED``,
+so any number of worker processes can run side by side.
+"""
+from __future__ import annotations
+
+import argparse
+import logging
+import signal
+import threading
+
+from app.config import settings
+from app.db import get_session_factory
+from app.services.webhooks import webhook_dispatcher
+from app.store import claim_score_jobs, fail_score_job, process_score_job
+
+
+logger = logging.getLogger(__name__)
+
+
+def run_batch(batch_size: int, lease_seconds: float) -> int:
+    """Claim and process one batch of jobs; returns how many were claimed."""
+    with get_session_factory()() as db:
+        jobs = claim_score_jobs(db, batch_size, lease_seconds)
+        for agent_id, version in jobs:
+            try:
+                process_score_job(db, agent_id, version)
+            except Exception:
+                db.rollback()
+                logger.exception("failed to score agent %s", agent_id)
+                if fail_score_job(db, agent_id, lease_seconds, settings.score_worker_max_attempts):
+                    logger.error(
+                        "dropped score job for agent %s after %d attempts", agent_id, settings.score_worker_max_attempts
+                    )
+    return len(jobs)
+
+
+def run_worker(
+    batch_size: int,
+    poll_interval: float,
+    lease_seconds: float,
+    stop: threading.Event,
+    once: bool = False,
+) -> int:
+    processed = 0
+    while not stop.is_set():
+        claimed = run_batch(batch_size, lease_seconds)
+        processed += claimed
+        if once and claimed == 0:
+            break
+        if claimed < batch_size:
+            stop.wait(poll_interval)
+    return processed
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m app.worker", description="Background scoring worker.")
+    parser.add_argument("--batch-size", type=int, default=settings.score_worker_batch_size)
+    parser.add_argument("--poll-interval", type=float, default=settings.score_worker_poll_interval_seconds)
+    parser.add_argument("--lease-seconds", type=float, default=settings.score_worker_lease_seconds)
+    parser.add_argument("--once", action="store_true", help="exit once the queue is empty")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(levelname)-5.5s [%(name)s] %(message)s")
+    stop = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: stop.set())
+    signal.signal(signal.SIGINT, lambda *_: stop.set())
+
+    webhook_dispatcher.start()
+    try:
+        processed = run_worker(args.batch_size, args.poll_interval, args.lease_seconds, stop, once=args.once)
+    finally:
+        webhook_dispatcher.stop()
+    logger.info("scored %d agents", processed)
+
+
+if __name__ == "__main__":
+    main()
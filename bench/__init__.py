@@ -0,0 +1,4 @@
+"""Benchmarks: ``python -m bench.micro``, ``python -m bench.load`` and ``python -m bench.compare``.
+
+Every run writes a JSON report to ``bench/results/`` so runs can be compared over time.
+"""
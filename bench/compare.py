@@ -0,0 +1,50 @@
+"""Compare two benchmark reports: ``python -m bench.compare BASELINE CURRENT``.
+
+Exits with status 1 when any latency, per-event time or throughput metric got
+worse by more than ``--threshold``, so it can gate CI.
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+
+from bench.report import RESULTS_DIR, compare_reports, load_report
+
+
+def latest_reports(kind: str, count: int = 2) -> list[Path]:
+    return sorted(RESULTS_DIR.glob(f"{kind}-*.json"))[-count:]
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m bench.compare", description="Flag benchmark regressions.")
+    parser.add_argument("baseline", nargs="?", type=Path, help="older report")
+    parser.add_argument("current", nargs="?", type=Path, help="newer report")
+    parser.add_argument("--kind", choices=("micro", "load"), default="load", help="without paths: two latest of kind")
+    parser.add_argument("--threshold", type=float, default=0.1, help="allowed relative slowdown (0.1 = 10%%)")
+    args = parser.parse_args(argv)
+
+    if args.baseline and args.current:
+        baseline_path, current_path = args.baseline, args.current
+    else:
+        reports = latest_reports(args.kind)
+        if len(reports) < 2:
+            parser.error(f"need two {args.kind} reports in {RESULTS_DIR} or explicit paths")
+        baseline_path, current_path = reports
+
+    baseline, current = load_report(baseline_path), load_report(current_path)
+    regressions = compare_reports(baseline, current, args.threshold)
+    print(
+        f"baseline {baseline_path.name} ({baseline.get('git_commit')}) "
+        f"-> current {current_path.name} ({current.get('git_commit')})"
+    )
+    if not regressions:
+        print(f"no regressions beyond {args.threshold:.0%}")
+        return 0
+    for metric, old, new, change in regressions:
+        print(f"REGRESSION {metric}: {old:g} -> {new:g} ({change:+.1%})")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
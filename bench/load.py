@@ -0,0 +1,267 @@
+"""End-to-end load generator: ``python -m bench.load``.
+
+Drives ``POST /v1/intake/events`` and ``GET /v1/trust/score/{agent_id}``
+concurrently from ``--concurrency`` asyncio workers for ``--duration`` seconds.
+Each request is an ingest or, with probability ``--score-ratio``, a score read.
+Agents are drawn from ``--agents`` ids with a Zipf-like ``--agent-skew``
+(0 is uniform), and event types from ``--event-mix``.
+
+Without ``--url`` a local uvicorn is started on a scratch SQLite database;
+pass ``--database-url`` to point that server at Postgres instead.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+import httpx
+
+from bench.report import build_report, summarize_latencies, write_report
+
+
+DEFAULT_EVENT_MIX = {
+    "safe_tool_usage": 40,
+    "task_completed_without_rework": 25,
+    "policy_compliant_response": 15,
+    "human_approved_action": 10,
+    "hallucination_detected": 5,
+    "unsafe_tool_call": 3,
+    "policy_violation": 2,
+}
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+@dataclass
+class LoadConfig:
+    url: str
+    duration: float = 30.0
+    warmup: float = 2.0
+    concurrency: int = 32
+    agents: int = 1000
+    agent_skew: float = 1.0
+    score_ratio: float = 0.2
+    event_mix: dict[str, int] = field(default_factory=lambda: dict(DEFAULT_EVENT_MIX))
+    seed: int = 1
+
+
+@dataclass
+class _OpStats:
+    latencies: list[float] = field(default_factory=list)
+    errors: int = 0
+
+
+class _Workload:
+    """Seeded request generator shared by all workers."""
+
+    def __init__(self, config: LoadConfig) -> None:
+        self.rng = random.Random(config.seed)
+        self.agent_ids = [f"bench-agent-{i}" for i in range(config.agents)]
+        self.agent_weights = [1 / (rank + 1) ** config.agent_skew for rank in range(config.agents)]
+        self.event_types = list(config.event_mix)
+        self.event_weights = list(config.event_mix.values())
+        self.score_ratio = config.score_ratio
+        self.run_id = uuid.uuid4().hex[:8]
+        self.sequence = 0
+
+    def agent(self) -> str:
+        return self.rng.choices(self.agent_ids, weights=self.agent_weights)[0]
+
+    def next_request(self) -> tuple[str, str, str, dict[str, Any] | None]:
+        """``(operation, method, path, json body)``."""
+        agent_id = self.agent()
+        if self.rng.random() < self.score_ratio:
+            return "score", "GET", f"/v1/trust/score/{agent_id}", None
+        self.sequence += 1
+        body = {
+            "event_id": f"bench-{self.run_id}-{self.sequence}",
+            "agent_id": agent_id,
+            "event_type": self.rng.choices(self.event_types, weights=self.event_weights)[0],
+            "source": "bench",
+            "occurred_at": datetime.now(timezone.utc).isoformat(),
+        }
+        return "ingest", "POST", "/v1/intake/events", body
+
+
+async def _worker(
+    client: httpx.AsyncClient, workload: _Workload, stats: dict[str, _OpStats], measure_from: float, until: float
+) -> None:
+    while (now := time.perf_counter()) < until:
+        operation, method, path, body = workload.next_request()
+        started = time.perf_counter()
+        try:
+            response = await client.request(method, path, json=body)
+            ok = response.status_code < 400
+        except httpx.HTTPError:
+            ok = False
+        finished = time.perf_counter()
+        if now < measure_from:
+            continue
+        op = stats[operation]
+        if ok:
+            op.latencies.append(finished - started)
+        else:
+            op.errors += 1
+
+
+async def run_load(config: LoadConfig) -> dict[str, dict[str, float]]:
+    workload = _Workload(config)
+    stats = {"ingest": _OpStats(), "score": _OpStats()}
+    limits = httpx.Limits(max_connections=config.concurrency, max_keepalive_connections=config.concurrency)
+    async with httpx.AsyncClient(base_url=config.url, limits=limits, timeout=30.0) as client:
+        started = time.perf_counter()
+        measure_from = started + config.warmup
+        until = measure_from + config.duration
+        await asyncio.gather(
+            *(_worker(client, workload, stats, measure_from, until) for _ in range(config.concurrency))
+        )
+        elapsed = time.perf_counter() - measure_from
+
+    results = {name: summarize_latencies(op.latencies, elapsed, op.errors) for name, op in stats.items()}
+    results["total"] = summarize_latencies(
+        [latency for op in stats.values() for latency in op.latencies],
+        elapsed,
+        sum(op.errors for op in stats.values()),
+    )
+    return results
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@contextmanager
+def local_server(database_url: str | None, workers: int, env: dict[str, str]) -> Iterator[str]:
+    """Run uvicorn on a free port for the duration of the block; yields its base URL."""
+    with tempfile.TemporaryDirectory(prefix="atb-bench-") as scratch:
+        port = _free_port()
+        server_env = {
+            **os.environ,
+            "DATABASE_URL": database_url or f"sqlite:///{scratch}/bench.db",
+            "AUTO_CREATE_TABLES": "true",
+            **env,
+        }
+        command = [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1", "--port", str(port)]
+        command += ["--workers", str(workers), "--log-level", "warning"]
+        process = subprocess.Popen(command, cwd=ROOT, env=server_env)
+        url = f"http://127.0.0.1:{port}"
+        try:
+            deadline = time.monotonic() + 30
+            while True:
+                if process.poll() is not None:
+                    raise RuntimeError(f"uvicorn exited with status {process.returncode}")
+                try:
+                    if httpx.get(f"{url}/health", timeout=1.0).status_code == 200:
+                        break
+                except httpx.HTTPError:
+                    pass
+                if time.monotonic() > deadline:
+                    raise RuntimeError("uvicorn did not become healthy within 30s")
+                time.sleep(0.1)
+            yield url
+        finally:
+            process.terminate()
+            try:
+                process.wait(10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+
+
+def _event_mix(value: str) -> dict[str, int]:
+    mix = {}
+    for part in value.split(","):
+        name, _, weight = part.partition("=")
+        mix[name.strip()] = int(weight or 1)
+    return mix
+
+
+def _env_pairs(values: list[str]) -> dict[str, str]:
+    pairs = {}
+    for value in values:
+        name, sep, setting = value.partition("=")
+        if not sep:
+            raise argparse.ArgumentTypeError(f"--server-env expects NAME=VALUE, got {value!r}")
+        pairs[name] = setting
+    return pairs
+
+
+def _print_results(results: dict[str, dict[str, float]]) -> None:
+    print(f"{'operation':<8} {'requests':>9} {'errors':>7} {'rps':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    for name, row in results.items():
+        print(
+            f"{name:<8} {row['requests']:>9} {row['errors']:>7} {row['rps']:>9.1f} "
+            f"{row['p50_ms']:>8.2f} {row['p95_ms']:>8.2f} {row['p99_ms']:>8.2f}"
+        )
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m bench.load", description="Ingest and score load generator.")
+    parser.add_argument("--url", help="target an already running server instead of starting one")
+    parser.add_argument("--database-url", help="database for the local server (default: scratch SQLite file)")
+    parser.add_argument("--server-workers", type=int, default=1, help="uvicorn worker processes for the local server")
+    parser.add_argument(
+        "--server-env", action="append", default=[], metavar="NAME=VALUE", help="extra setting for the local server"
+    )
+    parser.add_argument("--duration", type=float, default=30.0, help="measured seconds")
+    parser.add_argument("--warmup", type=float, default=2.0, help="unmeasured seconds before the measurement")
+    parser.add_argument("--concurrency", type=int, default=32, help="requests in flight")
+    parser.add_argument("--agents", type=int, default=1000, help="distinct agent ids")
+    parser.add_argument("--agent-skew", type=float, default=1.0, help="Zipf exponent for agent popularity; 0 = uniform")
+    parser.add_argument("--score-ratio", type=float, default=0.2, help="fraction of requests that read a score")
+    parser.add_argument(
+        "--event-mix",
+        type=_event_mix,
+        default=dict(DEFAULT_EVENT_MIX),
+        help="event type weights, e.g. safe_tool_usage=9,policy_violation=1",
+    )
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--no-save", action="store_true", help="print results without writing a report")
+    args = parser.parse_args(argv)
+
+    config = LoadConfig(
+        url=args.url or "",
+        duration=args.duration,
+        warmup=args.warmup,
+        concurrency=args.concurrency,
+        agents=args.agents,
+        agent_skew=args.agent_skew,
+        score_ratio=args.score_ratio,
+        event_mix=args.event_mix,
+        seed=args.seed,
+    )
+    server_env = _env_pairs(args.server_env)
+    if args.url:
+        results = asyncio.run(run_load(config))
+    else:
+        with local_server(args.database_url, args.server_workers, server_env) as url:
+            config.url = url
+            results = asyncio.run(run_load(config))
+
+    _print_results(results)
+    if not args.no_save:
+        report_config = {key: value for key, value in vars(config).items() if key != "url"}
+        report_config["target"] = "external" if args.url else "local"
+        report_config["server_workers"] = args.server_workers
+        report_config["server_env"] = server_env
+        report = build_report("load", report_config, results)
+        print(f"report written to {write_report(report)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+"""Micro-benchmarks for the scoring and event conversion hot paths: ``python -m bench.micro``.
+
+Each case runs on synthetic events at every ``--sizes`` entry (1e3..1e6 by
+default) and keeps the best of ``--repeat`` timings, so the numbers reflect the
+code rather than scheduler noise.
+"""
+from __future__ import annotations
+
+import argparse
+import gc
+import random
+import time
+from collections import Counter
+from collections.abc import Callable
+from datetime import datetime, timedelta, timezone
+
+from app.models import EventRecord
+from app.services.scoring import (
+    NEGATIVE_EVENTS,
+    POSITIVE_EVENTS,
+    calculate_trust_score,
+    calculate_trust_score_from_counts,
+)
+from app.services.serialization import encode_events_page
+from app.store import event_record_to_schema
+from bench.report import build_report, write_report
+
+
+DEFAULT_SIZES = (1_000, 10_000, 100_000, 1_000_000)
+
+# ORM records are built and converted in chunks so 1e6 of them never coexist in memory.
+RECORD_CHUNK_SIZE = 100_000
+
+START = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+class _Event:
+    __slots__ = ("event_type",)
+
+    def __init__(self, event_type: str) -> None:
+        self.event_type = event_type
+
+
+def _event_types(size: int, seed: int) -> list[str]:
+    rng = random.Random(seed)
+    # Mostly positive traffic with an occasional unknown type, like production intake.
+    choices = [*POSITIVE_EVENTS, *NEGATIVE_EVENTS, "custom_event"]
+    weights = [30, 20, 25, 15, 2, 1, 2, 1, 1, 3]
+    return rng.choices(choices, weights=weights, k=size)
+
+
+def _records(event_types: list[str], offset: int) -> list[EventRecord]:
+    return [
+        EventRecord(
+            id=offset + i,
+            event_id=f"evt-{offset + i}",
+            agent_id=f"agent-{(offset + i) % 100}",
+            event_type=event_type,
+            source="bench",
+            occurred_at=START + timedelta(seconds=offset + i),
+            metadata_json={"seq": offset + i},
+        )
+        for i, event_type in enumerate(event_types)
+    ]
+
+
+def _best_of(repeat: int, run: Callable[[], float]) -> float:
+    timings = []
+    for _ in range(repeat):
+        gc.collect()
+        timings.append(run())
+    return min(timings)
+
+
+def _timed(func: Callable[[], object]) -> float:
+    started = time.perf_counter()
+    func()
+    return time.perf_counter() - started
+
+
+def bench_calculate_trust_score(size: int, repeat: int, seed: int = 7) -> float:
+    events = [_Event(event_type) for event_type in _event_types(size, seed)]
+    return _best_of(repeat, lambda: _timed(lambda: calculate_trust_score(events)))
+
+
+def bench_calculate_trust_score_from_counts(size: int, repeat: int, seed: int = 7) -> float:
+    # Includes the counting, which is what GROUP BY does in the database for the real path.
+    event_types = _event_types(size, seed)
+    return _best_of(repeat, lambda: _timed(lambda: calculate_trust_score_from_counts(Counter(event_types))))
+
+
+def bench_event_record_to_schema(size: int, repeat: int, seed: int = 7) -> float:
+    event_types = _event_types(size, seed)
+
+    def run() -> float:
+        elapsed = 0.0
+        for offset in range(0, size, RECORD_CHUNK_SIZE):
+            records = _records(event_types[offset : offset + RECORD_CHUNK_SIZE], offset)
+            started = time.perf_counter()
+            for record in records:
+                event_record_to_schema(record)
+            elapsed += time.perf_counter() - started
+        return elapsed
+
+    return _best_of(repeat, run)
+
+
+def bench_encode_events_page(size: int, repeat: int, seed: int = 7) -> float:
+    event_types = _event_types(size, seed)
+
+    def run() -> float:
+        elapsed = 0.0
+        for offset in range(0, size, RECORD_CHUNK_SIZE):
+            rows = [
+                (r.id, r.event_id, r.agent_id, r.event_type, r.source, r.occurred_at, r.metadata_json)
+                for r in _records(event_types[offset : offset + RECORD_CHUNK_SIZE], offset)
+            ]
+            elapsed += _timed(lambda: encode_events_page("agent-bench", rows, None))
+        return elapsed
+
+    return _best_of(repeat, run)
+
+
+CASES: dict[str, Callable[[int, int], float]] = {
+    "calculate_trust_score": bench_calculate_trust_score,
+    "calculate_trust_score_from_counts": bench_calculate_trust_score_from_counts,
+    "event_record_to_schema": bench_event_record_to_schema,
+    "encode_events_page": bench_encode_events_page,
+}
+
+
+def run_micro(sizes: list[int], repeat: int, cases: list[str]) -> dict[str, dict[str, dict[str, float]]]:
+    results: dict[str, dict[str, dict[str, float]]] = {}
+    for name in cases:
+        results[name] = {}
+        for size in sizes:
+            seconds = CASES[name](size, repeat)
+            results[name][str(size)] = {
+                "seconds": round(seconds, 6),
+                "ns_per_event": round(seconds / size * 1e9, 2),
+                "events_per_second": round(size / seconds, 1) if seconds > 0 else 0.0,
+            }
+            print(f"{name:<36} {size:>9,} events  {seconds * 1000:>10.2f} ms  {seconds / size * 1e9:>9.1f} ns/event")
+    return results
+
+
+def _sizes(value: str) -> list[int]:
+    return [int(float(part)) for part in value.split(",") if part]
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m bench.micro", description="Scoring micro-benchmarks.")
+    parser.add_argument(
+        "--sizes", type=_sizes, default=list(DEFAULT_SIZES), help="comma-separated event counts, e.g. 1e3,1e4"
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="runs per case; the best is reported")
+    parser.add_argument("--case", action="append", choices=sorted(CASES), help="run only this case (repeatable)")
+    parser.add_argument("--no-save", action="store_true", help="print results without writing a report")
+    args = parser.parse_args(argv)
+
+    cases = args.case or list(CASES)
+    results = run_micro(args.sizes, args.repeat, cases)
+    if not args.no_save:
+        report = build_report("micro", {"sizes": args.sizes, "repeat": args.repeat, "cases": cases}, results)
+        print(f"report written to {write_report(report)}")
+
+
+if __name__ == "__main__":
+    main()
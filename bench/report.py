@@ -0,0 +1,117 @@
+"""JSON benchmark reports: latency percentiles, throughput and run-to-run comparison."""
+from __future__ import annotations
+
+import json
+import math
+import platform
+import subprocess
+import sys
+from collections.abc import Iterable, Sequence
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+# Metrics where a larger number is a regression; everything else compared is a rate.
+_LOWER_IS_BETTER = ("p50_ms", "p95_ms", "p99_ms", "mean_ms", "max_ms", "ns_per_event", "seconds")
+
+
+def percentile(sorted_values: Sequence[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted sequence."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def summarize_latencies(latencies: Iterable[float], elapsed: float, errors: int = 0) -> dict[str, float]:
+    """p50/p95/p99/mean/max in milliseconds and requests per second for latencies in seconds."""
+    values = sorted(latencies)
+    count = len(values)
+    return {
+        "requests": count,
+        "errors": errors,
+        "rps": round(count / elapsed, 2) if elapsed > 0 else 0.0,
+        "p50_ms": round(percentile(values, 50) * 1000, 3),
+        "p95_ms": round(percentile(values, 95) * 1000, 3),
+        "p99_ms": round(percentile(values, 99) * 1000, 3),
+        "mean_ms": round(sum(values) / count * 1000, 3) if count else 0.0,
+        "max_ms": round(values[-1] * 1000, 3) if count else 0.0,
+    }
+
+
+def _git_commit() -> str | None:
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True, timeout=5
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return result.stdout.strip() or None
+
+
+def build_report(kind: str, config: dict[str, Any], results: dict[str, Any]) -> dict[str, Any]:
+    return {
+        "kind": kind,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "git_commit": _git_commit(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "config": config,
+        "results": results,
+    }
+
+
+def write_report(report: dict[str, Any], out_dir: Path | None = None) -> Path:
+    out_dir = out_dir or RESULTS_DIR
+    out_dir.mkdir(parents=True, exist_ok=True)
+    stamp = datetime.fromisoformat(report["created_at"]).strftime("%Y%m%dT%H%M%SZ")
+    path = out_dir / f"{report['kind']}-{stamp}.json"
+    path.write_text(json.dumps(report, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+    return path
+
+
+def load_report(path: Path) -> dict[str, Any]:
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def _flatten(results: dict[str, Any], prefix: str = "") -> dict[str, float]:
+    flat: dict[str, float] = {}
+    for key, value in results.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(_flatten(value, f"{name}."))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            flat[name] = float(value)
+    return flat
+
+
+def compare_reports(
+    baseline: dict[str, Any], current: dict[str, Any], threshold: float = 0.1
+) -> list[tuple[str, float, float, float]]:
+    """Metrics that got worse by more than ``threshold`` (a fraction): ``(metric, baseline, current, change)``.
+
+    Latencies and per-event times regress when they grow, rates when they shrink.
+    Counters that are neither (``requests``, ``errors``, sizes) are not compared.
+    """
+    if baseline.get("kind") != current.get("kind"):
+        raise ValueError(f"cannot compare a {baseline.get('kind')} report with a {current.get('kind')} report")
+    before, after = _flatten(baseline["results"]), _flatten(current["results"])
+    regressions = []
+    for metric in sorted(before.keys() & after.keys()):
+        leaf = metric.rsplit(".", 1)[-1]
+        old, new = before[metric], after[metric]
+        if old <= 0:
+            continue
+        change = (new - old) / old
+        if leaf in _LOWER_IS_BETTER:
+            worse = change > threshold
+        elif leaf in ("rps", "events_per_second"):
+            worse = change < -threshold
+        else:
+            continue
+        if worse:
+            regressions.append((metric, old, new, change))
+    return regressions
@@ -1,14 +1,31 @@
 from __future__ import annotations
 
+from pathlib import Path
+
 import pytest
+from fastapi import FastAPI
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import Session, sessionmaker
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.pool import NullPool, StaticPool
 
-from app.db import get_db
+from app.config import settings
+from app.db import get_async_db, get_db
 from app.main import app
 from app.models import Base
+from app.routers import events, events_async, trust, trust_async
+from app.services.dedup import event_dedup
+from app.services.score_cache import score_cache
+from app.services.snapshot_writer import snapshot_writer
+
+
+@pytest.fixture(autouse=True)
+def clear_score_cache() -> None:
+    """Each test gets a fresh database, so cached scores must not leak between tests."""
+    score_cache.clear()
+    snapshot_writer.reset()
+    event_dedup.reset()
 
 
 @pytest.fixture
@@ -29,9 +46,54 @@ def client() -> TestClient:
             db.close()
 
     app.dependency_overrides[get_db] = override_get_db
+    snapshot_writer.session_factory = testing_session
+    event_dedup.session_factory = testing_session
     try:
         with TestClient(app) as test_client:
+            # The startup Bloom rebuild shares the single test connection; let it finish first.
+            event_dedup.join()
             yield test_client
     finally:
         app.dependency_overrides.clear()
+        snapshot_writer.session_factory = None
+        event_dedup.session_factory = None
         Base.metadata.drop_all(bind=engine)
+
+
+@pytest.fixture
+def async_client(tmp_path: Path) -> TestClient:
+    """Client for an app with the AsyncSession routes mounted, as with ``ASYNC_DB=true``.
+
+    Uses a file database so the sync and aiosqlite engines see the same tables.
+    """
+    db_path = tmp_path / "async.db"
+    sync_engine = create_engine(f"sqlite+pysqlite:///{db_path}")
+    Base.metadata.create_all(bind=sync_engine)
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{db_path}", poolclass=NullPool)
+    testing_async_session = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False, class_=AsyncSession)
+    testing_session = sessionmaker(bind=sync_engine, autocommit=False, autoflush=False, class_=Session)
+
+    async def override_get_async_db():
+        async with testing_async_session() as db:
+            yield db
+
+    def override_get_db():
+        db = testing_session()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    async_app = FastAPI()
+    async_app.include_router(events_async.router, prefix=settings.api_prefix)
+    async_app.include_router(trust_async.router, prefix=settings.api_prefix)
+    async_app.include_router(events.router, prefix=settings.api_prefix)
+    async_app.include_router(trust.router, prefix=settings.api_prefix)
+    async_app.dependency_overrides[get_async_db] = override_get_async_db
+    async_app.dependency_overrides[get_db] = override_get_db
+    snapshot_writer.session_factory = testing_session
+
+    with TestClient(async_app) as test_client:
+        yield test_client
+    snapshot_writer.session_factory = None
+    sync_engine.dispose()
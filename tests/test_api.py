@@ -112,6 +112,11 @@ def test_score_endpoint_persists_snapshot(client: TestClient) -> None:
     response = client.get("/v1/trust/score/agent-persist")
     assert response.status_code == 200
 
+    # Snapshots are written behind the request; wait for the queue to drain.
+    from app.services.snapshot_writer import snapshot_writer
+
+    snapshot_writer.flush()
+
     # Verify snapshot was written to DB via a direct DB query
     from sqlalchemy import select
     from app.db import get_db
@@ -149,3 +154,467 @@ def test_negative_heavy_agent_via_api(client: TestClient) -> None:
     body = response.json()
     assert body["trust_score"] == 0.0
     assert body["trust_tier"] == "restricted"
+
+
+def test_ingest_maintains_agent_score_aggregate(client: TestClient) -> None:
+    """insert_event should fold each event into the per-agent aggregate row."""
+    from app.db import get_db
+    from app.main import app
+    from app.models import AgentScoreAggregate
+
+    for i, event_type in enumerate(["human_approved_action", "policy_violation", "unknown_signal"]):
+        client.post(
+            "/v1/intake/events",
+            json={
+                "event_id": f"evt-agg-{i}",
+                "agent_id": "agent-agg",
+                "event_type": event_type,
+                "source": "test-suite",
+                "occurred_at": f"2026-02-13T14:0{i}:00Z",
+                "metadata": {},
+            },
+        )
+
+    db_gen = app.dependency_overrides[get_db]()
+    db = next(db_gen)
+    try:
+        aggregate = db.get(AgentScoreAggregate, "agent-agg")
+        assert aggregate is not None
+        assert aggregate.positive_delta == 6.0
+        assert aggregate.negative_delta == -20.0
+        assert aggregate.unknown_event_count == 1
+        assert aggregate.event_count == 3
+    finally:
+        db.close()
+
+    body = client.get("/v1/trust/score/agent-agg").json()
+    assert body["trust_score"] == 36.0
+    assert body["factors"]["unknown_event_count"] == 1.0
+
+
+def test_score_rebuilds_aggregate_when_missing_or_stale(client: TestClient, monkeypatch) -> None:
+    """A missing or outdated aggregate falls back to a full recompute and is rewritten."""
+    from app.config import settings
+    from app.db import get_db
+    from app.main import app
+    from app.models import AgentScoreAggregate
+
+    for i in range(2):
+        client.post(
+            "/v1/intake/events",
+            json={
+                "event_id": f"evt-rebuild-{i}",
+                "agent_id": "agent-rebuild",
+                "event_type": "safe_tool_usage",
+                "source": "test-suite",
+                "occurred_at": f"2026-02-13T15:0{i}:00Z",
+                "metadata": {},
+            },
+        )
+
+    db_gen = app.dependency_overrides[get_db]()
+    db = next(db_gen)
+    try:
+        db.delete(db.get(AgentScoreAggregate, "agent-rebuild"))
+        db.commit()
+
+        assert client.get("/v1/trust/score/agent-rebuild").json()["trust_score"] == 54.0
+        assert db.get(AgentScoreAggregate, "agent-rebuild", populate_existing=True).event_count == 2
+
+        monkeypatch.setattr(settings, "model_version", "v-next")
+        assert client.get("/v1/trust/score/agent-rebuild").json()["trust_score"] == 54.0
+        aggregate = db.get(AgentScoreAggregate, "agent-rebuild", populate_existing=True)
+        assert aggregate.model_version == "v-next"
+        assert aggregate.positive_delta == 4.0
+    finally:
+        db.close()
+
+
+def test_batch_ingest_reports_per_event_status(client: TestClient) -> None:
+    """Duplicates in a batch are reported per item instead of failing the whole request."""
+    client.post(
+        "/v1/intake/events",
+        json={
+            "event_id": "evt-batch-existing",
+            "agent_id": "agent-batch",
+            "event_type": "safe_tool_usage",
+            "source": "test-suite",
+            "occurred_at": "2026-02-13T16:00:00Z",
+            "metadata": {},
+        },
+    )
+
+    events = [
+        {
+            "event_id": event_id,
+            "agent_id": "agent-batch",
+            "event_type": event_type,
+            "source": "test-suite",
+            "occurred_at": f"2026-02-13T16:0{i + 1}:00Z",
+            "metadata": {"n": i},
+        }
+        for i, (event_id, event_type) in enumerate(
+            [
+                ("evt-batch-1", "human_approved_action"),
+                ("evt-batch-existing", "safe_tool_usage"),
+                ("evt-batch-2", "hallucination_detected"),
+                ("evt-batch-1", "human_approved_action"),
+            ]
+        )
+    ]
+    response = client.post("/v1/intake/events:batch", json={"events": events})
+    assert response.status_code == 200
+
+    body = response.json()
+    assert body["accepted_count"] == 2
+    assert body["duplicate_count"] == 2
+    assert [item["status"] for item in body["results"]] == ["accepted", "duplicate", "accepted", "duplicate"]
+
+    fetched = client.get("/v1/intake/events/agent-batch").json()
+    assert fetched["event_count"] == 3
+    assert fetched["events"][1]["metadata"] == {"n": 0}
+
+    # 50 + 2 + 6 - 8 = 50
+    score = client.get("/v1/trust/score/agent-batch").json()
+    assert score["trust_score"] == 50.0
+    assert score["factors"]["positive_delta"] == 8.0
+
+
+def test_retry_with_restamped_occurred_at_is_a_duplicate(client: TestClient) -> None:
+    """event_id stays unique across occurred_at values, so re-stamped retries are not counted twice."""
+    from app.services.dedup import event_dedup
+
+    def event(event_id: str, occurred_at: str) -> dict:
+        return {
+            "event_id": event_id,
+            "agent_id": "agent-restamp",
+            "event_type": "policy_violation",
+            "occurred_at": occurred_at,
+        }
+
+    assert client.post("/v1/intake/events", json=event("evt-restamp-1", "2026-02-13T16:00:00Z")).status_code == 200
+    event_dedup.reset()
+    assert client.post("/v1/intake/events", json=event("evt-restamp-1", "2026-03-20T16:00:00Z")).status_code == 409
+
+    batch = [event("evt-restamp-1", "2026-04-01T00:00:00Z"), event("evt-restamp-2", "2026-02-13T17:00:00Z")]
+    body = client.post("/v1/intake/events:batch", json={"events": batch}).json()
+    assert [item["status"] for item in body["results"]] == ["duplicate", "accepted"]
+    batch[1]["occurred_at"] = "2026-05-01T00:00:00Z"
+    assert client.post("/v1/intake/events:batch", json={"events": batch}).json()["accepted_count"] == 0
+
+    assert client.get("/v1/intake/events/agent-restamp").json()["event_count"] == 2
+    assert client.get("/v1/trust/score/agent-restamp").json()["trust_score"] == 10.0
+
+
+def test_max_batch_of_distinct_agents_stays_under_bind_parameter_limit(client: TestClient, monkeypatch) -> None:
+    """Every statement of a full batch stays well below Postgres's 65,535 bound parameters."""
+    from sqlalchemy import event as sa_event, func, select
+
+    from app.config import settings
+    from app.db import get_db
+    from app.main import app
+    from app.models import AgentScoreAggregate, ScoreJob
+    from app.schemas import MAX_BATCH_EVENTS
+    from app.store import INSERT_CHUNK_SIZE
+
+    monkeypatch.setattr(settings, "score_worker_enabled", True)
+    events = [
+        {
+            "event_id": f"evt-wide-{i}",
+            "agent_id": f"agent-wide-{i}",
+            "event_type": "safe_tool_usage",
+            "occurred_at": "2026-02-13T16:00:00Z",
+        }
+        for i in range(MAX_BATCH_EVENTS)
+    ]
+    db = next(app.dependency_overrides[get_db]())
+    engine = db.get_bind()
+    parameter_counts: list[int] = []
+
+    def record(conn, cursor, statement, parameters, context, executemany) -> None:
+        parameter_counts.append(len(parameters))
+
+    sa_event.listen(engine, "before_cursor_execute", record)
+    try:
+        response = client.post("/v1/intake/events:batch", json={"events": events})
+    finally:
+        sa_event.remove(engine, "before_cursor_execute", record)
+    assert response.status_code == 200
+    assert response.json()["accepted_count"] == MAX_BATCH_EVENTS
+    assert max(parameter_counts) <= 10 * INSERT_CHUNK_SIZE
+    try:
+        assert db.scalar(select(func.count()).select_from(AgentScoreAggregate)) == MAX_BATCH_EVENTS
+        assert db.scalar(select(func.count()).select_from(ScoreJob)) == MAX_BATCH_EVENTS
+    finally:
+        db.close()
+
+
+def test_ndjson_stream_ingest_and_export(client: TestClient, monkeypatch) -> None:
+    """NDJSON ingest inserts in chunks as lines arrive; the export streams the same events back."""
+    import json
+
+    from app.config import settings
+
+    monkeypatch.setattr(settings, "stream_chunk_size", 2)
+    events = [
+        {
+            "event_id": f"evt-stream-{i}",
+            "agent_id": "agent-stream",
+            "event_type": "safe_tool_usage",
+            "source": "test-suite",
+            "occurred_at": f"2026-02-13T17:0{i}:00+00:00",
+            "metadata": {"i": i},
+        }
+        for i in range(5)
+    ]
+    lines = [json.dumps(event) for event in events] + [json.dumps(events[0])]
+
+    def body():
+        for line in lines:
+            # Split each line across two network chunks.
+            yield line[:10].encode()
+            yield (line[10:] + "\n").encode()
+
+    response = client.post("/v1/intake/events/stream", content=body())
+    assert response.status_code == 200
+    assert response.json() == {"accepted_count": 5, "duplicate_count": 1}
+
+    export = client.get("/v1/intake/events/agent-stream/stream")
+    assert export.status_code == 200
+    assert export.headers["content-type"] == "application/x-ndjson"
+    exported = [json.loads(line) for line in export.text.splitlines()]
+    assert [event["event_id"] for event in exported] == [event["event_id"] for event in events]
+    assert exported[3]["metadata"] == {"i": 3}
+    assert client.get("/v1/trust/score/agent-stream").json()["trust_score"] == 60.0
+
+
+def test_ndjson_stream_rejects_malformed_line(client: TestClient) -> None:
+    import json
+
+    good = {
+        "event_id": "evt-stream-good",
+        "agent_id": "agent-stream-bad",
+        "event_type": "safe_tool_usage",
+        "occurred_at": "2026-02-13T17:30:00Z",
+    }
+    content = json.dumps(good) + "\n" + '{"event_id": "evt-missing-fields"}\n'
+
+    response = client.post("/v1/intake/events/stream", content=content)
+    assert response.status_code == 422
+    assert response.json()["detail"]["line"] == 2
+
+
+def test_ndjson_stream_rejects_invalid_json_and_drops_unflushed_lines(client: TestClient, monkeypatch) -> None:
+    import json
+
+    from app.config import settings
+
+    monkeypatch.setattr(settings, "stream_chunk_size", 2)
+    lines = [
+        json.dumps(
+            {
+                "event_id": f"evt-stream-json-{i}",
+                "agent_id": "agent-stream-json",
+                "event_type": "safe_tool_usage",
+                "occurred_at": "2026-02-13T17:30:00Z",
+            }
+        )
+        for i in range(3)
+    ]
+    content = "\n".join([*lines, '{"bad json', lines[0]]) + "\n"
+
+    response = client.post("/v1/intake/events/stream", content=content)
+    assert response.status_code == 422
+    detail = response.json()["detail"]
+    assert (detail["line"], detail["accepted_count"]) == (4, 2)
+    assert detail["errors"][0]["type"] == "json_invalid"
+    # The first chunk was committed; the third line was parsed but never flushed.
+    stored = client.get("/v1/intake/events/agent-stream-json").json()["events"]
+    assert [event["event_id"] for event in stored] == ["evt-stream-json-0", "evt-stream-json-1"]
+
+
+def test_event_listing_keyset_pagination_and_filters(client: TestClient) -> None:
+    """Pages follow next_cursor over (occurred_at, id); since/until/event_type narrow the window."""
+    for i in range(7):
+        client.post(
+            "/v1/intake/events",
+            json={
+                "event_id": f"evt-page-{i}",
+                "agent_id": "agent-page",
+                "event_type": "policy_violation" if i % 3 == 0 else "safe_tool_usage",
+                "source": "test-suite",
+                # Two events share a timestamp so the id tiebreak is exercised.
+                "occurred_at": f"2026-02-13T18:0{min(i, 5)}:00Z",
+                "metadata": {},
+            },
+        )
+
+    seen: list[str] = []
+    cursor = None
+    while True:
+        params = {"limit": 3}
+        if cursor:
+            params["cursor"] = cursor
+        body = client.get("/v1/intake/events/agent-page", params=params).json()
+        seen.extend(event["event_id"] for event in body["events"])
+        cursor = body["next_cursor"]
+        if cursor is None:
+            break
+    assert seen == [f"evt-page-{i}" for i in range(7)]
+
+    latest = client.get("/v1/intake/events/agent-page", params={"limit": 2, "order": "desc"}).json()
+    assert [event["event_id"] for event in latest["events"]] == ["evt-page-6", "evt-page-5"]
+
+    window = client.get(
+        "/v1/intake/events/agent-page",
+        params={"since": "2026-02-13T18:01:00Z", "until": "2026-02-13T18:05:00Z", "event_type": "policy_violation"},
+    ).json()
+    assert [event["event_id"] for event in window["events"]] == ["evt-page-3"]
+    assert window["next_cursor"] is None
+
+    assert client.get("/v1/intake/events/agent-page", params={"cursor": "not-a-cursor"}).status_code == 400
+
+
+def test_decay_model_maintains_state_on_ingest(client: TestClient, monkeypatch) -> None:
+    """With a decay model version the aggregate carries decayed sums and the score decays with age."""
+    from datetime import datetime, timedelta, timezone
+
+    from app.config import settings
+
+    monkeypatch.setattr(settings, "model_version", "v0.2-decay")
+    monkeypatch.setattr(settings, "decay_half_life_days", 1.0)
+    now = datetime.now(timezone.utc)
+
+    for i, (event_type, age_days) in enumerate([("policy_violation", 2.0), ("human_approved_action", 0.0)]):
+        client.post(
+            "/v1/intake/events",
+            json={
+                "event_id": f"evt-decay-api-{i}",
+                "agent_id": "agent-decay-api",
+                "event_type": event_type,
+                "source": "test-suite",
+                "occurred_at": (now - timedelta(days=age_days)).isoformat(),
+                "metadata": {},
+            },
+        )
+
+    body = client.get("/v1/trust/score/agent-decay-api").json()
+    assert body["model_version"] == "v0.2-decay"
+    # -20 two half-lives ago counts as -5; +6 just now counts (almost) fully.
+    assert abs(body["factors"]["negative_delta"] + 5.0) <= 0.01
+    assert abs(body["factors"]["positive_delta"] - 6.0) <= 0.01
+    assert abs(body["trust_score"] - 51.0) <= 0.02
+
+
+def test_rebuild_scores_from_grouped_counts_without_loading_events(client: TestClient) -> None:
+    import random
+
+    from sqlalchemy import event as sa_event
+
+    from app.db import get_db
+    from app.main import app
+    from app.models import AgentScoreAggregate
+    from app.services.scoring import NEGATIVE_EVENTS, POSITIVE_EVENTS, calculate_trust_score, score_from_totals
+    from app.store import get_agent_score_totals, list_agent_event_rows
+
+    rng = random.Random(21)
+    event_types = [*POSITIVE_EVENTS, *NEGATIVE_EVENTS, "unknown_signal"]
+    events = [
+        {
+            "event_id": f"evt-counts-{i}",
+            "agent_id": "agent-counts",
+            "event_type": rng.choice(event_types),
+            "occurred_at": "2026-02-13T15:00:00Z",
+            "metadata": {"payload": "x" * 100},
+        }
+        for i in range(300)
+    ]
+    assert client.post("/v1/intake/events:batch", json={"events": events}).status_code == 200
+
+    db = next(app.dependency_overrides[get_db]())
+    statements: list[str] = []
+
+    def record(conn, cursor, statement, parameters, context, executemany) -> None:
+        statements.append(statement)
+
+    try:
+        db.delete(db.get(AgentScoreAggregate, "agent-counts"))
+        db.commit()
+        sa_event.listen(db.get_bind(), "before_cursor_execute", record)
+        try:
+            totals = get_agent_score_totals(db, "agent-counts")
+        finally:
+            sa_event.remove(db.get_bind(), "before_cursor_execute", record)
+
+        rows = list_agent_event_rows(db, "agent-counts")
+        assert score_from_totals(totals) == calculate_trust_score(rows)
+        aggregate = db.get(AgentScoreAggregate, "agent-counts", populate_existing=True)
+        assert aggregate.event_count == 300
+        assert aggregate.last_event_id == max(row.id for row in rows)
+    finally:
+        db.close()
+
+    event_reads = [statement for statement in statements if "FROM events" in statement]
+    assert event_reads and all("GROUP BY" in statement and "metadata" not in statement for statement in event_reads)
+
+
+def test_event_rows_skip_the_identity_map_and_score_like_records(client: TestClient) -> None:
+    import tracemalloc
+
+    from sqlalchemy import select
+
+    from app.db import get_db
+    from app.main import app
+    from app.models import EventRecord
+    from app.services.scoring import calculate_trust_score
+    from app.store import (
+        EventRow,
+        event_record_to_schema,
+        event_row_to_schema,
+        iter_agent_event_rows,
+        list_agent_event_rows,
+    )
+
+    events = [
+        {
+            "event_id": f"evt-rows-{i}",
+            "agent_id": "agent-rows",
+            "event_type": "safe_tool_usage" if i % 4 else "hallucination_detected",
+            "occurred_at": f"2026-02-13T15:{i // 60:02d}:{i % 60:02d}Z",
+            "metadata": {"step": i},
+        }
+        for i in range(400)
+    ]
+    assert client.post("/v1/intake/events:batch", json={"events": events}).status_code == 200
+
+    def retained_bytes(load):
+        load()  # warm the statement cache
+        db.expunge_all()
+        tracemalloc.start()
+        try:
+            result = load()
+            return result, tracemalloc.get_traced_memory()[0]
+        finally:
+            tracemalloc.stop()
+
+    db = next(app.dependency_overrides[get_db]())
+    try:
+        rows, row_bytes = retained_bytes(lambda: list_agent_event_rows(db, "agent-rows"))
+        assert len(db.identity_map) == 0
+        assert isinstance(rows[0], EventRow) and rows[0].metadata == {"step": 0}
+
+        stmt = (
+            select(EventRecord)
+            .where(EventRecord.agent_id == "agent-rows")
+            .order_by(EventRecord.occurred_at, EventRecord.id)
+        )
+        records, record_bytes = retained_bytes(lambda: db.scalars(stmt).all())
+        assert row_bytes < record_bytes * 0.6
+
+        assert calculate_trust_score(rows) == calculate_trust_score(records)
+        assert [event_row_to_schema(row).model_dump_json() for row in rows] == [
+            event_record_to_schema(record).model_dump_json() for record in records
+        ]
+        assert [row for chunk in iter_agent_event_rows(db, "agent-rows", batch_size=64) for row in chunk] == rows
+    finally:
+        db.close()
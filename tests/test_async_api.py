@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+from fastapi.testclient import TestClient
+
+
+def test_async_routes_ingest_list_and_score(async_client: TestClient) -> None:
+    for i, event_type in enumerate(["human_approved_action", "hallucination_detected"]):
+        response = async_client.post(
+            "/v1/intake/events",
+            json={
+                "event_id": f"evt-async-{i}",
+                "agent_id": "agent-async",
+                "event_type": event_type,
+                "source": "test-suite",
+                "occurred_at": f"2026-02-13T19:0{i}:00Z",
+                "metadata": {"i": i},
+            },
+        )
+        assert response.status_code == 200
+
+    duplicate = async_client.post(
+        "/v1/intake/events",
+        json={
+            "event_id": "evt-async-0",
+            "agent_id": "agent-async",
+            "event_type": "human_approved_action",
+            "occurred_at": "2026-02-13T19:00:00Z",
+        },
+    )
+    assert duplicate.status_code == 409
+
+    batch = async_client.post(
+        "/v1/intake/events:batch",
+        json={
+            "events": [
+                {
+                    "event_id": "evt-async-2",
+                    "agent_id": "agent-async",
+                    "event_type": "safe_tool_usage",
+                    "occurred_at": "2026-02-13T19:02:00Z",
+                },
+                {
+                    "event_id": "evt-async-1",
+                    "agent_id": "agent-async",
+                    "event_type": "hallucination_detected",
+                    "occurred_at": "2026-02-13T19:01:00Z",
+                },
+            ]
+        },
+    ).json()
+    assert [item["status"] for item in batch["results"]] == ["accepted", "duplicate"]
+
+    page = async_client.get("/v1/intake/events/agent-async", params={"limit": 2}).json()
+    assert [event["event_id"] for event in page["events"]] == ["evt-async-0", "evt-async-1"]
+    assert page["next_cursor"] is not None
+
+    score = async_client.get("/v1/trust/score/agent-async").json()
+    # 50 + 6 - 8 + 2 = 50
+    assert score["trust_score"] == 50.0
+    assert score["factors"]["negative_delta"] == -8.0
@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import random
+
+import numpy as np
+from fastapi.testclient import TestClient
+
+from app.config import settings
+from app.db import get_db
+from app.main import app
+from app.models import AgentScoreAggregate
+from app.rescore import rescore_all_agents
+from app.services.batch_scoring import ScoreTotalsAccumulator, encode_event_types, score_agents
+from app.services.scoring import NEGATIVE_EVENTS, POSITIVE_EVENTS, calculate_trust_score
+
+
+class _Event:
+    def __init__(self, event_type: str) -> None:
+        self.event_type = event_type
+
+
+def test_vectorized_scores_match_scalar_path() -> None:
+    rng = random.Random(7)
+    event_types = [*POSITIVE_EVENTS, *NEGATIVE_EVENTS, "unknown_signal", "other_signal"]
+    agent_ids = [f"agent-{rng.randrange(40)}" for _ in range(5000)]
+    types = [rng.choice(event_types) for _ in agent_ids]
+
+    results = score_agents(agent_ids, encode_event_types(types))
+
+    assert set(results) == set(agent_ids)
+    for agent_id, result in results.items():
+        expected = calculate_trust_score([_Event(t) for a, t in zip(agent_ids, types) if a == agent_id])
+        assert result == expected
+
+
+def test_accumulator_combines_chunks_and_tracks_last_event_id() -> None:
+    accumulator = ScoreTotalsAccumulator()
+    accumulator.add(["a", "b"], encode_event_types(["safe_tool_usage", "policy_violation"]), [1, 2])
+    accumulator.add(["a"], encode_event_types(["unknown_signal"]), np.array([5]))
+
+    assert accumulator.event_counts == {"a": 2, "b": 1}
+    assert accumulator.last_event_ids == {"a": 5, "b": 2}
+    assert accumulator.totals["a"].positive_delta == 2.0
+    assert accumulator.totals["a"].unknown_events == 1.0
+    assert accumulator.results()["b"].score == 30.0
+
+
+def test_rescore_rewrites_aggregates_after_weight_change(client: TestClient, monkeypatch) -> None:
+    for i, event_type in enumerate(["safe_tool_usage", "safe_tool_usage", "policy_violation"]):
+        client.post(
+            "/v1/intake/events",
+            json={
+                "event_id": f"evt-rescore-{i}",
+                "agent_id": f"agent-rescore-{i % 2}",
+                "event_type": event_type,
+                "occurred_at": "2026-02-13T22:00:00Z",
+            },
+        )
+
+    monkeypatch.setitem(POSITIVE_EVENTS, "safe_tool_usage", 5.0)
+    monkeypatch.setattr(settings, "model_version", "v-reweighted")
+
+    db = next(app.dependency_overrides[get_db]())
+    try:
+        assert rescore_all_agents(db, chunk_size=2, write_batch_size=1) == 2
+        aggregate = db.get(AgentScoreAggregate, "agent-rescore-0", populate_existing=True)
+        assert aggregate.positive_delta == 5.0
+        assert aggregate.negative_delta == -20.0
+        assert aggregate.event_count == 2
+        assert aggregate.model_version == "v-reweighted"
+    finally:
+        db.close()
+
+    assert client.get("/v1/trust/score/agent-rescore-1").json()["trust_score"] == 55.0
+
+
+def test_vectorized_decay_matches_reference_across_chunks() -> None:
+    from datetime import datetime, timedelta, timezone
+
+    from app.schemas import EventIn
+    from app.services.scoring import calculate_decayed_trust_score
+
+    rng = random.Random(3)
+    half_life = 5 * 86400.0
+    start = datetime(2026, 3, 1, tzinfo=timezone.utc)
+    events = [
+        EventIn(
+            event_id=f"evt-{i}",
+            agent_id=f"agent-{rng.randrange(5)}",
+            event_type=rng.choice([*POSITIVE_EVENTS, *NEGATIVE_EVENTS, "unknown_signal"]),
+            occurred_at=start + timedelta(minutes=rng.randrange(60 * 24 * 30)),
+        )
+        for i in range(1000)
+    ]
+    now = start + timedelta(days=31)
+
+    accumulator = ScoreTotalsAccumulator(half_life)
+    for offset in range(0, len(events), 300):
+        chunk = events[offset : offset + 300]
+        accumulator.add(
+            [event.agent_id for event in chunk],
+            encode_event_types([event.event_type for event in chunk]),
+            list(range(offset, offset + len(chunk))),
+            [event.occurred_at for event in chunk],
+        )
+
+    for agent_id, result in accumulator.results(now).items():
+        expected = calculate_decayed_trust_score([e for e in events if e.agent_id == agent_id], now, half_life)
+        assert abs(result.score - expected.score) < 1e-6
@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from bench.micro import run_micro
+from bench.report import build_report, compare_reports, load_report, percentile, summarize_latencies, write_report
+
+
+def test_percentiles_and_rates() -> None:
+    latencies = [i / 1000 for i in range(1, 101)]
+    summary = summarize_latencies(latencies, elapsed=2.0, errors=3)
+    assert (summary["p50_ms"], summary["p95_ms"], summary["p99_ms"], summary["max_ms"]) == (50.0, 95.0, 99.0, 100.0)
+    assert summary["rps"] == 50.0
+    assert summary["errors"] == 3
+    assert percentile([], 99) == 0.0
+    assert summarize_latencies([], elapsed=1.0)["p99_ms"] == 0.0
+
+
+def test_compare_flags_slower_latency_and_lower_throughput(tmp_path: Path) -> None:
+    baseline = build_report("load", {}, {"ingest": {"requests": 100, "rps": 1000.0, "p99_ms": 10.0}})
+    current = build_report("load", {}, {"ingest": {"requests": 50, "rps": 850.0, "p99_ms": 10.5}})
+    path = write_report(current, tmp_path)
+    assert path.name.startswith("load-") and load_report(path) == current
+
+    assert [metric for metric, *_ in compare_reports(baseline, current, threshold=0.1)] == ["ingest.rps"]
+    assert compare_reports(baseline, current, threshold=0.2) == []
+    with pytest.raises(ValueError):
+        compare_reports(baseline, build_report("micro", {}, {}), threshold=0.1)
+
+
+def test_micro_benchmarks_run_at_small_sizes() -> None:
+    results = run_micro([100], repeat=1, cases=["calculate_trust_score", "event_record_to_schema"])
+    assert set(results) == {"calculate_trust_score", "event_record_to_schema"}
+    assert results["event_record_to_schema"]["100"]["events_per_second"] > 0
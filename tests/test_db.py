@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy import exc as sa_exc
+
+from app.config import settings
+from app.db import InstrumentedQueuePool, _engine_kwargs, pool_stats
+
+
+def test_instrumented_pool_records_checkouts_and_timeouts(tmp_path: Path) -> None:
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}",
+        poolclass=InstrumentedQueuePool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.05,
+    )
+    pool_stats.reset()
+    try:
+        held = engine.connect()
+        with pytest.raises(sa_exc.TimeoutError):
+            engine.connect()
+        held.close()
+        with engine.connect():
+            pass
+    finally:
+        engine.dispose()
+
+    assert pool_stats.checkouts == 2
+    assert pool_stats.timeouts == 1
+    assert pool_stats.wait_seconds_max >= 0.05
+
+
+def test_postgres_engine_kwargs_follow_pool_settings(monkeypatch) -> None:
+    monkeypatch.setattr(settings, "db_pool_size", 3)
+    monkeypatch.setattr(settings, "db_prepare_threshold", 2)
+    url = "postgresql+psycopg://user:pw@localhost/db"
+
+    kwargs = _engine_kwargs(url, InstrumentedQueuePool)
+    assert kwargs["poolclass"] is InstrumentedQueuePool
+    assert kwargs["pool_size"] == 3
+    assert kwargs["connect_args"] == {"prepare_threshold": 2}
+
+    monkeypatch.setattr(settings, "db_pgbouncer", True)
+    assert _engine_kwargs(url, InstrumentedQueuePool)["connect_args"] == {"prepare_threshold": None}
+
+    assert "poolclass" not in _engine_kwargs("sqlite+pysqlite://", InstrumentedQueuePool)
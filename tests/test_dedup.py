@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import logging
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event as sa_event
+
+from app.config import settings
+from app.db import get_db
+from app.main import app
+from app.services.dedup import BloomFilter, event_dedup
+
+
+def _event(event_id: str, occurred_at: str = "2026-02-13T22:00:00Z") -> dict[str, str]:
+    return {
+        "event_id": event_id,
+        "agent_id": "agent-dedup",
+        "event_type": "safe_tool_usage",
+        "occurred_at": occurred_at,
+    }
+
+
+@contextmanager
+def _statements() -> Iterator[list[str]]:
+    db = next(app.dependency_overrides[get_db]())
+    engine = db.get_bind()
+    db.close()
+    statements: list[str] = []
+
+    def record(conn, cursor, statement, parameters, context, executemany) -> None:
+        statements.append(statement)
+
+    sa_event.listen(engine, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        sa_event.remove(engine, "before_cursor_execute", record)
+
+
+def test_bloom_filter_has_no_false_negatives_and_bounded_false_positives() -> None:
+    bloom = BloomFilter(10_000, 0.01)
+    for i in range(10_000):
+        bloom.add(f"evt-{i}")
+    assert all(f"evt-{i}" in bloom for i in range(10_000))
+    false_positives = sum(f"other-{i}" in bloom for i in range(10_000))
+    assert false_positives < 300
+
+
+def test_retry_of_recent_event_is_rejected_without_touching_the_database(client: TestClient) -> None:
+    assert client.post("/v1/intake/events", json=_event("evt-dup-1")).status_code == 200
+
+    with _statements() as statements:
+        response = client.post("/v1/intake/events", json=_event("evt-dup-1"))
+    assert response.status_code == 409
+    assert response.json() == {"detail": "event_id 'evt-dup-1' already exists"}
+    assert statements == []
+    assert client.get("/health/dedup").json()["recent_hits"] == 1
+
+
+def test_bloom_filter_answers_duplicates_after_a_restart(client: TestClient) -> None:
+    for i in range(3):
+        assert client.post("/v1/intake/events", json=_event(f"evt-bloom-{i}")).status_code == 200
+
+    # A fresh process: the LRU is empty and the filter is rebuilt from the table.
+    event_dedup.reset()
+    db = next(app.dependency_overrides[get_db]())
+    try:
+        event_dedup.rebuild(db)
+    finally:
+        db.close()
+
+    with _statements() as statements:
+        assert client.post("/v1/intake/events", json=_event("evt-bloom-1")).status_code == 409
+    assert not [statement for statement in statements if statement.lstrip().upper().startswith("INSERT")]
+    assert client.get("/health/dedup").json()["bloom_hits"] == 1
+
+    # A Bloom false positive is cleared by the confirming read, and the event is stored.
+    with event_dedup._lock:
+        event_dedup._bloom.add("evt-bloom-new")
+    assert client.post("/v1/intake/events", json=_event("evt-bloom-new")).status_code == 200
+    stats = client.get("/health/dedup").json()
+    assert (stats["bloom_checks"], stats["bloom_hits"]) == (2, 1)
+
+
+def test_rebuild_caps_the_filter_at_the_newest_ids(client: TestClient, monkeypatch, caplog) -> None:
+    monkeypatch.setattr(settings, "dedup_bloom_capacity", 200)
+    events = [_event(f"evt-cap-{i}", f"2026-02-13T22:{i // 60:02d}:{i % 60:02d}Z") for i in range(150)]
+    assert client.post("/v1/intake/events:batch", json={"events": events}).json()["accepted_count"] == 150
+
+    event_dedup.reset()
+    db = next(app.dependency_overrides[get_db]())
+    try:
+        with caplog.at_level(logging.INFO, logger="app.services.dedup"):
+            bloom = event_dedup.rebuild(db)
+    finally:
+        db.close()
+
+    assert (bloom.capacity, bloom.count) == (200, 100)
+    assert all(f"evt-cap-{i}" in bloom for i in range(50, 150))
+    assert sum(f"evt-cap-{i}" in bloom for i in range(50)) < 10
+    assert "only the newest 100 event ids" in caplog.text
+    # An old id missing from the filter still conflicts at the INSERT.
+    assert client.post("/v1/intake/events", json=events[0]).status_code == 409
+
+
+def test_unique_constraint_stays_the_final_authority(client: TestClient) -> None:
+    assert client.post("/v1/intake/events", json=_event("evt-auth")).status_code == 200
+    event_dedup.reset()
+
+    # Unknown to both the LRU and the (empty) filter, so the INSERT runs and the constraint rejects it.
+    assert client.post("/v1/intake/events", json=_event("evt-auth")).status_code == 409
+    # Same id at another time: not an exact retry, but the unique event_id still conflicts.
+    assert client.post("/v1/intake/events", json=_event("evt-auth", "2026-02-14T00:00:00Z")).status_code == 409
+
+    with _statements() as statements:
+        assert client.post("/v1/intake/events", json=_event("evt-auth")).status_code == 409
+    assert statements == []
+    assert client.get("/v1/trust/score/agent-dedup").json()["trust_score"] == 52.0
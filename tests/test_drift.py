@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import random
+from datetime import datetime, timedelta, timezone
+
+from fastapi.testclient import TestClient
+
+from app.config import settings
+from app.models import AgentDriftState
+from app.services.drift import update_drift_state
+from app.services.scoring import ScoreResult
+from app.services.snapshot_writer import snapshot_writer
+
+
+START = datetime(2026, 3, 1, tzinfo=timezone.utc)
+
+
+def _state(agent_id: str = "agent-drift") -> AgentDriftState:
+    return AgentDriftState(
+        agent_id=agent_id, samples=0, last_score=0.0, ewma=0.0, variance=0.0, cusum_pos=0.0, cusum_neg=0.0, drift=0.0
+    )
+
+
+def test_noise_does_not_alert_but_a_sustained_shift_alerts_once() -> None:
+    rng = random.Random(3)
+    state = _state()
+    alerts = []
+    for i in range(200):
+        alert = update_drift_state(state, 70 + rng.gauss(0, 2), START + timedelta(minutes=i))
+        alerts.append(alert)
+    assert [alert for alert in alerts if alert] == []
+    assert abs(state.ewma - 70) < 2
+
+    shifted = [
+        update_drift_state(state, 55 + rng.gauss(0, 2), START + timedelta(hours=4, minutes=i)) for i in range(20)
+    ]
+    fired = [alert for alert in shifted if alert]
+    assert len(fired) == 1
+    assert fired[0].direction == "down"
+    assert fired[0].agent_id == "agent-drift"
+    assert state.alerting
+    assert state.samples == 220
+
+
+def test_alert_rearms_after_drift_subsides() -> None:
+    state = _state()
+    for i in range(10):
+        update_drift_state(state, 60.0, START + timedelta(minutes=i))
+    first = [update_drift_state(state, 80.0, START + timedelta(hours=1, minutes=i)) for i in range(5)]
+    assert [alert.direction for alert in first if alert] == ["up"]
+
+    # The mean catches up with the new level and the CUSUM decays below the threshold.
+    for i in range(100):
+        update_drift_state(state, 80.0, START + timedelta(hours=2, minutes=i))
+    assert not state.alerting
+
+    second = [update_drift_state(state, 40.0, START + timedelta(hours=4, minutes=i)) for i in range(5)]
+    assert [alert.direction for alert in second if alert] == ["down"]
+
+
+def test_drift_endpoint_ranks_agents_from_snapshots(client: TestClient, monkeypatch) -> None:
+    monkeypatch.setattr(settings, "drift_min_samples", 1)
+    monkeypatch.setattr(settings, "drift_cusum_threshold", 5.0)
+    # Repeated identical scores are not re-snapshotted, so each agent's history is short.
+    for agent_id, scores in {
+        "agent-steady": [60.0, 60.0, 60.0, 60.0, 60.0, 60.0],
+        "agent-falling": [60.0, 45.0, 35.0, 25.0],
+        "agent-rising": [60.0, 64.0, 68.0, 72.0],
+    }.items():
+        for score in scores:
+            snapshot_writer.submit(agent_id, ScoreResult(score=score, tier="watch", factors={}))
+    snapshot_writer.flush()
+
+    agents = client.get("/v1/trust/drift", params={"limit": 2}).json()["agents"]
+    assert [(agent["agent_id"], agent["direction"]) for agent in agents] == [
+        ("agent-falling", "down"),
+        ("agent-rising", "up"),
+    ]
+    assert agents[0]["samples"] == 4
+    assert agents[0]["last_score"] == 25.0
+    assert agents[0]["alerting"] is True
+    assert agents[0]["last_alert_at"] is not None
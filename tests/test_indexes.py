@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import json
+import os
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import create_engine, insert, inspect, text
+from sqlalchemy.pool import StaticPool
+
+from app.models import Base, EventRecord
+
+
+HISTORY_QUERY = "SELECT id, occurred_at, event_type FROM events WHERE agent_id = :agent_id ORDER BY occurred_at, id"
+PAGE_QUERY = (
+    "SELECT id FROM events WHERE agent_id = :agent_id AND (occurred_at, id) > (:after, 0) "
+    "ORDER BY occurred_at, id LIMIT 100"
+)
+
+
+def _seed(engine, agents: int = 20, per_agent: int = 200) -> None:
+    start = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    rows = [
+        {
+            "event_id": f"evt-idx-{agent}-{i}",
+            "agent_id": f"agent-idx-{agent}",
+            "event_type": "safe_tool_usage" if i % 3 else "policy_violation",
+            "source": "test",
+            "occurred_at": start + timedelta(minutes=i),
+            "metadata_json": {},
+        }
+        for agent in range(agents)
+        for i in range(per_agent)
+    ]
+    with engine.begin() as connection:
+        connection.execute(insert(EventRecord), rows)
+
+
+def test_events_table_has_no_redundant_indexes() -> None:
+    engine = create_engine("sqlite+pysqlite://", poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+
+    indexes = {index["name"]: index["column_names"] for index in inspect(engine).get_indexes("events")}
+    assert indexes == {"ix_events_agent_history": ["agent_id", "occurred_at", "id"]}
+    unique = inspect(engine).get_unique_constraints("events")
+    assert [constraint["column_names"] for constraint in unique] == [["event_id", "occurred_at"]]
+    # event_id alone is unique through the unpartitioned claims table.
+    assert inspect(engine).get_pk_constraint("event_ids")["constrained_columns"] == ["event_id"]
+
+
+def test_sqlite_history_and_page_queries_use_covering_index_without_sort() -> None:
+    engine = create_engine("sqlite+pysqlite://", poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    _seed(engine)
+
+    with engine.connect() as connection:
+        connection.execute(text("ANALYZE"))
+        page_plan = " ".join(
+            row[-1]
+            for row in connection.execute(
+                text(f"EXPLAIN QUERY PLAN {PAGE_QUERY}"), {"agent_id": "agent-idx-3", "after": "2026-01-01"}
+            )
+        )
+        history_plan = " ".join(
+            row[-1]
+            for row in connection.execute(text(f"EXPLAIN QUERY PLAN {HISTORY_QUERY}"), {"agent_id": "agent-idx-3"})
+        )
+
+    # SQLite has no INCLUDE, so only key-only reads are index-only there.
+    assert "USING COVERING INDEX ix_events_agent_history" in page_plan
+    assert "USING INDEX ix_events_agent_history" in history_plan
+    for plan in (page_plan, history_plan):
+        assert "TEMP B-TREE" not in plan
+
+
+def _plan_nodes(plan: dict) -> list[dict]:
+    nodes = [plan]
+    for child in plan.get("Plans", []):
+        nodes.extend(_plan_nodes(child))
+    return nodes
+
+
+@pytest.mark.skipif(
+    not os.environ.get("TEST_POSTGRES_URL"),
+    reason="set TEST_POSTGRES_URL to a scratch Postgres database to check its plans",
+)
+def test_postgres_history_query_is_an_index_only_scan() -> None:
+    engine = create_engine(os.environ["TEST_POSTGRES_URL"])
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    try:
+        _seed(engine, agents=200, per_agent=100)
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+            # Index-only scans need the visibility map to be current.
+            connection.execute(text("VACUUM ANALYZE events"))
+            raw = connection.execute(
+                text(f"EXPLAIN (FORMAT JSON) {HISTORY_QUERY}"), {"agent_id": "agent-idx-7"}
+            ).scalar()
+        plan = (json.loads(raw) if isinstance(raw, str) else raw)[0]["Plan"]
+        nodes = _plan_nodes(plan)
+
+        assert any(
+            node["Node Type"] == "Index Only Scan" and node["Index Name"] == "ix_events_agent_history" for node in nodes
+        )
+        assert all(node["Node Type"] != "Sort" for node in nodes)
+    finally:
+        Base.metadata.drop_all(engine)
+        engine.dispose()
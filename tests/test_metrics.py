@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import threading
+import time
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+
+from app.config import settings
+from app.profiling import RequestProfile, active_profile, profiler, register_current_thread
+
+
+def _sample(name: str, **labels: str) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+def test_metrics_endpoint_reports_routes_stages_ingest_and_pool(client: TestClient) -> None:
+    route = "/v1/trust/score/{agent_id}"
+    scores_before = _sample("atb_http_request_duration_seconds_count", method="GET", route=route, status="200")
+    ingested_before = _sample("atb_events_ingested_total", event_type="safe_tool_usage")
+    other_before = _sample("atb_events_ingested_total", event_type="other")
+    rebuilds_before = _sample("atb_score_rows_scanned_count", path="rebuild")
+
+    for i, event_type in enumerate(["safe_tool_usage", "safe_tool_usage", "made_up_type"]):
+        client.post(
+            "/v1/intake/events",
+            json={
+                "event_id": f"evt-metrics-{i}",
+                "agent_id": "agent-metrics",
+                "event_type": event_type,
+                "occurred_at": "2026-02-13T22:00:00Z",
+            },
+        )
+    # A duplicate is rejected and not counted.
+    client.post(
+        "/v1/intake/events",
+        json={
+            "event_id": "evt-metrics-0",
+            "agent_id": "agent-metrics",
+            "event_type": "safe_tool_usage",
+            "occurred_at": "2026-02-13T22:00:00Z",
+        },
+    )
+    client.get("/v1/trust/score/agent-metrics")
+    client.get("/v1/trust/score/agent-unknown")
+    client.get("/no/such/path")
+
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert 'atb_stage_duration_seconds_count{stage="store.get_agent_score"}' in response.text
+    assert 'atb_stage_duration_seconds_count{stage="scoring.score_from_totals"}' in response.text
+    assert "atb_db_pool_checkouts_total" in response.text
+
+    assert _sample("atb_http_request_duration_seconds_count", method="GET", route=route, status="200") == (
+        scores_before + 2
+    )
+    assert _sample("atb_http_request_duration_seconds_count", method="GET", route="unmatched", status="404") >= 1
+    assert _sample("atb_events_ingested_total", event_type="safe_tool_usage") == ingested_before + 2
+    assert _sample("atb_events_ingested_total", event_type="other") == other_before + 1
+    # agent-metrics is read from the aggregate ingest maintains; agent-unknown has none and is rebuilt.
+    assert _sample("atb_score_rows_scanned_count", path="rebuild") == rebuilds_before + 1
+    assert _sample("atb_score_rows_scanned_sum", path="aggregate") >= 1
+
+
+def test_batch_ingest_counts_only_new_events(client: TestClient) -> None:
+    before = _sample("atb_events_ingested_total", event_type="policy_violation")
+    events = [
+        {
+            "event_id": f"evt-metrics-batch-{i % 3}",
+            "agent_id": "agent-metrics-batch",
+            "event_type": "policy_violation",
+            "occurred_at": "2026-02-13T22:00:00Z",
+        }
+        for i in range(5)
+    ]
+    client.post("/v1/intake/events:batch", json={"events": events})
+    assert _sample("atb_events_ingested_total", event_type="policy_violation") == before + 3
+
+
+def _slow_stage(seconds: float) -> None:
+    register_current_thread()
+    time.sleep(seconds)
+
+
+def test_slow_request_profile_is_written_as_folded_stacks(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setattr(settings, "profile_slow_request_seconds", 0.05)
+    monkeypatch.setattr(settings, "profile_interval_seconds", 0.002)
+    monkeypatch.setattr(settings, "profile_dir", str(tmp_path))
+
+    fast = profiler.begin()
+    assert profiler.end(fast, "GET /fast") is None
+
+    profile = profiler.begin()
+
+    def handler(target: RequestProfile) -> None:
+        active_profile.set(target)
+        _slow_stage(0.1)
+
+    worker = threading.Thread(target=handler, args=(profile,))
+    worker.start()
+    worker.join()
+    path = profiler.end(profile, "GET /v1/trust/score/{agent_id}")
+
+    assert path is not None and path.parent == tmp_path
+    assert path.name.endswith("ms.folded") and "-GET-v1-trust-score-agent-id-" in path.name
+    lines = path.read_text(encoding="utf-8").splitlines()
+    assert lines
+    assert any(":handler:" in line and ":_slow_stage:" in line for line in lines)
+    assert all(line.rsplit(" ", 1)[1].isdigit() for line in lines)
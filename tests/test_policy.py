@@ -0,0 +1,189 @@
+from __future__ import annotations
+
+import json
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.services.policy import PolicyContext, PolicyError, compile_policy, load_policy, set_policy
+
+
+POLICY = {
+    "name": "gateway",
+    "default": "allow",
+    "rules": [
+        {
+            "name": "recent-leak",
+            "decision": "block",
+            "when": {"window_count": {"window": "24h", "event_types": ["sensitive_data_leak_attempt"], "gte": 1}},
+        },
+        {
+            "name": "prod-unsafe-tool",
+            "decision": "review",
+            "when": {
+                "all": [
+                    {"event_type": {"in": ["unsafe_tool_call", "shell_exec"]}},
+                    {"metadata": {"path": "target.env", "eq": "prod"}},
+                ]
+            },
+        },
+        {"name": "low-trust", "decision": "block", "when": {"score": {"lt": 40}}},
+        {"name": "busy-week", "decision": "review", "when": {"window_count": {"window": "7d", "gt": 3}}},
+    ],
+}
+
+
+@pytest.fixture(autouse=True)
+def reset_policy():
+    yield
+    set_policy(None)
+
+
+def test_compiled_policy_first_match_wins() -> None:
+    policy = compile_policy(POLICY)
+    assert set(policy.windows) == {"24h", "7d"}
+
+    quiet = {"24h": {}, "7d": {"safe_tool_usage": 2}}
+    assert policy.evaluate(PolicyContext(score=70.0, tier="medium", window_counts=quiet)) == ("allow", None)
+    assert policy.evaluate(PolicyContext(score=30.0, tier="restricted", window_counts=quiet)) == ("block", "low-trust")
+
+    prod_call = PolicyContext(
+        score=30.0,
+        tier="restricted",
+        window_counts=quiet,
+        event_type="shell_exec",
+        metadata={"target": {"env": "prod"}},
+    )
+    assert policy.evaluate(prod_call) == ("review", "prod-unsafe-tool")
+
+    leaked = {"24h": {"sensitive_data_leak_attempt": 1}, "7d": {"sensitive_data_leak_attempt": 1}}
+    assert policy.evaluate(PolicyContext(score=90.0, tier="high", window_counts=leaked)) == ("block", "recent-leak")
+
+
+def test_metadata_predicates_handle_missing_and_mistyped_values() -> None:
+    policy = compile_policy(
+        {
+            "rules": [
+                {"decision": "block", "when": {"metadata": {"path": "cost.usd", "gt": 100}}},
+                {"decision": "review", "when": {"not": {"metadata": {"path": "ticket", "exists": True}}}},
+            ]
+        }
+    )
+    assert policy.evaluate(PolicyContext(50.0, "watch", metadata={"cost": {"usd": 250}})) == ("block", "rules[0]")
+    assert policy.evaluate(PolicyContext(50.0, "watch", metadata={"cost": "lots"})) == ("review", "rules[1]")
+    assert policy.evaluate(PolicyContext(50.0, "watch", metadata={"cost": {"usd": "n/a"}, "ticket": "T-1"})) == (
+        "allow",
+        None,
+    )
+
+
+@pytest.mark.parametrize(
+    "document",
+    [
+        {"default": "maybe"},
+        {"rules": [{"decision": "deny", "when": {"score": {"lt": 1}}}]},
+        {"rules": [{"decision": "block"}]},
+        {"rules": [{"decision": "block", "when": {"score": {"below": 1}}}]},
+        {"rules": [{"decision": "block", "when": {"score": {"lt": 1}, "tier": {"eq": "watch"}}}]},
+        {"rules": [{"decision": "block", "when": {"window_count": {"window": "fortnight", "gt": 1}}}]},
+        {"rules": [{"decision": "block", "when": {"metadata": {"eq": 1}}}]},
+        {"rules": [{"decision": "block", "when": {"any": []}}]},
+        {"rules": [{"decision": "block", "when": {"metadata": {"path": "tags", "in": [["a"], "b"]}}}]},
+    ],
+)
+def test_invalid_policies_are_rejected_at_compile_time(document: dict) -> None:
+    with pytest.raises(PolicyError):
+        compile_policy(document)
+
+
+def test_compiled_evaluation_is_well_under_a_millisecond() -> None:
+    policy = compile_policy(POLICY)
+    context = PolicyContext(
+        score=65.0,
+        tier="medium",
+        window_counts={"24h": {"safe_tool_usage": 4}, "7d": {"safe_tool_usage": 3}},
+        event_type="unsafe_tool_call",
+        metadata={"target": {"env": "staging"}},
+    )
+    timings = []
+    for _ in range(2000):
+        started = time.perf_counter()
+        policy.evaluate(context)
+        timings.append(time.perf_counter() - started)
+    timings.sort()
+    assert timings[int(len(timings) * 0.99)] < 0.001
+
+
+def test_decide_endpoint_uses_default_tier_policy(client: TestClient) -> None:
+    for i in range(2):
+        client.post(
+            "/v1/intake/events",
+            json={
+                "event_id": f"evt-policy-{i}",
+                "agent_id": "agent-policy",
+                "event_type": "unsafe_tool_call",
+                "occurred_at": "2026-02-13T22:00:00Z",
+            },
+        )
+
+    response = client.post("/v1/policy/decide", json={"agent_id": "agent-policy"})
+    assert response.status_code == 200
+    assert response.json() == {
+        "agent_id": "agent-policy",
+        "decision": "block",
+        "rule": "restricted-tier",
+        "policy": "tiers",
+        "trust_score": 20.0,
+        "trust_tier": "restricted",
+    }
+    # New agents start at 50, in the watch tier.
+    assert client.post("/v1/policy/decide", json={"agent_id": "agent-new"}).json()["rule"] == "watch-tier"
+
+
+def test_decide_endpoint_with_loaded_rules_reads_windows(client: TestClient, tmp_path: Path) -> None:
+    path = tmp_path / "policy.json"
+    path.write_text(json.dumps(POLICY), encoding="utf-8")
+    set_policy(load_policy(path))
+
+    client.post(
+        "/v1/intake/events",
+        json={
+            "event_id": "evt-policy-leak",
+            "agent_id": "agent-leaky",
+            "event_type": "sensitive_data_leak_attempt",
+            "occurred_at": (datetime.now(timezone.utc) - timedelta(hours=1)).isoformat(),
+        },
+    )
+
+    body = client.post("/v1/policy/decide", json={"agent_id": "agent-leaky"}).json()
+    assert (body["decision"], body["rule"], body["policy"]) == ("block", "recent-leak", "gateway")
+
+    body = client.post(
+        "/v1/policy/decide",
+        json={"agent_id": "agent-clean", "event_type": "shell_exec", "metadata": {"target": {"env": "prod"}}},
+    ).json()
+    assert (body["decision"], body["rule"]) == ("review", "prod-unsafe-tool")
+
+
+def test_decide_endpoint_membership_tolerates_unhashable_metadata(client: TestClient) -> None:
+    set_policy(
+        compile_policy(
+            {
+                "rules": [
+                    {"name": "bad-env", "decision": "block", "when": {"metadata": {"path": "env", "in": ["prod"]}}},
+                    {"name": "odd-env", "decision": "review", "when": {"metadata": {"path": "env", "not_in": ["dev"]}}},
+                ]
+            }
+        )
+    )
+
+    response = client.post("/v1/policy/decide", json={"agent_id": "agent-tags", "metadata": {"env": ["prod"]}})
+    assert response.status_code == 200
+    assert (response.json()["decision"], response.json()["rule"]) == ("review", "odd-env")
+    body = client.post("/v1/policy/decide", json={"agent_id": "agent-tags", "metadata": {"env": {"k": 1}}}).json()
+    assert body["rule"] == "odd-env"
+    body = client.post("/v1/policy/decide", json={"agent_id": "agent-tags", "metadata": {"env": "prod"}}).json()
+    assert body["rule"] == "bad-env"
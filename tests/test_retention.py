@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import random
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import func, select
+
+from app.config import settings
+from app.db import get_db
+from app.main import app
+from app.models import AgentScoreAggregate, EventIdRecord, EventRecord
+from app.rescore import rescore_all_agents
+from app.retention import apply_retention, retention_watermark
+from app.store import get_compacted_before, rebuild_agent_score_aggregate
+
+
+NOW = datetime(2026, 6, 18, 9, 30, tzinfo=timezone.utc)
+
+
+def _ingest_history(client: TestClient) -> None:
+    rng = random.Random(13)
+    events = [
+        {
+            "event_id": f"evt-ret-{i}",
+            "agent_id": f"agent-ret-{i % 3}",
+            "event_type": rng.choice(["policy_violation", "safe_tool_usage", "task_success", "unknown_signal"]),
+            "occurred_at": (NOW - timedelta(minutes=rng.randrange(60 * 24 * 150))).isoformat(),
+        }
+        for i in range(600)
+    ]
+    response = client.post("/v1/intake/events:batch", json={"events": events})
+    assert response.status_code == 200
+
+
+def _aggregate_rows(db) -> dict[str, tuple]:
+    return {
+        row.agent_id: (row.positive_delta, row.negative_delta, row.unknown_event_count, row.event_count)
+        for row in db.scalars(select(AgentScoreAggregate).execution_options(populate_existing=True))
+    }
+
+
+def test_watermark_is_month_aligned_and_outlives_scoring_windows() -> None:
+    assert retention_watermark(NOW, 60) == datetime(2026, 4, 1, tzinfo=timezone.utc)
+    with pytest.raises(ValueError):
+        retention_watermark(NOW, 30)
+
+
+def test_scores_are_unchanged_by_compaction(client: TestClient) -> None:
+    _ingest_history(client)
+    scores = {agent: client.get(f"/v1/trust/score/{agent}").json() for agent in ("agent-ret-0", "agent-ret-1")}
+
+    db = next(app.dependency_overrides[get_db]())
+    try:
+        before = _aggregate_rows(db)
+        result = apply_retention(db, now=NOW, retention_days=60)
+
+        assert result.watermark == get_compacted_before(db) == datetime(2026, 4, 1, tzinfo=timezone.utc)
+        assert result.deleted_events > 0
+        oldest = db.scalar(select(func.min(EventRecord.occurred_at)))
+        assert oldest.replace(tzinfo=timezone.utc) >= result.watermark
+        # Compacted events give up their id claims; kept events keep theirs.
+        assert result.released_event_ids == result.deleted_events
+        assert db.scalar(select(func.count()).select_from(EventIdRecord)) == db.scalar(
+            select(func.count()).select_from(EventRecord)
+        )
+
+        for agent_id in before:
+            rebuild_agent_score_aggregate(db, agent_id)
+        assert _aggregate_rows(db) == before
+
+        rescore_all_agents(db, chunk_size=50)
+        assert _aggregate_rows(db) == before
+
+        # Rerunning is a no-op.
+        assert apply_retention(db, now=NOW, retention_days=60).deleted_events == 0
+    finally:
+        db.close()
+
+    for agent, score in scores.items():
+        assert client.get(f"/v1/trust/score/{agent}").json()["trust_score"] == score["trust_score"]
+
+
+def test_decay_rebuild_after_compaction_stays_close(client: TestClient, monkeypatch) -> None:
+    monkeypatch.setattr(settings, "model_version", "v0.2-decay")
+    _ingest_history(client)
+
+    db = next(app.dependency_overrides[get_db]())
+    try:
+        before = rebuild_agent_score_aggregate(db, "agent-ret-2")
+        apply_retention(db, now=NOW, retention_days=60)
+        after = rebuild_agent_score_aggregate(db, "agent-ret-2")
+    finally:
+        db.close()
+
+    # Compacted events are dated at the middle of their day, so at most half a day off.
+    tolerance = 1 - 2 ** (-0.5 / settings.decay_half_life_days)
+    expected = before.decay.value_at(NOW, before.half_life_seconds)
+    actual = after.decay.value_at(NOW, after.half_life_seconds)
+    for old, new in zip(expected, actual):
+        assert new == pytest.approx(old, rel=tolerance, abs=1e-9)
+    assert after.positive_delta == before.positive_delta
+
+
+def test_partition_upkeep_runs_even_with_retention_disabled(monkeypatch) -> None:
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+
+    from app import retention
+
+    upkeep = []
+    monkeypatch.setattr(retention, "get_session_factory", lambda: sessionmaker(bind=create_engine("sqlite://")))
+    monkeypatch.setattr(retention, "maintain_event_partitions", lambda db: upkeep.append(db) or ["events_p202607"])
+    monkeypatch.setattr(retention, "apply_retention", lambda *args, **kwargs: pytest.fail("retention is disabled"))
+
+    retention.main(["--retention-days", "0"])
+    retention.main(["--ensure-partitions", "--retention-days", "90"])
+    assert len(upkeep) == 2
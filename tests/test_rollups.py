@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import random
+from datetime import datetime, timedelta, timezone
+
+from fastapi.testclient import TestClient
+
+from app.db import get_db
+from app.main import app
+from app.store import count_events_in_window
+
+
+def _ingest_batch(client: TestClient, events: list[dict]) -> None:
+    for offset in range(0, len(events), 500):
+        response = client.post("/v1/intake/events:batch", json={"events": events[offset : offset + 500]})
+        assert response.status_code == 200
+
+
+def test_window_counts_from_rollups_match_raw_events(client: TestClient) -> None:
+    rng = random.Random(5)
+    now = datetime(2026, 3, 15, 13, 37, tzinfo=timezone.utc)
+    events = [
+        {
+            "event_id": f"evt-roll-{i}",
+            "agent_id": "agent-roll",
+            "event_type": rng.choice(["policy_violation", "safe_tool_usage"]),
+            "occurred_at": (now - timedelta(minutes=rng.randrange(60 * 24 * 40))).isoformat(),
+        }
+        for i in range(2000)
+    ]
+    _ingest_batch(client, events)
+
+    db = next(app.dependency_overrides[get_db]())
+    try:
+        for since, until in [
+            (now - timedelta(days=30), now),
+            (now - timedelta(days=7, hours=5), now - timedelta(days=1)),
+            (now - timedelta(hours=20), now),
+        ]:
+            expected: dict[str, int] = {}
+            since_hour = since.replace(minute=0, second=0, microsecond=0)
+            for event in events:
+                occurred_at = datetime.fromisoformat(event["occurred_at"])
+                if since_hour <= occurred_at and occurred_at.replace(minute=0, second=0) <= until:
+                    expected[event["event_type"]] = expected.get(event["event_type"], 0) + 1
+            assert count_events_in_window(db, "agent-roll", since, until) == expected
+    finally:
+        db.close()
+
+
+def test_windows_endpoint_reports_counts_and_weighted_sums(client: TestClient) -> None:
+    now = datetime.now(timezone.utc)
+    _ingest_batch(
+        client,
+        [
+            {
+                "event_id": f"evt-win-{i}",
+                "agent_id": "agent-win",
+                "event_type": event_type,
+                "occurred_at": (now - age).isoformat(),
+            }
+            for i, (event_type, age) in enumerate(
+                [
+                    ("policy_violation", timedelta(hours=2)),
+                    ("policy_violation", timedelta(days=3)),
+                    ("safe_tool_usage", timedelta(days=20)),
+                    ("policy_violation", timedelta(days=45)),
+                ]
+            )
+        ],
+    )
+
+    windows = client.get("/v1/trust/windows/agent-win").json()["windows"]
+    assert windows["24h"] == {"event_counts": {"policy_violation": 1}, "weighted_sum": -20.0}
+    assert windows["7d"]["event_counts"] == {"policy_violation": 2}
+    assert windows["30d"] == {"event_counts": {"policy_violation": 2, "safe_tool_usage": 1}, "weighted_sum": -38.0}
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import time
+
+from fastapi.testclient import TestClient
+
+from app.services.score_cache import LocalScoreCacheBackend, score_cache
+from app.services.scoring import ScoreResult
+
+
+def _result(score: float) -> ScoreResult:
+    return ScoreResult(score=score, tier="watch", factors={})
+
+
+def test_local_backend_evicts_least_recently_used_agent() -> None:
+    backend = LocalScoreCacheBackend(max_entries=2, ttl_seconds=60)
+    started_at = time.time()
+    backend.set("a", "v1", _result(1), started_at)
+    backend.set("b", "v1", _result(2), started_at)
+    assert backend.get("a", "v1") is not None
+    backend.set("c", "v1", _result(3), started_at)
+
+    assert backend.get("b", "v1") is None
+    assert backend.get("a", "v1").score == 1
+    assert backend.get("c", "v1").score == 3
+    assert backend.get("a", "v2") is None
+
+
+def test_local_backend_expires_entries_after_ttl() -> None:
+    backend = LocalScoreCacheBackend(max_entries=10, ttl_seconds=0.01)
+    backend.set("a", "v1", _result(1), time.time())
+    time.sleep(0.02)
+    assert backend.get("a", "v1") is None
+
+
+def test_local_backend_drops_results_computed_before_an_invalidation() -> None:
+    backend = LocalScoreCacheBackend(max_entries=10, ttl_seconds=60)
+    started_at = time.time()
+    backend.invalidate(["a"])
+    backend.set("a", "v1", _result(1), started_at)
+    assert backend.get("a", "v1") is None
+
+    backend.set("a", "v1", _result(2), time.time() + 1)
+    assert backend.get("a", "v1").score == 2
+
+
+def test_score_endpoint_serves_repeat_reads_from_cache(client: TestClient) -> None:
+    def ingest(event_id: str, event_type: str) -> None:
+        client.post(
+            "/v1/intake/events",
+            json={
+                "event_id": event_id,
+                "agent_id": "agent-cached",
+                "event_type": event_type,
+                "occurred_at": "2026-02-13T20:00:00Z",
+            },
+        )
+
+    ingest("evt-cache-1", "safe_tool_usage")
+    assert client.get("/v1/trust/score/agent-cached").json()["trust_score"] == 52.0
+    assert client.get("/v1/trust/score/agent-cached").json()["trust_score"] == 52.0
+    assert (score_cache.hits, score_cache.misses) == (1, 1)
+
+    ingest("evt-cache-2", "human_approved_action")
+    assert client.get("/v1/trust/score/agent-cached").json()["trust_score"] == 58.0
+    assert client.get("/health/cache").json() == {"hits": 1, "misses": 2, "hit_ratio": 0.3333}
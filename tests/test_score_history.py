@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import random
+from datetime import datetime, timedelta, timezone
+
+from fastapi.testclient import TestClient
+from sqlalchemy import insert, text
+
+from app.db import get_db
+from app.main import app
+from app.models import ScoreSnapshot
+from app.services.downsampling import downsample_scores
+
+
+START = datetime(2026, 5, 1, tzinfo=timezone.utc)
+
+
+def _seed(count: int) -> list[tuple[datetime, float, str]]:
+    rng = random.Random(11)
+    rows = sorted(
+        (START + timedelta(seconds=rng.randrange(86400)), round(rng.uniform(20, 90), 1), rng.choice(["watch", "high"]))
+        for _ in range(count)
+    )
+    db = next(app.dependency_overrides[get_db]())
+    try:
+        db.execute(
+            insert(ScoreSnapshot),
+            [
+                {"agent_id": agent_id, "computed_at": at, "score": score, "tier": tier, "factors": {}}
+                for agent_id in ("agent-hist", "agent-other")
+                for at, score, tier in rows
+            ],
+        )
+        db.commit()
+    finally:
+        db.close()
+    return rows
+
+
+def test_downsampling_keeps_extremes_and_last_value() -> None:
+    rows = [
+        (START + timedelta(minutes=1), 50.0, "watch"),
+        (START + timedelta(minutes=2), 10.0, "restricted"),
+        (START + timedelta(minutes=3), 55.0, "watch"),
+        (START + timedelta(minutes=45), 70.0, "medium"),
+    ]
+    buckets = list(downsample_scores(rows, START, START + timedelta(hours=1), 2))
+
+    assert [(b.bucket_start, b.min, b.max, b.last, b.tier, b.count) for b in buckets] == [
+        (START, 10.0, 55.0, 55.0, "watch", 3),
+        (START + timedelta(minutes=30), 70.0, 70.0, 70.0, "medium", 1),
+    ]
+    assert list(downsample_scores(rows, START, START, 10)) == []
+
+
+def test_history_endpoint_returns_bounded_buckets(client: TestClient) -> None:
+    rows = _seed(3000)
+
+    response = client.get(
+        "/v1/trust/score/agent-hist/history",
+        params={"since": START.isoformat(), "until": (START + timedelta(days=1)).isoformat(), "points": 24},
+    )
+    assert response.status_code == 200
+    points = response.json()["points"]
+    assert len(points) == 24
+    assert sum(point["count"] for point in points) == 3000
+
+    for hour, point in enumerate(points):
+        in_hour = [score for at, score, _ in rows if at.hour == hour]
+        assert datetime.fromisoformat(point["bucket_start"]) == START + timedelta(hours=hour)
+        assert (point["min"], point["max"], point["last"]) == (min(in_hour), max(in_hour), in_hour[-1])
+
+
+def test_history_endpoint_validates_range(client: TestClient) -> None:
+    assert client.get("/v1/trust/score/agent-hist/history").json()["points"] == []
+    response = client.get(
+        "/v1/trust/score/agent-hist/history",
+        params={"since": START.isoformat(), "until": START.isoformat()},
+    )
+    assert response.status_code == 400
+    assert client.get("/v1/trust/score/agent-hist/history", params={"points": 0}).status_code == 422
+
+
+def test_history_query_uses_agent_time_index(client: TestClient) -> None:
+    db = next(app.dependency_overrides[get_db]())
+    try:
+        plan = " ".join(
+            row[-1]
+            for row in db.execute(
+                text(
+                    "EXPLAIN QUERY PLAN SELECT computed_at, score, tier FROM score_history "
+                    "WHERE agent_id = 'a' AND computed_at >= '2026-01-01' AND computed_at < '2026-02-01' "
+                    "ORDER BY computed_at"
+                )
+            )
+        )
+    finally:
+        db.close()
+    assert "ix_score_history_agent_id_computed_at" in plan
+    assert "TEMP B-TREE" not in plan
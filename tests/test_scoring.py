@@ -73,3 +73,103 @@ def test_scoring_tier_boundaries() -> None:
     result = calculate_trust_score(events)
     assert result.score == 80.0
     assert result.tier == "high"
+
+
+def test_decay_state_matches_brute_force_reference() -> None:
+    """Incremental O(1) decay updates, in any arrival order, match direct re-weighting."""
+    import random
+    from datetime import timedelta
+
+    from app.services.scoring import (
+        DecayState,
+        ScoreTotals,
+        calculate_decayed_trust_score,
+        score_from_totals,
+    )
+
+    rng = random.Random(11)
+    half_life = 7 * 86400.0
+    start = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    event_types = ["human_approved_action", "policy_violation", "safe_tool_usage", "unknown_signal"]
+    events = [
+        EventIn(
+            event_id=f"evt-decay-{i}",
+            agent_id="agent-decay",
+            event_type=rng.choice(event_types),
+            occurred_at=start + timedelta(hours=rng.randrange(24 * 60)),
+        )
+        for i in range(300)
+    ]
+    now = start + timedelta(days=75)
+    expected = calculate_decayed_trust_score(events, now, half_life)
+
+    state = DecayState()
+    for event in events:  # arrival order is not time order
+        state.add(event.event_type, event.occurred_at, half_life)
+    unknown = float(sum(event.event_type == "unknown_signal" for event in events))
+    result = score_from_totals(ScoreTotals(unknown_events=unknown, decay=state, half_life_seconds=half_life), now)
+
+    assert abs(result.score - expected.score) < 1e-6
+    assert abs(result.factors["positive_delta"] - expected.factors["positive_delta"]) <= 0.01
+    assert abs(result.factors["negative_delta"] - expected.factors["negative_delta"]) <= 0.01
+    assert result.factors["half_life_days"] == 7.0
+
+
+def test_decay_state_clamps_future_dated_events_to_ingest_time(monkeypatch) -> None:
+    from datetime import timedelta
+
+    from app.services import scoring
+    from app.services.scoring import (
+        ScoreTotals,
+        accumulate_decay_state,
+        calculate_decayed_trust_score,
+        score_from_totals,
+    )
+
+    now = datetime(2026, 3, 1, tzinfo=timezone.utc)
+
+    class Frozen(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return now
+
+    monkeypatch.setattr(scoring, "datetime", Frozen)
+    half_life = 86400.0
+    day = timedelta(days=1)
+    events = [
+        EventIn(event_id="evt-past", agent_id="agent-f", event_type="policy_violation", occurred_at=now - day),
+        EventIn(event_id="evt-next", agent_id="agent-f", event_type="safe_tool_usage", occurred_at=now + 3 * day),
+    ]
+    expected = calculate_decayed_trust_score(events, now, half_life)
+
+    state = accumulate_decay_state(events, half_life)
+    assert state.reference_at == now
+    result = score_from_totals(ScoreTotals(decay=state, half_life_seconds=half_life), now)
+    assert abs(result.factors["negative_delta"] - expected.factors["negative_delta"]) <= 0.01
+    assert abs(result.score - expected.score) < 1e-6
+
+
+def test_decay_halves_event_weight_after_one_half_life() -> None:
+    from datetime import timedelta
+
+    from app.services.scoring import calculate_decayed_trust_score
+
+    occurred_at = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    event = EventIn(event_id="evt-h", agent_id="agent-h", event_type="policy_violation", occurred_at=occurred_at)
+    result = calculate_decayed_trust_score([event], occurred_at + timedelta(days=30), 30 * 86400.0)
+    assert result.factors["negative_delta"] == -10.0
+    assert result.score == 40.0
+
+
+def test_counts_based_scoring_matches_event_path() -> None:
+    import random
+    from collections import Counter
+
+    from app.services.scoring import NEGATIVE_EVENTS, POSITIVE_EVENTS, calculate_trust_score_from_counts
+
+    rng = random.Random(20)
+    event_types = [*POSITIVE_EVENTS, *NEGATIVE_EVENTS, "unknown_signal"]
+    for size in (0, 1, 7, 50, 400):
+        events = [_event(f"evt-{i}", rng.choice(event_types)) for i in range(size)]
+        counts = Counter(event.event_type for event in events)
+        assert calculate_trust_score_from_counts(counts) == calculate_trust_score(events)
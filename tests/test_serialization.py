@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi.responses import JSONResponse
+from fastapi.testclient import TestClient
+
+from app.models import EventRecord
+from app.schemas import AgentEventsResponse
+from app.services.serialization import encode_events_page
+from app.store import event_record_to_schema
+
+
+METADATA = [
+    {},
+    {"tool": "search", "cost": {"usd": 0.25, "tokens": 1200}, "ok": True, "note": None},
+    {"text": "naïve café ✓ 𝄞   \x00 \"quoted\" back\\slash\n", "tags": ["a", "b"]},
+    {"tiny": 1e-07, "huge": 1e16, "neg": -2.5e-300, "zero": -0.0},
+    {"bigint": 2**70, "nested": [[{"x": [1, 2, {"y": 3}]}]]},
+    {"sha": "9e4f2e1c", "v": "1E3"},
+]
+
+TIMESTAMPS = [
+    datetime(2026, 2, 13, 22, 0, tzinfo=timezone.utc),
+    datetime(2026, 2, 13, 22, 0, 0, 123000, tzinfo=timezone.utc),
+    datetime(2026, 2, 13, 22, 0, 0, 5),
+    datetime(2026, 2, 13, 22, 0, tzinfo=timezone(timedelta(hours=-5, minutes=-30))),
+]
+
+
+def _model_bytes(agent_id: str, records: list[EventRecord], next_cursor: str | None) -> bytes:
+    events = [event_record_to_schema(record) for record in records]
+    response = AgentEventsResponse(agent_id=agent_id, event_count=len(events), events=events, next_cursor=next_cursor)
+    return JSONResponse(response.model_dump(mode="json")).body
+
+
+@pytest.mark.parametrize("next_cursor", [None, "WyIyMDI2LTAyLTEzVDIyOjAwOjAwIiwgMV0="])
+def test_encoded_page_is_byte_identical_to_model_path(next_cursor: str | None) -> None:
+    records = [
+        EventRecord(
+            id=i,
+            event_id=f"evt-é-{i}",
+            agent_id="agent-ünicode",
+            event_type="safe_tool_usage",
+            source="runtime",
+            occurred_at=TIMESTAMPS[i % len(TIMESTAMPS)],
+            metadata_json=metadata,
+        )
+        for i, metadata in enumerate(METADATA * 2)
+    ]
+    rows = [
+        (r.id, r.event_id, r.agent_id, r.event_type, r.source, r.occurred_at, r.metadata_json) for r in records
+    ]
+    expected = _model_bytes("agent-ünicode", records, next_cursor)
+    assert encode_events_page("agent-ünicode", rows, next_cursor) == expected
+    assert encode_events_page("agent-empty", [], next_cursor) == _model_bytes("agent-empty", [], next_cursor)
+
+
+def test_list_endpoint_pages_match_model_encoding(client: TestClient) -> None:
+    for i, metadata in enumerate(METADATA):
+        client.post(
+            "/v1/intake/events",
+            json={
+                "event_id": f"evt-ser-{i}",
+                "agent_id": "agent-ser",
+                "event_type": "safe_tool_usage",
+                "occurred_at": f"2026-02-13T22:00:0{i}Z",
+                "metadata": metadata,
+            },
+        )
+
+    first = client.get("/v1/intake/events/agent-ser", params={"limit": 4})
+    assert first.headers["content-type"] == "application/json"
+    body = first.json()
+    assert [event["event_id"] for event in body["events"]] == [f"evt-ser-{i}" for i in range(4)]
+    assert body["events"][3]["metadata"] == METADATA[3]
+
+    second = client.get("/v1/intake/events/agent-ser", params={"limit": 4, "cursor": body["next_cursor"]}).json()
+    assert [event["event_id"] for event in second["events"]] == ["evt-ser-4", "evt-ser-5"]
+    assert second["next_cursor"] is None
+    assert second["events"][0]["metadata"]["bigint"] == 2**70
@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.config import settings
+from app.models import Base, ScoreSnapshot
+from app.services.scoring import ScoreResult
+from app.services.snapshot_writer import SnapshotWriter
+
+
+def _session_factory() -> sessionmaker[Session]:
+    engine = create_engine("sqlite+pysqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    return sessionmaker(bind=engine, class_=Session)
+
+
+def _result(score: float, tier: str = "watch") -> ScoreResult:
+    return ScoreResult(score=score, tier=tier, factors={"baseline": 50.0})
+
+
+def test_writer_records_only_changed_scores(monkeypatch) -> None:
+    monkeypatch.setattr(settings, "snapshot_min_interval_seconds", 0)
+    session_factory = _session_factory()
+    writer = SnapshotWriter(session_factory)
+
+    assert writer.submit("agent-a", _result(52.0)) is True
+    assert writer.submit("agent-a", _result(52.0)) is False
+    assert writer.submit("agent-b", _result(52.0)) is True
+    assert writer.submit("agent-a", _result(58.0)) is True
+    writer.flush()
+
+    with session_factory() as db:
+        rows = db.execute(select(ScoreSnapshot.agent_id, ScoreSnapshot.score).order_by(ScoreSnapshot.id)).all()
+    assert [tuple(row) for row in rows] == [("agent-a", 52.0), ("agent-b", 52.0), ("agent-a", 58.0)]
+    assert writer.written == 3
+
+
+def test_writer_rerecords_unchanged_score_after_interval(monkeypatch) -> None:
+    monkeypatch.setattr(settings, "snapshot_min_interval_seconds", 1e-9)
+    writer = SnapshotWriter(_session_factory())
+
+    assert writer.submit("agent-a", _result(52.0)) is True
+    assert writer.submit("agent-a", _result(52.0)) is True
+
+
+def test_background_thread_writes_batches_and_drains_on_stop(monkeypatch) -> None:
+    monkeypatch.setattr(settings, "snapshot_batch_size", 2)
+    session_factory = _session_factory()
+    writer = SnapshotWriter(session_factory)
+    writer.start()
+    for i in range(5):
+        writer.submit(f"agent-{i}", _result(50.0 + i))
+    writer.stop()
+
+    with session_factory() as db:
+        assert len(db.scalars(select(ScoreSnapshot)).all()) == 5
@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import random
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event, select
+
+from app.config import settings
+from app.db import get_db
+from app.main import app
+from app.models import AgentScoreAggregate, ScoreSnapshot
+from app.services.score_cache import score_cache
+from app.services.snapshot_writer import snapshot_writer
+
+
+EVENT_TYPES = ["safe_tool_usage", "policy_violation", "task_completed_without_rework", "unknown_signal"]
+
+
+def _ingest(client: TestClient, agents: int = 30) -> None:
+    rng = random.Random(19)
+    events = [
+        {
+            "event_id": f"evt-scores-{i}",
+            "agent_id": f"agent-scores-{rng.randrange(agents)}",
+            "event_type": rng.choice(EVENT_TYPES),
+            "occurred_at": "2026-02-13T22:00:00Z",
+        }
+        for i in range(1500)
+    ]
+    assert client.post("/v1/intake/events:batch", json={"events": events}).status_code == 200
+
+
+def test_batch_scores_match_single_agent_endpoint(client: TestClient) -> None:
+    _ingest(client)
+    agent_ids = [f"agent-scores-{i}" for i in reversed(range(30))] + ["agent-unknown", "agent-scores-3"]
+
+    response = client.post("/v1/trust/scores", json={"agent_ids": agent_ids})
+    assert response.status_code == 200
+    scores = response.json()["scores"]
+    assert [score["agent_id"] for score in scores] == agent_ids[:-1]
+
+    score_cache.clear()
+    for score in scores:
+        assert client.get(f"/v1/trust/score/{score['agent_id']}").json() == score
+
+
+def test_batch_rebuilds_stale_aggregates_with_constant_queries(client: TestClient, monkeypatch) -> None:
+    _ingest(client)
+    agent_ids = [f"agent-scores-{i}" for i in range(30)]
+    response = client.post("/v1/trust/scores", json={"agent_ids": agent_ids})
+    expected = {score["agent_id"]: score for score in response.json()["scores"]}
+
+    monkeypatch.setattr(settings, "model_version", "v-batch")
+    score_cache.clear()
+    db = next(app.dependency_overrides[get_db]())
+    engine = db.get_bind()
+    statements: list[str] = []
+
+    def count(conn, cursor, statement, parameters, context, executemany) -> None:
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", count)
+    try:
+        scores = client.post("/v1/trust/scores", json={"agent_ids": agent_ids}).json()["scores"]
+    finally:
+        event.remove(engine, "before_cursor_execute", count)
+
+    # Aggregates, watermark, grouped count, row lock and the recount under it.
+    assert len([statement for statement in statements if statement.lstrip().upper().startswith("SELECT")]) <= 5
+    for score in scores:
+        assert score["model_version"] == "v-batch"
+        assert (score["trust_score"], score["factors"]) == (
+            expected[score["agent_id"]]["trust_score"],
+            expected[score["agent_id"]]["factors"],
+        )
+    try:
+        versions = set(db.scalars(select(AgentScoreAggregate.model_version).execution_options(populate_existing=True)))
+        assert versions == {"v-batch"}
+
+        snapshot_writer.flush()
+        agents_snapshotted = set(db.scalars(select(ScoreSnapshot.agent_id)))
+        assert agents_snapshotted == set(agent_ids)
+    finally:
+        db.close()
+
+
+def test_batch_scores_validates_payload(client: TestClient) -> None:
+    assert client.post("/v1/trust/scores", json={"agent_ids": []}).status_code == 422
+    assert client.post("/v1/trust/scores", json={"agent_ids": ["a"] * 1001}).status_code == 422
+
+
+def test_rebuild_recounts_under_the_aggregate_row_lock(client: TestClient, monkeypatch) -> None:
+    from app import store
+
+    _ingest(client, agents=1)
+    calls: list[str] = []
+    count_agent_history = store._count_agent_history
+    lock_aggregates = store._lock_aggregates
+
+    def counting(db, agent_id):
+        calls.append("count")
+        return count_agent_history(db, agent_id)
+
+    def locking(db, agent_ids):
+        calls.append("lock")
+        lock_aggregates(db, agent_ids)
+
+    monkeypatch.setattr(store, "_count_agent_history", counting)
+    monkeypatch.setattr(store, "_lock_aggregates", locking)
+    db = next(app.dependency_overrides[get_db]())
+    try:
+        totals = store.rebuild_agent_score_aggregate(db, "agent-scores-0")
+        assert calls == ["count", "lock", "count"]
+        aggregate = store.get_agent_score_aggregate(db, "agent-scores-0")
+        assert aggregate.event_count == 1500
+        assert aggregate.model_version == settings.model_version
+        assert (totals.positive_delta, totals.negative_delta) == (aggregate.positive_delta, aggregate.negative_delta)
+
+        # No history, so nothing to lock and no placeholder row left behind.
+        calls.clear()
+        store.rebuild_agent_score_aggregate(db, "agent-unknown")
+        assert calls == ["count"]
+        assert store.get_agent_score_aggregate(db, "agent-unknown") is None
+    finally:
+        db.close()
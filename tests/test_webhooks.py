@@ -0,0 +1,226 @@
+from __future__ import annotations
+
+import json
+import threading
+import time
+from collections.abc import Iterator
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app import store
+from app.config import settings
+from app.db import get_db
+from app.main import app
+from app.services.scoring import ScoreResult
+from app.services.webhooks import TierChange, WebhookDispatcher
+
+
+class StubReceiver(ThreadingHTTPServer):
+    """Local webhook subscriber that records batches and can fail the first N requests."""
+
+    def __init__(self, fail_first: int = 0, status: int = 503) -> None:
+        self.batches: list[list[dict]] = []
+        self.requests = 0
+        self.fail_first = fail_first
+        self.status = status
+        self.received = threading.Condition()
+        super().__init__(("127.0.0.1", 0), _StubHandler)
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}/hook"
+
+    def wait_for(self, events: int, timeout: float = 5.0) -> list[dict]:
+        deadline = time.monotonic() + timeout
+        with self.received:
+            while sum(len(batch) for batch in self.batches) < events and time.monotonic() < deadline:
+                self.received.wait(deadline - time.monotonic())
+            return [event for batch in self.batches for event in batch]
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    server: StubReceiver
+
+    def do_POST(self) -> None:
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        with self.server.received:
+            self.server.requests += 1
+            failing = self.server.requests <= self.server.fail_first
+            if not failing:
+                self.server.batches.append(body["events"])
+                self.server.received.notify_all()
+        self.send_response(self.server.status if failing else 204)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+def _serve(receiver: StubReceiver) -> Iterator[StubReceiver]:
+    thread = threading.Thread(target=receiver.serve_forever, args=(0.01,), daemon=True)
+    thread.start()
+    try:
+        yield receiver
+    finally:
+        receiver.shutdown()
+        receiver.server_close()
+
+
+@pytest.fixture
+def receiver() -> Iterator[StubReceiver]:
+    yield from _serve(StubReceiver())
+
+
+@pytest.fixture
+def flaky_receiver() -> Iterator[StubReceiver]:
+    yield from _serve(StubReceiver(fail_first=2))
+
+
+@pytest.fixture(autouse=True)
+def fast_webhooks(monkeypatch) -> None:
+    monkeypatch.setattr(settings, "webhook_flush_interval_seconds", 0.05)
+    monkeypatch.setattr(settings, "webhook_backoff_base_seconds", 0.01)
+
+
+def _change(agent_id: str, tier: str = "restricted") -> TierChange:
+    return TierChange(agent_id, "watch", tier, 20.0, "v-test")
+
+
+def test_dispatcher_batches_notifications_and_reports_lag(receiver: StubReceiver) -> None:
+    dispatcher = WebhookDispatcher([receiver.url])
+    dispatcher.start()
+    try:
+        for i in range(25):
+            dispatcher.notify(_change(f"agent-hook-{i}"))
+        events = receiver.wait_for(25)
+    finally:
+        dispatcher.stop()
+
+    assert [event["agent_id"] for event in events] == [f"agent-hook-{i}" for i in range(25)]
+    assert events[0]["type"] == "trust_tier_changed"
+    assert len(receiver.batches) < 25
+    stats = dispatcher.stats()[receiver.url]
+    assert stats["delivered"] == 25
+    assert stats["queued"] == 0
+    assert 0 < stats["lag_seconds_avg"] <= stats["lag_seconds_max"]
+
+
+def test_dispatcher_retries_with_backoff(flaky_receiver: StubReceiver) -> None:
+    dispatcher = WebhookDispatcher([flaky_receiver.url])
+    dispatcher.start()
+    try:
+        dispatcher.notify(_change("agent-retry"))
+        events = flaky_receiver.wait_for(1)
+    finally:
+        dispatcher.stop()
+
+    assert [event["agent_id"] for event in events] == ["agent-retry"]
+    assert flaky_receiver.requests == 3
+    assert dispatcher.stats()[flaky_receiver.url]["retries"] == 2
+
+
+def test_gives_up_after_max_retries(monkeypatch, flaky_receiver: StubReceiver) -> None:
+    monkeypatch.setattr(settings, "webhook_max_retries", 1)
+    dispatcher = WebhookDispatcher([flaky_receiver.url])
+    dispatcher.start()
+    try:
+        dispatcher.notify(_change("agent-lost"))
+        deadline = time.monotonic() + 5
+        while dispatcher.stats()[flaky_receiver.url]["failed"] == 0 and time.monotonic() < deadline:
+            time.sleep(0.01)
+    finally:
+        dispatcher.stop()
+    assert dispatcher.stats()[flaky_receiver.url]["failed"] == 1
+    assert flaky_receiver.batches == []
+
+
+@pytest.mark.parametrize("overflow,kept", [("drop_oldest", ["a2", "a3"]), ("drop_newest", ["a0", "a1"])])
+def test_bounded_queue_overflow_policies(monkeypatch, receiver: StubReceiver, overflow: str, kept: list[str]) -> None:
+    monkeypatch.setattr(settings, "webhook_queue_size", 2)
+    dispatcher = WebhookDispatcher([receiver.url], overflow=overflow)
+    # Not started yet, so notifications pile up in the queue.
+    accepted = [dispatcher.notify(_change(agent_id)) for agent_id in ("a0", "a1", "a2", "a3")]
+    assert dispatcher.stats()[receiver.url]["dropped"] == 2
+    assert accepted == [True, True, overflow == "drop_oldest", overflow == "drop_oldest"]
+
+    dispatcher.start()
+    try:
+        events = receiver.wait_for(2)
+    finally:
+        dispatcher.stop()
+    assert [event["agent_id"] for event in events] == kept
+
+
+def test_observe_notifies_only_on_tier_crossings() -> None:
+    dispatcher = WebhookDispatcher(["http://127.0.0.1:9/unused"])
+    assert not dispatcher.observe("agent-obs", ScoreResult(score=55.0, tier="watch", factors={}))
+    assert not dispatcher.observe("agent-obs", ScoreResult(score=52.0, tier="watch", factors={}))
+    assert dispatcher.observe("agent-obs", ScoreResult(score=30.0, tier="restricted", factors={}))
+    assert dispatcher.stats()["http://127.0.0.1:9/unused"]["queued"] == 1
+    assert not WebhookDispatcher([]).observe("agent-obs", ScoreResult(score=30.0, tier="restricted", factors={}))
+
+
+def test_worker_recompute_crossing_a_tier_notifies_subscribers(
+    client: TestClient, receiver: StubReceiver, monkeypatch
+) -> None:
+    dispatcher = WebhookDispatcher([receiver.url])
+    monkeypatch.setattr(store, "webhook_dispatcher", dispatcher)
+    monkeypatch.setattr(settings, "score_worker_enabled", True)
+
+    def ingest(i: int, event_type: str) -> None:
+        client.post(
+            "/v1/intake/events",
+            json={
+                "event_id": f"evt-hook-{i}",
+                "agent_id": "agent-hook",
+                "event_type": event_type,
+                "occurred_at": "2026-02-13T22:00:00Z",
+            },
+        )
+
+    db = next(app.dependency_overrides[get_db]())
+    dispatcher.start()
+    try:
+        ingest(0, "safe_tool_usage")
+        for agent_id, version in store.claim_score_jobs(db, 10, 60.0):
+            store.process_score_job(db, agent_id, version)
+        ingest(1, "policy_violation")
+        for agent_id, version in store.claim_score_jobs(db, 10, 60.0):
+            store.process_score_job(db, agent_id, version)
+        events = receiver.wait_for(1)
+    finally:
+        dispatcher.stop()
+        db.close()
+
+    assert len(events) == 1
+    assert (events[0]["previous_tier"], events[0]["tier"], events[0]["trust_score"]) == ("watch", "restricted", 32.0)
+
+
+def test_inline_reads_leave_tier_changes_to_the_worker(client: TestClient, monkeypatch) -> None:
+    observed = []
+    dispatcher = WebhookDispatcher([])
+    monkeypatch.setattr(dispatcher, "observe", lambda agent_id, result: observed.append(agent_id))
+    monkeypatch.setattr(store, "webhook_dispatcher", dispatcher)
+    monkeypatch.setattr(settings, "score_worker_enabled", True)
+    # Under the decay model reads always score inline, even once the worker has stored a row.
+    monkeypatch.setattr(settings, "model_version", "v0.2-decay")
+    client.post(
+        "/v1/intake/events",
+        json={
+            "event_id": "evt-hook-inline",
+            "agent_id": "agent-hook-inline",
+            "event_type": "policy_violation",
+            "occurred_at": "2026-02-13T22:00:00Z",
+        },
+    )
+
+    assert client.get("/v1/trust/score/agent-hook-inline").status_code == 200
+    assert client.post("/v1/trust/scores", json={"agent_ids": ["agent-hook-inline", "agent-other"]}).status_code == 200
+    assert observed == []
+
+    monkeypatch.setattr(settings, "score_worker_enabled", False)
+    client.post("/v1/trust/scores", json={"agent_ids": ["agent-other-2"]})
+    assert observed == ["agent-other-2"]
@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+
+from app.config import settings
+from app.db import get_db
+from app.main import app
+from app.models import AgentScore, ScoreJob, ScoreSnapshot
+from app.store import claim_score_jobs, process_score_job
+from app.worker import run_batch
+
+
+def _ingest(client: TestClient, event_id: str, agent_id: str, event_type: str) -> None:
+    response = client.post(
+        "/v1/intake/events",
+        json={
+            "event_id": event_id,
+            "agent_id": agent_id,
+            "event_type": event_type,
+            "occurred_at": "2026-02-13T21:00:00Z",
+        },
+    )
+    assert response.status_code == 200
+
+
+def test_ingest_coalesces_jobs_and_worker_precomputes_scores(client: TestClient, monkeypatch) -> None:
+    monkeypatch.setattr(settings, "score_worker_enabled", True)
+    _ingest(client, "evt-w-1", "agent-w1", "safe_tool_usage")
+    _ingest(client, "evt-w-2", "agent-w1", "human_approved_action")
+    _ingest(client, "evt-w-3", "agent-w2", "policy_violation")
+
+    db = next(app.dependency_overrides[get_db]())
+    try:
+        jobs = {job.agent_id: job.version for job in db.scalars(select(ScoreJob))}
+        assert jobs == {"agent-w1": 2, "agent-w2": 1}
+
+        claimed = claim_score_jobs(db, limit=10, lease_seconds=60)
+        assert sorted(claimed) == [("agent-w1", 2), ("agent-w2", 1)]
+        assert claim_score_jobs(db, limit=10, lease_seconds=60) == []
+
+        for agent_id, version in claimed:
+            assert process_score_job(db, agent_id, version) is True
+
+        assert db.scalars(select(ScoreJob)).all() == []
+        assert db.get(AgentScore, "agent-w1").score == 58.0
+        assert db.get(AgentScore, "agent-w2").tier == "restricted"
+        assert len(db.scalars(select(ScoreSnapshot)).all()) == 2
+    finally:
+        db.close()
+
+    # The API now reads the precomputed row.
+    assert client.get("/v1/trust/score/agent-w1").json()["trust_score"] == 58.0
+
+
+def test_job_reenqueued_while_processing_is_released_not_deleted(client: TestClient, monkeypatch) -> None:
+    monkeypatch.setattr(settings, "score_worker_enabled", True)
+    _ingest(client, "evt-r-1", "agent-r", "safe_tool_usage")
+
+    db = next(app.dependency_overrides[get_db]())
+    try:
+        [(agent_id, version)] = claim_score_jobs(db, limit=10, lease_seconds=60)
+        _ingest(client, "evt-r-2", "agent-r", "safe_tool_usage")
+        process_score_job(db, agent_id, version)
+
+        job = db.get(ScoreJob, "agent-r", populate_existing=True)
+        assert job is not None
+        assert job.claimed_until is None
+
+        [(agent_id, version)] = claim_score_jobs(db, limit=10, lease_seconds=60)
+        process_score_job(db, agent_id, version)
+        assert db.get(ScoreJob, "agent-r", populate_existing=True) is None
+        assert db.get(AgentScore, "agent-r", populate_existing=True).score == 54.0
+    finally:
+        db.close()
+
+
+def test_failing_job_backs_off_and_is_dropped_after_max_attempts(client: TestClient, monkeypatch) -> None:
+    from datetime import datetime, timedelta, timezone
+
+    from sqlalchemy import update
+
+    from app import store, worker
+
+    monkeypatch.setattr(settings, "score_worker_enabled", True)
+    monkeypatch.setattr(settings, "score_worker_max_attempts", 3)
+    _ingest(client, "evt-f-1", "agent-f", "safe_tool_usage")
+
+    def broken(db, agent_id):
+        raise RuntimeError("scoring failed")
+
+    monkeypatch.setattr(store, "get_agent_score_totals", broken)
+    monkeypatch.setattr(worker, "get_session_factory", lambda: lambda: next(app.dependency_overrides[get_db]()))
+
+    db = next(app.dependency_overrides[get_db]())
+    try:
+        delays = []
+        for _ in range(2):
+            started = datetime.now(timezone.utc)
+            assert run_batch(batch_size=10, lease_seconds=60) == 1
+            # Still leased: the next pass claims nothing.
+            assert run_batch(batch_size=10, lease_seconds=60) == 0
+            job = db.get(ScoreJob, "agent-f", populate_existing=True)
+            delays.append((job.claimed_until.replace(tzinfo=timezone.utc) - started).total_seconds())
+            db.execute(update(ScoreJob).values(claimed_until=datetime.now(timezone.utc) - timedelta(seconds=1)))
+            db.commit()
+        assert 60 <= delays[0] < 70 and 120 <= delays[1] < 130
+
+        assert run_batch(batch_size=10, lease_seconds=60) == 1
+        assert db.get(ScoreJob, "agent-f", populate_existing=True) is None
+    finally:
+        db.close()
+
+
+def test_inline_read_skips_snapshot_while_a_job_is_queued(client: TestClient, monkeypatch) -> None:
+    from app.services.snapshot_writer import snapshot_writer
+
+    monkeypatch.setattr(settings, "score_worker_enabled", True)
+    submitted = []
+    monkeypatch.setattr(snapshot_writer, "submit", lambda agent_id, result: submitted.append(agent_id))
+    _ingest(client, "evt-s-1", "agent-s1", "safe_tool_usage")
+    _ingest(client, "evt-s-2", "agent-s2", "safe_tool_usage")
+
+    assert client.get("/v1/trust/score/agent-s1").json()["trust_score"] == 52.0
+    assert client.post("/v1/trust/scores", json={"agent_ids": ["agent-s2"]}).status_code == 200
+    assert submitted == []
+
+    db = next(app.dependency_overrides[get_db]())
+    try:
+        for agent_id, version in claim_score_jobs(db, limit=10, lease_seconds=60):
+            process_score_job(db, agent_id, version)
+        assert len(db.scalars(select(ScoreSnapshot)).all()) == 2
+    finally:
+        db.close()
+
+
+def test_decay_model_reads_revalue_worker_scores_as_time_passes(client: TestClient, monkeypatch) -> None:
+    from datetime import datetime, timedelta, timezone
+
+    from app.services import scoring
+    from app.services.score_cache import score_cache
+
+    monkeypatch.setattr(settings, "score_worker_enabled", True)
+    monkeypatch.setattr(settings, "model_version", "v0.2-decay")
+    monkeypatch.setattr(settings, "decay_half_life_days", 1.0)
+    occurred_at = datetime.now(timezone.utc)
+    response = client.post(
+        "/v1/intake/events",
+        json={
+            "event_id": "evt-wd-1",
+            "agent_id": "agent-wd",
+            "event_type": "policy_violation",
+            "occurred_at": occurred_at.isoformat(),
+        },
+    )
+    assert response.status_code == 200
+
+    db = next(app.dependency_overrides[get_db]())
+    try:
+        for agent_id, version in claim_score_jobs(db, limit=10, lease_seconds=60):
+            process_score_job(db, agent_id, version)
+        assert abs(db.get(AgentScore, "agent-wd").score - 30.0) <= 0.01
+    finally:
+        db.close()
+
+    class Later(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return occurred_at + timedelta(days=2)
+
+    # Two half-lives later, with no new events and no new job, the -20 counts as -5.
+    monkeypatch.setattr(scoring, "datetime", Later)
+    score_cache.clear()
+    assert abs(client.get("/v1/trust/score/agent-wd").json()["trust_score"] - 45.0) <= 0.01
+    body = client.post("/v1/trust/scores", json={"agent_ids": ["agent-wd"]}).json()
+    assert abs(body["scores"][0]["trust_score"] - 45.0) <= 0.01